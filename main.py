@@ -1,13 +1,21 @@
 import time
 import os
-import networkx as nx
-from src.loader import load_dimacs_graph
+import sys
+from typing import Optional
+from src import batch, clique_pool, instrumentation
+from src.bitset import BitsetGraph
+from src.bounds import UpperBound, stop_at, upper_bound
+from src.exact import max_clique_exact
+from src.graph import GraphLike
+from src.csr import CSRGraph
+from src.loader import load_dimacs_csr, load_dimacs_graph
 from src.local_search import iterative_local_search
+from src.reduction import ReducedGraph, degeneracy_clique, reduce_graph
+from src.multistart import multistart
+from src.verify import verify_clique
 
 
-from src.strategies.independent_set import solve_is_min_degree, solve_is_k_min_degree
-from src.strategies.local_score import solve_score_tie_breaking, solve_score_top_k
-from src.strategies.vertex_cover import solve_vc_max_degree, solve_vc_matching
+from src.strategies.registry import CSR_STRATEGIES, STRATEGIES
 
 # --- GLOBAL CONFIGURATION ---
 FILENAME = "p_hat300-1.txt"
@@ -17,21 +25,57 @@ DATA_FILE = os.path.join("data", FILENAME)
 NUM_ITER_CONSTRUCTIVE = 1000  
 ILS_MAX_ITER = 500            
 ILS_PERTURBATION_K = 2        
+NUM_WORKERS = 1               # Processi per la fase costruttiva (1 = seriale)
+TIME_LIMIT_CONSTRUCTIVE = None  # Secondi per ogni run costruttivo (None = solo iterazioni)
+ILS_TIME_LIMIT = None         # Secondi per la ILS (None = solo iterazioni)
+TRACE_FILE = None             # Percorso del trace JSON delle metriche (None = instrumentation spenta)
+PROFILE_INTERVAL = None       # Secondi tra due campioni del profiler (None = profiler spento)
+EXACT_TIME_LIMIT = None       # Secondi per il Branch and Bound esatto (None = disattivato)
+REDUCE_GRAPH = True           # Preprocessing: riduzione guidata dal lower bound
+TRIANGLE_PRUNING = False      # Riduzione: anche potatura degli archi per numero di triangoli
+CHECKPOINT_DIR = None         # Cartella dei checkpoint di multistart e ILS (None = nessun checkpoint)
+CHECKPOINT_INTERVAL = 60.0    # Secondi tra due checkpoint
+TOP_N = 0                     # Cricche distinte migliori da raccogliere da tutte le fasi (0 = solo la migliore)
+POOL_MIN_DISTANCE = 0.0       # Distanza di Jaccard minima tra le cricche del pool (0 = solo duplicati esclusi)
+UPPER_BOUND_ITER = 10         # Round di colorazione iterata per l'upper bound (None = nessun bound né arresto anticipato)
+CSR_BACKEND = False           # Grafi sparsi enormi: array CSR memory-mapped al posto di Graph/bitset
+                              # (solo strategie Score, fase costruttiva seriale, niente riduzione né B&B)
 
-def verify_clique(G: nx.Graph, clique: set) -> bool:
-    """Verifica che l'insieme di nodi sia davvero una cricca."""
-    nodes = list(clique)
-    # Verifica ogni coppia di nodi
-    for i in range(len(nodes)):
-        for j in range(i + 1, len(nodes)):
-            if not G.has_edge(nodes[i], nodes[j]):
-                return False
-    return True
-
-def run_experiment(G: nx.Graph, strategy_name: str, strategy_func):
+def run_experiment(G: GraphLike, strategy_name: str, strategy_func, bound: Optional[UpperBound] = None, checkpoint: Optional[str] = None,
+                   reduced: Optional[ReducedGraph] = None, original: Optional[GraphLike] = None):
     """
     Esegue un esperimento completo: Costruzione + ILS + Report.
+
+    Con un upper bound (src/bounds.py) ogni fase si ferma appena la cricca
+    raggiunge il bound: l'ottimo è certificato e le fasi successive sono
+    saltate. Il report riporta il gap tra bound e soluzione.
+
+    Con un prefisso 'checkpoint' fase costruttiva e ILS salvano il loro
+    stato in <checkpoint>.multistart.json / <checkpoint>.ils.json e, se
+    l'esperimento viene rilanciato dopo un'interruzione, riprendono da lì
+    (con lo stesso risultato di un'esecuzione mai interrotta). I file
+    vengono rimossi a esperimento concluso.
+
+    Con TOP_N > 0 gli ottimi locali di tutte le fasi (ogni ripartenza
+    costruttiva, ogni iterazione della ILS) confluiscono in un CliquePool
+    (src/clique_pool.py) e il report elenca le TOP_N cricche distinte.
+
+    Se G è il grafo ridotto (src/reduction.py), 'reduced' ne porta la mappa
+    degli id: cricca finale e pool sono riportati agli id di 'original'
+    prima di verifica e report.
     """
+    checkpoints = {}
+    if checkpoint is not None:
+        checkpoints = {phase: f"{checkpoint}.{phase}.json" for phase in ("multistart", "ils")}
+        extra = dict(checkpoint=checkpoints["multistart"], checkpoint_interval=CHECKPOINT_INTERVAL)
+    else:
+        extra = {}
+    stop = stop_at(bound.value) if bound is not None else None
+    pool = clique_pool.CliquePool(TOP_N, POOL_MIN_DISTANCE) if TOP_N > 0 else None
+
+    def certified(solution) -> bool:
+        return bound is not None and bound.certifies(len(solution))
+
     print(f"\n{'='*60}")
     print(f"ESPERIMENTO: {strategy_name}")
     print(f"{'='*60}")
@@ -41,36 +85,82 @@ def run_experiment(G: nx.Graph, strategy_name: str, strategy_func):
     start_time = time.time()
     
 
-    initial_solution = strategy_func(G)
+    with instrumentation.phase("constructive", strategy=strategy_name), clique_pool.collecting(pool):
+        initial_solution = strategy_func(G, on_improve=stop, **extra)
     
     heuristic_time = time.time() - start_time
     print(f"    -> Migliore soluzione trovata: {len(initial_solution)} nodi")
     print(f"    -> Tempo impiegato: {heuristic_time:.4f} sec")
 
     # 2. FASE OTTIMIZZAZIONE (ILS)
-    print(f"[*] Avvio Iterated Local Search (Max Iter: {ILS_MAX_ITER}, Perturb: {ILS_PERTURBATION_K})...")
-    start_ils = time.time()
-    
-    final_solution = iterative_local_search(
-        G, 
-        initial_solution, 
-        max_iter=ILS_MAX_ITER, 
-        k=ILS_PERTURBATION_K
-    )
-    
-    ils_time = time.time() - start_ils
-    print(f"    -> Soluzione finale dopo ILS: {len(final_solution)} nodi")
-    print(f"    -> Tempo ILS: {ils_time:.4f} sec")
+    ils_time = 0.0
+    final_solution = initial_solution
+    if certified(initial_solution):
+        print("[*] Ottimo certificato dall'upper bound: ILS saltata")
+    else:
+        print(f"[*] Avvio Iterated Local Search (Max Iter: {ILS_MAX_ITER}, Perturb: {ILS_PERTURBATION_K})...")
+        start_ils = time.time()
+
+        with instrumentation.phase("ils"), clique_pool.collecting(pool):
+            final_solution = iterative_local_search(
+                G, 
+                initial_solution, 
+                max_iter=ILS_MAX_ITER, 
+                k=ILS_PERTURBATION_K,
+                time_limit=ILS_TIME_LIMIT,
+                on_improve=stop,
+                checkpoint=checkpoints.get("ils"),
+                checkpoint_interval=CHECKPOINT_INTERVAL
+            )
+
+        ils_time = time.time() - start_ils
+        print(f"    -> Soluzione finale dopo ILS: {len(final_solution)} nodi")
+        print(f"    -> Tempo ILS: {ils_time:.4f} sec")
 
-    # 3. VERIFICA E REPORT
-    is_valid = verify_clique(G, final_solution)
-    total_time = heuristic_time + ils_time
+    # 3. FASE ESATTA (opzionale): Branch and Bound con warm start dalla ILS
+    exact_time = 0.0
+    exact_status = "non eseguita"
+    best_bound = bound.value if bound is not None else None
+    if certified(final_solution):
+        exact_status = "non necessaria (ottimo certificato)"
+    elif EXACT_TIME_LIMIT is not None and not isinstance(G, CSRGraph):
+        print(f"[*] Avvio Branch and Bound esatto (Time limit: {EXACT_TIME_LIMIT} sec)...")
+        with instrumentation.phase("exact"):
+            exact = max_clique_exact(G, incumbent=final_solution, time_limit=EXACT_TIME_LIMIT, upper_bound=best_bound)
+        exact_time = exact.elapsed
+        final_solution = exact.clique
+        best_bound = exact.upper_bound
+        exact_status = "ottimo dimostrato" if exact.optimal else f"gap {exact.gap} (UB {exact.upper_bound})"
+        print(f"    -> Soluzione dopo B&B: {len(final_solution)} nodi ({exact_status}, {exact.nodes} nodi esplorati)")
+        print(f"    -> Tempo B&B: {exact_time:.4f} sec")
+
+    for path in checkpoints.values():
+        if os.path.exists(path):
+            os.remove(path)
+    if pool is not None:
+        pool.offer(final_solution)
+
+    # 4. VERIFICA E REPORT (sul grafo originale, con gli id originali)
+    top_cliques = pool.cliques() if pool is not None else []
+    if reduced is not None:
+        final_solution = reduced.lift(final_solution)
+        top_cliques = [reduced.lift(clique) for clique in top_cliques]
+    is_valid = verify_clique(original if original is not None else G, final_solution)
+    total_time = heuristic_time + ils_time + exact_time
     
     print("-" * 30)
     print(f"RISULTATO FINALE: {strategy_name}")
     print(f"File:             {FILENAME}")
     print(f"Validità Cricca:  {'OK' if is_valid else 'ERRORE'}")
     print(f"Dimensione:       {len(final_solution)}")
+    print(f"Fase Esatta:      {exact_status}")
+    if best_bound is not None:
+        gap = max(0, best_bound - len(final_solution))
+        method = bound.method if bound is not None and best_bound == bound.value else "Branch and Bound"
+        print(f"Upper Bound:      {best_bound} ({method})")
+        print(f"Gap:              {gap}{' (ottimo certificato)' if gap == 0 else ''}")
+    if pool is not None:
+        print(f"Top {TOP_N} distinte:   {len(pool)} cricche, taglie {[len(c) for c in top_cliques]}")
     print(f"Tempo Totale:     {total_time:.4f} sec")
     print("-" * 30)
 
@@ -78,32 +168,49 @@ def main():
     # 1. Caricamento Grafo
     print(f"Caricamento del grafo da: {DATA_FILE}")
     try:
-        G = load_dimacs_graph(DATA_FILE)
+        G = load_dimacs_csr(DATA_FILE) if CSR_BACKEND else load_dimacs_graph(DATA_FILE)
         print(f"Grafo caricato: {G.number_of_nodes()} nodi, {G.number_of_edges()} archi.")
     except FileNotFoundError:
         print(f"ERRORE CRITICO: Non trovo il file in {DATA_FILE}")
         print(f"Controlla che il file '{FILENAME}' sia dentro la cartella 'data'.")
         return
 
-    # 2. Definizione delle Strategie
+    # Preprocessing: con una cricca greedy di taglia ω' si eliminano i nodi
+    # fuori dal (ω'-1)-core e le componenti troppo piccole. Strategie e ILS
+    # lavorano sul grafo ridotto (id compatti); run_experiment riporta le
+    # cricche agli id originali con reduced.lift e le verifica su 'original'.
+    original, reduced = G, None
+    if REDUCE_GRAPH and not CSR_BACKEND:
+        lower_bound = len(degeneracy_clique(G))
+        reduced = reduce_graph(G, lower_bound, triangle_pruning=TRIANGLE_PRUNING)
+        G = reduced.graph
+        print(f"Grafo ridotto (ω' = {lower_bound}): {G.number_of_nodes()} nodi, {G.number_of_edges()} archi "
+              f"({reduced.removed_nodes} nodi rimossi).")
+
+    # Rappresentazione a bitset costruita una volta sola e condivisa da
+    # tutte le strategie e dalla ILS (il backend CSR resta com'è)
+    if not CSR_BACKEND:
+        G = BitsetGraph.from_graph(G)
+
+    # Upper bound (core, colorazione greedy e iterata) calcolato una volta
+    # per grafo: certifica l'ottimo e ferma le fasi appena è raggiunto.
+    bound = None
+    if UPPER_BOUND_ITER is not None:
+        bound = upper_bound(G, iterations=UPPER_BOUND_ITER)
+        print(f"Upper bound: {bound.value} (core {bound.core}, colorazione {bound.coloring}; "
+              f"{bound.elapsed:.4f} sec)")
+
+    # 2. Definizione delle Strategie (registro in src/strategies/registry.py).
+    # Le ripartenze della fase costruttiva passano da multistart: con
+    # NUM_WORKERS > 1 vengono distribuite su più processi.
+    # Con CSR_BACKEND solo le strategie compatibili, in serie (i worker
+    # ricevono il grafo come bitset in memoria condivisa).
     strategies = {
-        "1": ("IS - Min Degree (Sez 2.1.1)", 
-              lambda g: solve_is_min_degree(g, num_iter=NUM_ITER_CONSTRUCTIVE)),
-        
-        "2": ("IS - K-Min Degree (Sez 2.1.2)", 
-              lambda g: solve_is_k_min_degree(g, k=10, num_iter=NUM_ITER_CONSTRUCTIVE)),
-        
-        "3": ("Score - Random Tie (Sez 2.2.1)", 
-              lambda g: solve_score_tie_breaking(g, num_iter=NUM_ITER_CONSTRUCTIVE)),
-        
-        "4": ("Score - Top-K (Sez 2.2.2)", 
-              lambda g: solve_score_top_k(g, top_k_ratio=0.02, num_iter=NUM_ITER_CONSTRUCTIVE)),
-        
-        "5": ("VC - Max Degree (Sez 2.3.1)", 
-              lambda g: solve_vc_max_degree(g, num_iter=NUM_ITER_CONSTRUCTIVE)),
-        
-        "6": ("VC - Matching (Sez 2.3.2)", 
-              lambda g: solve_vc_matching(g, num_iter=NUM_ITER_CONSTRUCTIVE))
+        key: (name, lambda g, func=func, params=params, **extra: multistart(
+            g, func, num_iter=NUM_ITER_CONSTRUCTIVE, workers=1 if CSR_BACKEND else NUM_WORKERS,
+            time_limit=TIME_LIMIT_CONSTRUCTIVE, **params, **extra))
+        for key, (name, func, params) in STRATEGIES.items()
+        if not CSR_BACKEND or key in CSR_STRATEGIES
     }
 
     # 3. Menu Interattivo
@@ -120,9 +227,23 @@ def main():
             break
         elif choice in strategies:
             algo_name, algo_func = strategies[choice]
-            run_experiment(G, algo_name, algo_func)
+            checkpoint = None
+            if CHECKPOINT_DIR is not None:
+                os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+                checkpoint = os.path.join(CHECKPOINT_DIR, f"{FILENAME}.{choice}")
+            if TRACE_FILE is None:
+                run_experiment(G, algo_name, algo_func, bound, checkpoint, reduced, original)
+            else:
+                with instrumentation.recording(sample_interval=PROFILE_INTERVAL) as rec:
+                    run_experiment(G, algo_name, algo_func, bound, checkpoint, reduced, original)
+                rec.dump(TRACE_FILE)
+                print(f"Trace delle metriche salvato in: {TRACE_FILE}")
         else:
             print("Scelta non valida, riprova.")
 
 if __name__ == "__main__":
+    # Con argomenti da riga di comando: modalità batch non interattiva
+    # (python main.py data/*.txt -s 1 4 --format csv), altrimenti menu.
+    if len(sys.argv) > 1:
+        sys.exit(batch.main(sys.argv[1:]))
     main()
\ No newline at end of file
@@ -0,0 +1,523 @@
+import argparse
+import contextlib
+import csv
+import glob
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, TextIO
+
+from src import clique_pool, instrumentation
+from src.bitset import BitsetGraph
+from src.bounds import stop_at, upper_bound
+from src.exact import max_clique_exact
+from src.loader import load_dimacs_graph
+from src.local_search import iterative_local_search
+from src.multistart import SharedGraph, init_worker, multistart, worker_graph
+from src.reduction import degeneracy_clique, reduce_graph
+from src.result_store import ResultStore
+from src.strategies.registry import STRATEGIES
+from src.verify import verify_clique
+
+
+@dataclass
+class RunConfig:
+    """Parameters shared by every strategy + ILS run of a batch."""
+
+    num_iter: int = 1000
+    ils_max_iter: int = 500
+    ils_k: int = 2
+    seed: int = 0
+    workers: int = 1
+    time_limit: Optional[float] = None
+    stagnation: Optional[int] = None
+    ils_time_limit: Optional[float] = None
+    ils_stagnation: Optional[int] = None
+    exact_time_limit: Optional[float] = None
+    bound_iter: Optional[int] = 10
+    checkpoint_dir: Optional[str] = None
+    checkpoint_interval: float = 60.0
+    top_n: int = 0
+    pool_distance: float = 0.0
+
+
+# Fields of RunConfig that do not change the result of a run
+_EXECUTION_FIELDS = ("seed", "checkpoint_dir", "checkpoint_interval", "top_n", "pool_distance")
+
+
+@dataclass
+class RunRecord:
+    """One output line: a strategy + ILS run on one graph, with per-phase timings."""
+
+    file: str
+    digest: str
+    nodes: int
+    edges: int
+    reduced_nodes: int
+    reduced_edges: int
+    lower_bound: int
+    strategy: str
+    strategy_name: str
+    params: Dict[str, Any]
+    seed: int
+    constructive_size: Optional[int] = None
+    ils_size: Optional[int] = None
+    size: int = 0
+    valid: bool = False
+    exact_status: str = "skipped"
+    upper_bound: Optional[int] = None
+    gap: Optional[int] = None
+    load_time: float = 0.0
+    reduce_time: float = 0.0
+    bound_time: float = 0.0
+    constructive_time: float = 0.0
+    ils_time: float = 0.0
+    exact_time: float = 0.0
+    cached: bool = False
+    clique: List[Any] = field(default_factory=list)
+    top_cliques: List[List[Any]] = field(default_factory=list)
+
+
+CSV_FIELDS = [name for name in RunRecord.__dataclass_fields__ if name not in ("clique", "top_cliques")]
+
+
+def expand_paths(patterns: Sequence[str]) -> List[str]:
+    """
+    Expand glob patterns (quoted or not expanded by the shell) into a
+    sorted, duplicate-free list of files; plain paths are kept as given.
+    """
+    paths: List[str] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def run_strategy(
+    B: BitsetGraph,
+    key: str,
+    config: RunConfig,
+    warm_starts: Sequence[Set[int]] = (),
+    bound: Optional[int] = None,
+    checkpoint: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run the constructive strategy ``key`` followed by the ILS (and the
+    optional exact phase) on ``B``. ``warm_starts`` are known cliques of
+    ``B`` offered to the ILS. With an upper ``bound`` on the clique number
+    every phase stops as soon as the clique reaches it, and the phases
+    after that are skipped.
+
+    ``checkpoint`` is a path prefix: the constructive phase and the ILS
+    save their state to ``<prefix>.multistart.json`` and
+    ``<prefix>.ils.json`` every ``config.checkpoint_interval`` seconds and
+    resume from them when the run is started again; both files are
+    removed once the run completes.
+
+    With ``config.top_n > 0`` every phase offers its local optima to a
+    ``CliquePool`` of that size (``config.pool_distance`` is its minimum
+    Jaccard distance), returned as ``top_cliques``, largest first.
+
+    ``random`` is reseeded with ``config.seed`` first, so a run gives the
+    same result whether it executes in this process or in a worker.
+
+    Returns
+    -------
+    dict
+        The ``RunRecord`` fields computed by the run.
+    """
+    _, func, params = STRATEGIES[key]
+    random.seed(config.seed)
+    stop = stop_at(bound) if bound is not None else None
+    checkpoints = {}
+    if checkpoint is not None:
+        checkpoints = {phase: f"{checkpoint}.{phase}.json" for phase in ("multistart", "ils")}
+
+    pool = clique_pool.CliquePool(config.top_n, config.pool_distance) if config.top_n > 0 else None
+
+    start = time.perf_counter()
+    with instrumentation.phase("constructive", strategy=key), clique_pool.collecting(pool):
+        initial = multistart(
+            B,
+            func,
+            num_iter=config.num_iter,
+            workers=config.workers,
+            time_limit=config.time_limit,
+            stagnation=config.stagnation,
+            on_improve=stop,
+            checkpoint=checkpoints.get("multistart"),
+            checkpoint_interval=config.checkpoint_interval,
+            **params,
+        )
+    constructive_time = time.perf_counter() - start
+
+    def certified(clique: Set[int]) -> bool:
+        return bound is not None and len(clique) >= bound
+
+    start = time.perf_counter()
+    final = initial
+    if not certified(initial):
+        with instrumentation.phase("ils", strategy=key), clique_pool.collecting(pool):
+            final = iterative_local_search(
+                B,
+                initial,
+                max_iter=config.ils_max_iter,
+                k=config.ils_k,
+                verbose=False,
+                time_limit=config.ils_time_limit,
+                stagnation=config.ils_stagnation,
+                on_improve=stop,
+                warm_starts=warm_starts,
+                checkpoint=checkpoints.get("ils"),
+                checkpoint_interval=config.checkpoint_interval,
+            )
+    ils_time = time.perf_counter() - start
+    ils_size = len(final)
+
+    exact_time = 0.0
+    exact_status = "skipped"
+    upper_bound = bound
+    if certified(final):
+        exact_status = "optimal"
+    elif config.exact_time_limit is not None:
+        with instrumentation.phase("exact", strategy=key):
+            exact = max_clique_exact(B, incumbent=final, time_limit=config.exact_time_limit, upper_bound=bound)
+        final = exact.clique
+        exact_time = exact.elapsed
+        exact_status = "optimal" if exact.optimal else "time_limit"
+        upper_bound = exact.upper_bound
+
+    for path in checkpoints.values():
+        Path(path).unlink(missing_ok=True)
+    if pool is not None:
+        pool.offer(final)
+
+    return {
+        "constructive_size": len(initial),
+        "ils_size": ils_size,
+        "size": len(final),
+        "valid": verify_clique(B, final),
+        "exact_status": exact_status,
+        "upper_bound": upper_bound,
+        "gap": upper_bound - len(final) if upper_bound is not None else None,
+        "constructive_time": constructive_time,
+        "ils_time": ils_time,
+        "exact_time": exact_time,
+        "clique": sorted(final),
+        "top_cliques": pool.as_lists() if pool is not None else [],
+    }
+
+
+def _worker_run(
+    key: str,
+    config: RunConfig,
+    warm_starts: Sequence[Set[int]],
+    bound: Optional[int],
+    checkpoint: Optional[str],
+) -> Dict[str, Any]:
+    return run_strategy(worker_graph(), key, config, warm_starts, bound, checkpoint)
+
+
+def run_batch(
+    paths: Sequence[str],
+    keys: Sequence[str],
+    config: RunConfig,
+    jobs: int = 1,
+    reduce: bool = True,
+    triangle_pruning: bool = False,
+    store: Optional[ResultStore] = None,
+) -> Iterator[RunRecord]:
+    """
+    Run every strategy in ``keys`` on every graph in ``paths``.
+
+    Each graph is loaded (and reduced) once; its strategy runs are then
+    executed serially or, with ``jobs > 1``, on a process pool sharing the
+    graph through shared memory. Records are yielded as soon as each run
+    completes, so callers can stream them.
+
+    Parameters
+    ----------
+    paths : sequence of str
+        DIMACS files.
+    keys : sequence of str
+        Strategy keys of ``STRATEGIES``.
+    config : RunConfig
+        Iteration, seed and time parameters of each run.
+    jobs : int
+        Number of strategy runs executed concurrently per graph.
+    reduce : bool
+        Apply the lower-bound driven reduction before the strategies.
+    triangle_pruning : bool
+        Also use the triangle rule of the reduction.
+    store : ResultStore, optional
+        Result cache. A (graph, strategy, parameters, seed) combination
+        already stored is not run again (its record has ``cached=True``);
+        the other runs get the best stored clique of the graph as ILS warm
+        start and are stored when they complete.
+
+    Yields
+    ------
+    RunRecord
+        One record per (graph, strategy); cliques use the original labels.
+    """
+    unknown = [key for key in keys if key not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown strategy keys: {', '.join(unknown)}")
+
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            G = load_dimacs_graph(path)
+        except (OSError, ValueError) as exc:
+            # One unreadable file must not abort a whole sweep
+            print(f"Skipping {path}: {exc}", file=sys.stderr)
+            continue
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reduced = None
+        lower_bound = 0
+        H = G
+        if reduce:
+            lower_bound = len(degeneracy_clique(G))
+            reduced = reduce_graph(G, lower_bound, triangle_pruning=triangle_pruning)
+            H = reduced.graph
+        B = BitsetGraph.from_graph(H)
+        reduce_time = time.perf_counter() - start
+
+        # One upper bound per graph, shared by all its runs
+        bound = None
+        bound_time = 0.0
+        if config.bound_iter is not None:
+            certificate = upper_bound(B, iterations=config.bound_iter, lower_bound=lower_bound)
+            bound = certificate.value
+            bound_time = certificate.elapsed
+
+        fingerprint = G.graph.get("fingerprint", "")
+
+        def make_record(key: str, outcome: Dict[str, Any], cached: bool = False) -> RunRecord:
+            name, _, params = STRATEGIES[key]
+            return RunRecord(
+                file=path,
+                digest=G.graph.get("digest", ""),
+                nodes=G.number_of_nodes(),
+                edges=G.number_of_edges(),
+                reduced_nodes=B.number_of_nodes(),
+                reduced_edges=B.number_of_edges(),
+                lower_bound=lower_bound,
+                strategy=key,
+                strategy_name=name,
+                params=dict(params),
+                seed=config.seed,
+                load_time=load_time,
+                reduce_time=reduce_time,
+                bound_time=bound_time,
+                cached=cached,
+                **outcome,
+            )
+
+        def store_params(key: str) -> Dict[str, Any]:
+            run = {name: value for name, value in asdict(config).items() if name not in _EXECUTION_FIELDS}
+            return {"strategy": STRATEGIES[key][2], "run": run, "reduce": reduce, "triangle_pruning": triangle_pruning}
+
+        def checkpoint(key: str) -> Optional[str]:
+            # One prefix per (graph, strategy, seed, parameters): a changed
+            # configuration never resumes from a foreign checkpoint
+            if config.checkpoint_dir is None:
+                return None
+            run = hashlib.sha1(json.dumps(store_params(key), sort_keys=True, default=str).encode()).hexdigest()[:12]
+            return os.path.join(config.checkpoint_dir, f"{fingerprint[:16]}-{key}-{config.seed}-{run}")
+
+        def finish(key: str, outcome: Dict[str, Any]) -> RunRecord:
+            # Cliques are reported and stored with the original labels
+            if reduced is not None:
+                outcome["clique"] = reduced.lift(outcome["clique"])
+                outcome["top_cliques"] = [reduced.lift(clique) for clique in outcome["top_cliques"]]
+            outcome["clique"] = sorted(outcome["clique"])
+            outcome["top_cliques"] = [sorted(clique) for clique in outcome["top_cliques"]]
+            if store is not None:
+                timings = {name: outcome[name] for name in ("constructive_time", "ils_time", "exact_time")}
+                store.put(fingerprint, STRATEGIES[key][1].__name__, store_params(key), config.seed, set(outcome["clique"]), timings)
+            return make_record(key, outcome)
+
+        pending = []
+        for key in keys:
+            hit = None
+            if store is not None:
+                hit = store.get(fingerprint, STRATEGIES[key][1].__name__, store_params(key), config.seed, G=G)
+            if hit is None:
+                pending.append(key)
+                continue
+            outcome = dict(hit.timings, size=hit.size, valid=True, clique=sorted(hit.clique))
+            if bound is not None:
+                outcome.update(upper_bound=bound, gap=max(0, bound - hit.size))
+            yield make_record(key, outcome, cached=True)
+
+        def warm_starts() -> List[Set[int]]:
+            if store is None:
+                return []
+            best = store.best_clique(fingerprint, G=G)
+            warm_start = reduced.project(best) if reduced is not None else best
+            # The projection drops removed vertices and, with triangle
+            # pruning, pruned edges: it may no longer be a clique of B
+            return [warm_start] if warm_start and verify_clique(B, warm_start) else []
+
+        if jobs <= 1:
+            # Serial runs also build on the cliques stored by the previous ones
+            for key in pending:
+                yield finish(key, run_strategy(B, key, config, warm_starts(), bound, checkpoint(key)))
+            continue
+
+        with SharedGraph(B) as shared, ProcessPoolExecutor(
+            max_workers=min(jobs, len(pending)) or 1,
+            initializer=init_worker,
+            initargs=(shared.name,),
+        ) as pool:
+            shared_warm_starts = warm_starts() if pending else []
+            futures = {
+                pool.submit(_worker_run, key, config, shared_warm_starts, bound, checkpoint(key)): key
+                for key in pending
+            }
+            for future in as_completed(futures):
+                yield finish(futures[future], future.result())
+
+
+class RecordWriter:
+    """Stream ``RunRecord`` objects as JSON Lines or CSV, flushing every line."""
+
+    def __init__(self, stream: TextIO, fmt: str = "jsonl"):
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError(f"Unknown output format: {fmt}")
+        self.stream = stream
+        self.fmt = fmt
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, record: RunRecord) -> None:
+        row = asdict(record)
+        if self._csv is not None:
+            row["params"] = json.dumps(row["params"], sort_keys=True)
+            self._csv.writerow(row)
+        else:
+            self.stream.write(json.dumps(row) + "\n")
+        self.stream.flush()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    defaults = RunConfig()
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Run the max-clique strategies + ILS on a batch of DIMACS graphs.",
+    )
+    parser.add_argument("files", nargs="+", help="DIMACS files or glob patterns (e.g. 'data/*.txt')")
+    parser.add_argument(
+        "-s", "--strategies", nargs="+", default=list(STRATEGIES), choices=list(STRATEGIES), metavar="KEY",
+        help="strategy keys (default: all). " + "; ".join(f"{k}={name}" for k, (name, _, _) in STRATEGIES.items()),
+    )
+    parser.add_argument("--iter", type=int, default=defaults.num_iter, help="constructive restarts")
+    parser.add_argument("--ils-iter", type=int, default=defaults.ils_max_iter, help="ILS iterations")
+    parser.add_argument("--ils-k", type=int, default=defaults.ils_k, help="ILS perturbation strength")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="random seed of every run")
+    parser.add_argument("--workers", type=int, default=defaults.workers, help="processes per constructive phase")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per constructive run")
+    parser.add_argument("--stagnation", type=int, default=None, help="constructive restarts without improvement")
+    parser.add_argument("--ils-time-limit", type=float, default=None, help="seconds of ILS")
+    parser.add_argument("--ils-stagnation", type=int, default=None, help="ILS iterations without improvement")
+    parser.add_argument("--exact-time-limit", type=float, default=None, help="seconds of exact branch and bound")
+    parser.add_argument(
+        "--bound-iter", type=int, default=defaults.bound_iter,
+        help="iterated coloring rounds of the upper bound that stops certified runs early",
+    )
+    parser.add_argument("--no-bound", action="store_true", help="skip the upper bound and the early termination")
+    parser.add_argument("--checkpoint-dir", help="checkpoint the runs here and resume interrupted ones")
+    parser.add_argument(
+        "--checkpoint-interval", type=float, default=defaults.checkpoint_interval, help="seconds between checkpoints"
+    )
+    parser.add_argument(
+        "--top-n", type=int, default=defaults.top_n,
+        help="also report the N largest distinct cliques found by each run (JSON Lines only)",
+    )
+    parser.add_argument(
+        "--pool-distance", type=float, default=defaults.pool_distance,
+        help="minimum Jaccard distance between two of the --top-n cliques",
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="strategy runs executed concurrently")
+    parser.add_argument("--no-reduce", action="store_true", help="skip the graph reduction")
+    parser.add_argument("--triangle-pruning", action="store_true", help="also prune edges by triangle count")
+    parser.add_argument("-f", "--format", choices=("jsonl", "csv"), default="jsonl", help="output format")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--store", help="SQLite result cache: skip solved runs, warm-start the ILS")
+    parser.add_argument("--store-size", type=int, default=10000, help="maximum entries of the result cache")
+    parser.add_argument("--trace", help="write a JSON trace of the search metrics (runs in this process only)")
+    parser.add_argument("--profile-interval", type=float, help="also sample the stack every N seconds (with --trace)")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point of the batch mode."""
+    args = build_parser().parse_args(argv)
+    paths = expand_paths(args.files)
+    if not paths:
+        print("No input files match", file=sys.stderr)
+        return 1
+
+    config = RunConfig(
+        num_iter=args.iter,
+        ils_max_iter=args.ils_iter,
+        ils_k=args.ils_k,
+        seed=args.seed,
+        workers=args.workers,
+        time_limit=args.time_limit,
+        stagnation=args.stagnation,
+        ils_time_limit=args.ils_time_limit,
+        ils_stagnation=args.ils_stagnation,
+        exact_time_limit=args.exact_time_limit,
+        bound_iter=None if args.no_bound else args.bound_iter,
+        checkpoint_dir=args.checkpoint_dir,
+        checkpoint_interval=args.checkpoint_interval,
+        top_n=args.top_n,
+        pool_distance=args.pool_distance,
+    )
+
+    if args.trace:
+        tracing = instrumentation.recording(sample_interval=args.profile_interval)
+    else:
+        tracing = contextlib.nullcontext()
+
+    store = ResultStore(args.store, max_entries=args.store_size) if args.store else None
+    stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        writer = RecordWriter(stream, args.format)
+        with tracing as recorder:
+            for record in run_batch(
+                paths,
+                args.strategies,
+                config,
+                jobs=args.jobs,
+                reduce=not args.no_reduce,
+                triangle_pruning=args.triangle_pruning,
+                store=store,
+            ):
+                writer.write(record)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+        if store is not None:
+            store.close()
+    if args.trace:
+        recorder.dump(args.trace)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
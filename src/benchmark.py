@@ -0,0 +1,361 @@
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.bitset import BitsetGraph
+from src.generators import Instance, brock_like, gnp, p_hat_like, power_law, write_dimacs
+from src.loader import cache_path_for, load_dimacs_graph
+from src.local_search import iterative_local_search, local_search
+from src.reduction import degeneracy_clique, reduce_graph
+from src.strategies.registry import STRATEGIES
+
+# Targets timed on every instance unless the suite restricts them.
+ALL_TARGETS = ["load", "load_cached", "reduce"] + [f"strategy:{key}" for key in STRATEGIES] + ["local_search", "ils"]
+# Sparse graphs: the complement-based strategies (IS, VC) are quadratic there.
+SPARSE_TARGETS = ["load", "load_cached", "reduce", "strategy:3", "strategy:4", "local_search", "ils"]
+# Cold start, timed once per suite in fresh interpreters: the bare
+# interpreter, ``import main`` and a one-iteration batch run of main.py.
+STARTUP_TARGETS = ["startup:python", "startup:import", "startup:batch"]
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Instance generators per scale; every generator is seeded, so a suite is
+# the same set of graphs on every machine.
+SUITES: Dict[str, List[Tuple[Callable[[], Instance], List[str]]]] = {
+    "small": [
+        (partial(gnp, 150, 0.5, seed=1), ALL_TARGETS),
+        (partial(p_hat_like, 200, 0.25, 0.75, seed=2, clique_size=20), ALL_TARGETS),
+        (partial(brock_like, 200, 0.6, 18, seed=3), ALL_TARGETS),
+        (partial(power_law, 5000, 3, seed=4, clique_size=8), SPARSE_TARGETS),
+    ],
+    "medium": [
+        (partial(gnp, 500, 0.5, seed=1), ALL_TARGETS),
+        (partial(p_hat_like, 500, 0.25, 0.75, seed=2, clique_size=30), ALL_TARGETS),
+        (partial(brock_like, 400, 0.65, 26, seed=3), ALL_TARGETS),
+        (partial(power_law, 20000, 3, seed=4, clique_size=10), SPARSE_TARGETS),
+    ],
+    "large": [
+        (partial(gnp, 1000, 0.5, seed=1), ALL_TARGETS),
+        (partial(p_hat_like, 1000, 0.25, 0.75, seed=2, clique_size=45), ALL_TARGETS),
+        (partial(brock_like, 800, 0.65, 32, seed=3), ALL_TARGETS),
+        (partial(power_law, 100000, 4, seed=4, clique_size=12), SPARSE_TARGETS),
+    ],
+}
+
+
+@dataclass
+class BenchResult:
+    """Measurement of one target on one instance."""
+
+    instance: str
+    target: str
+    time: float
+    peak_kib: Optional[float]
+    size: Optional[int]
+    optimum: Optional[int]
+
+    @property
+    def key(self) -> str:
+        return f"{self.instance}/{self.target}"
+
+
+def _measure(fn: Callable[[], Any], repeat: int, memory: bool, seed: int) -> Tuple[float, Optional[float], Any]:
+    """
+    Return the best wall time over ``repeat`` runs of ``fn``, its peak
+    traced memory (KiB) and its result.
+
+    ``random`` is reseeded before every run. Memory is measured in an extra
+    run, since tracing allocations slows the interpreter down.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(max(1, repeat)):
+        random.seed(seed)
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        random.seed(seed)
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+    return best, peak, result
+
+
+def bench_instance(
+    instance: Instance,
+    path: Path,
+    targets: Sequence[str],
+    num_iter: int,
+    ils_iter: int,
+    repeat: int = 1,
+    memory: bool = True,
+    seed: int = 0,
+) -> List[BenchResult]:
+    """
+    Time every target on one instance written at ``path``.
+
+    The strategies, ``local_search`` and ``iterative_local_search`` run on
+    the full (unreduced) graph; the two local searches start from the
+    degeneracy lower-bound clique.
+    """
+    optimum = len(instance.planted) or None
+    results = []
+
+    def record(target: str, fn: Callable[[], Any], sized: bool = True) -> Any:
+        elapsed, peak, value = _measure(fn, repeat, memory, seed)
+        size = len(value) if sized else None
+        results.append(BenchResult(instance.name, target, elapsed, peak, size, optimum))
+        return value
+
+    cache_path_for(path).unlink(missing_ok=True)
+    G = load_dimacs_graph(path, use_cache=False)
+    if "load" in targets:
+        record("load", partial(load_dimacs_graph, path, use_cache=False), sized=False)
+    if "load_cached" in targets:
+        load_dimacs_graph(path)  # writes the sidecar cache
+        record("load_cached", partial(load_dimacs_graph, path), sized=False)
+    if "reduce" in targets:
+        def reduce():
+            lower_bound = degeneracy_clique(G)
+            reduce_graph(G, len(lower_bound))
+            return lower_bound
+
+        record("reduce", reduce)
+
+    B = BitsetGraph.from_graph(G)
+    for key, (_, func, params) in STRATEGIES.items():
+        if f"strategy:{key}" in targets:
+            record(f"strategy:{key}", partial(func, B, num_iter=num_iter, **params))
+
+    start = degeneracy_clique(B)
+    if "local_search" in targets:
+        record("local_search", partial(local_search, start, B))
+    if "ils" in targets:
+        record("ils", partial(iterative_local_search, B, start, max_iter=ils_iter, k=2, verbose=False))
+    return results
+
+
+def bench_startup(path: Path, targets: Sequence[str], repeat: int = 3) -> List[BenchResult]:
+    """
+    Time the cold start of the command line: every target runs ``repeat``
+    fresh interpreters from the repository root and keeps the best wall
+    time. ``startup:batch`` solves the DIMACS file at ``path`` with one
+    constructive and one ILS iteration, so it is dominated by imports and
+    loading, like a short batch job.
+    """
+    commands = {
+        "startup:python": [sys.executable, "-c", "pass"],
+        "startup:import": [sys.executable, "-c", "import main"],
+        "startup:batch": [sys.executable, "main.py", str(path), "-s", "3", "--iter", "1", "--ils-iter", "1"],
+    }
+    results = []
+    for target, command in commands.items():
+        if target not in targets:
+            continue
+        best = float("inf")
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            subprocess.run(command, cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL)
+            best = min(best, time.perf_counter() - start)
+        results.append(BenchResult("startup", target, best, None, None, None))
+    return results
+
+
+def run_suite(
+    suite: str,
+    num_iter: int = 100,
+    ils_iter: int = 100,
+    repeat: int = 3,
+    memory: bool = True,
+    seed: int = 0,
+    targets: Optional[Sequence[str]] = None,
+    data_dir: Optional[str] = None,
+    log=None,
+) -> Dict[str, Any]:
+    """
+    Generate the instances of ``suite`` and benchmark them; the cold-start
+    targets run first, on the first instance of the suite.
+
+    Returns
+    -------
+    dict
+        ``{"meta": {...}, "results": [...]}``, the format of the baseline
+        files read by ``compare``.
+    """
+    meta = {
+        "suite": suite,
+        "num_iter": num_iter,
+        "ils_iter": ils_iter,
+        "repeat": repeat,
+        "seed": seed,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    results: List[BenchResult] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(data_dir or tmp)
+        directory.mkdir(parents=True, exist_ok=True)
+        for position, (make, suite_targets) in enumerate(SUITES[suite]):
+            instance = make()
+            path = write_dimacs(instance, directory / f"{instance.name}.clq")
+            if position == 0:
+                startup = [t for t in STARTUP_TARGETS if targets is None or t in targets]
+                for result in bench_startup(path, startup, repeat):
+                    results.append(result)
+                    if log is not None:
+                        log(_format_result(result))
+            selected = [t for t in suite_targets if targets is None or t in targets]
+            for result in bench_instance(instance, path, selected, num_iter, ils_iter, repeat, memory, seed):
+                results.append(result)
+                if log is not None:
+                    log(_format_result(result))
+    return {"meta": meta, "results": [asdict(result) for result in results]}
+
+
+def _format_result(result: BenchResult) -> str:
+    peak = f"{result.peak_kib:10.0f} KiB" if result.peak_kib is not None else " " * 14
+    size = f"{result.size}" if result.size is not None else "-"
+    if result.optimum is not None and result.size is not None:
+        size += f"/{result.optimum}"
+    return f"{result.key:<48} {result.time:9.4f} s {peak}  {size}"
+
+
+@dataclass
+class Regression:
+    key: str
+    kind: str
+    baseline: float
+    current: float
+
+    def __str__(self) -> str:
+        return f"{self.kind:<8} {self.key}: {self.baseline:.4g} -> {self.current:.4g}"
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    time_threshold: float = 0.25,
+    min_time: float = 0.01,
+    memory_threshold: Optional[float] = 0.5,
+    quality_threshold: int = 0,
+) -> List[Regression]:
+    """
+    Compare two benchmark reports entry by entry.
+
+    A target regresses when its time grows by more than ``time_threshold``
+    (relative, and by at least ``min_time`` seconds to ignore timer noise),
+    its peak memory grows by more than ``memory_threshold``, or its clique
+    shrinks by more than ``quality_threshold`` vertices. Targets present in
+    only one report are ignored.
+    """
+    base = {f"{r['instance']}/{r['target']}": r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        key = f"{r['instance']}/{r['target']}"
+        b = base.get(key)
+        if b is None:
+            continue
+        if r["time"] > b["time"] * (1 + time_threshold) and r["time"] - b["time"] > min_time:
+            regressions.append(Regression(key, "time", b["time"], r["time"]))
+        if (
+            memory_threshold is not None
+            and r["peak_kib"] is not None
+            and b["peak_kib"] is not None
+            and r["peak_kib"] > b["peak_kib"] * (1 + memory_threshold)
+        ):
+            regressions.append(Regression(key, "memory", b["peak_kib"], r["peak_kib"]))
+        if r["size"] is not None and b["size"] is not None and r["size"] < b["size"] - quality_threshold:
+            regressions.append(Regression(key, "quality", b["size"], r["size"]))
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.benchmark", description="Benchmark and regression suite.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="generate the instances and benchmark them")
+    run.add_argument("--suite", choices=list(SUITES), default="small")
+    run.add_argument("--iter", type=int, default=100, help="restarts per strategy")
+    run.add_argument("--ils-iter", type=int, default=100, help="ILS iterations")
+    run.add_argument("--repeat", type=int, default=3, help="runs per target (best time is kept)")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--targets", nargs="+", choices=STARTUP_TARGETS + ALL_TARGETS, help="subset of targets")
+    run.add_argument("--no-memory", action="store_true", help="skip the peak-memory run")
+    run.add_argument("--data-dir", help="keep the generated DIMACS files here")
+    run.add_argument("-o", "--output", help="write the report (e.g. a new baseline) to this file")
+    run.add_argument("--baseline", help="compare the run against this report")
+
+    cmp = sub.add_parser("compare", help="compare a report against a baseline")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+
+    for p in (run, cmp):
+        p.add_argument("--time-threshold", type=float, default=0.25, help="allowed relative slowdown")
+        p.add_argument("--min-time", type=float, default=0.01, help="ignore slowdowns below this many seconds")
+        p.add_argument("--memory-threshold", type=float, default=0.5, help="allowed relative peak-memory growth")
+        p.add_argument("--quality-threshold", type=int, default=0, help="allowed clique-size loss")
+    return parser
+
+
+def _load_report(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point; exits with 1 when a regression is found."""
+    args = build_parser().parse_args(argv)
+
+    if args.command == "run":
+        report = run_suite(
+            args.suite,
+            num_iter=args.iter,
+            ils_iter=args.ils_iter,
+            repeat=args.repeat,
+            memory=not args.no_memory,
+            seed=args.seed,
+            targets=args.targets,
+            data_dir=args.data_dir,
+            log=print,
+        )
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=1)
+        if not args.baseline:
+            return 0
+        baseline = _load_report(args.baseline)
+    else:
+        baseline, report = _load_report(args.baseline), _load_report(args.current)
+
+    regressions = compare(
+        baseline,
+        report,
+        time_threshold=args.time_threshold,
+        min_time=args.min_time,
+        memory_threshold=args.memory_threshold,
+        quality_threshold=args.quality_threshold,
+    )
+    for regression in regressions:
+        print(regression)
+    print(f"{len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
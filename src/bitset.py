@@ -0,0 +1,245 @@
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """
+    Yield the indices of the set bits of ``mask`` in increasing order.
+
+    Parameters
+    ----------
+    mask : int
+        Non-negative bitmask.
+
+    Yields
+    ------
+    int
+        Index of each set bit.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitsetGraph:
+    """
+    Undirected graph stored as one adjacency bitset per vertex.
+
+    Vertices are mapped to the contiguous indices ``0..n-1``; row ``i`` is a
+    Python ``int`` whose bit ``j`` is set iff vertices ``i`` and ``j`` are
+    adjacent. Candidate filtering in the strategies then reduces to a single
+    AND over rows instead of one ``has_edge`` lookup per pair.
+
+    The class exposes the subset of the ``nx.Graph`` interface used by the
+    project (``nodes``, ``neighbors``, ``has_edge``, ``degree``, ...), always
+    in terms of the original vertex labels, so it can be passed wherever a
+    graph is expected. The index-level API (``rows``, ``index``, ``mask``,
+    ``members``) is what the hot loops use.
+
+    Parameters
+    ----------
+    labels : list
+        Original vertex labels; ``labels[i]`` is the label of index ``i``.
+    rows : list of int
+        Adjacency bitsets, one per index.
+    """
+
+    __slots__ = ("labels", "index", "rows", "full_mask", "_num_edges")
+
+    def __init__(self, labels: List[Hashable], rows: List[int]):
+        if len(labels) != len(rows):
+            raise ValueError("labels and rows must have the same length")
+
+        self.labels = labels
+        self.index: Dict[Hashable, int] = {u: i for i, u in enumerate(labels)}
+        self.rows = rows
+        self.full_mask = (1 << len(labels)) - 1
+        self._num_edges = sum(row.bit_count() for row in rows) // 2
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_edges(cls, labels: Iterable[Hashable], edges: Iterable[Tuple[Hashable, Hashable]]) -> "BitsetGraph":
+        """
+        Build a bitset graph from a vertex list and an edge list.
+
+        Self-loops are ignored. Endpoints missing from ``labels`` are
+        appended as new vertices.
+        """
+        labels = list(labels)
+        index = {u: i for i, u in enumerate(labels)}
+        rows = [0] * len(labels)
+
+        for u, v in edges:
+            if u == v:
+                continue
+            for w in (u, v):
+                if w not in index:
+                    index[w] = len(labels)
+                    labels.append(w)
+                    rows.append(0)
+            i, j = index[u], index[v]
+            rows[i] |= 1 << j
+            rows[j] |= 1 << i
+
+        return cls(labels, rows)
+
+    @classmethod
+    def from_graph(cls, G) -> "BitsetGraph":
+        """
+        Build a bitset graph from any graph exposing ``nodes()`` and
+        ``neighbors(u)`` (e.g. ``nx.Graph``).
+        """
+        labels = list(G.nodes())
+        index = {u: i for i, u in enumerate(labels)}
+        rows = []
+        for u in labels:
+            row = 0
+            for v in G.neighbors(u):
+                if v != u:
+                    row |= 1 << index[v]
+            rows.append(row)
+        return cls(labels, rows)
+
+    # ------------------------------------------------------------------
+    # In-place updates
+    # ------------------------------------------------------------------
+    # Structures derived from the rows (``reordered`` copies, a
+    # ``TightnessSearch`` engine, adjacency matrices) are not updated.
+    def add_node(self, u: Hashable) -> int:
+        """Add an isolated vertex if missing; return its index."""
+        i = self.index.get(u)
+        if i is None:
+            i = self.index[u] = len(self.labels)
+            self.labels.append(u)
+            self.rows.append(0)
+            self.full_mask |= 1 << i
+        return i
+
+    def add_edge(self, u: Hashable, v: Hashable) -> bool:
+        """
+        Add the edge ``(u, v)``, adding missing endpoints as new vertices.
+        Return False if it was already present (or is a self-loop).
+        """
+        if u == v:
+            return False
+        i, j = self.add_node(u), self.add_node(v)
+        if self.rows[i] >> j & 1:
+            return False
+        self.rows[i] |= 1 << j
+        self.rows[j] |= 1 << i
+        self._num_edges += 1
+        return True
+
+    def remove_edge(self, u: Hashable, v: Hashable) -> bool:
+        """Remove the edge ``(u, v)``; return False if it was not present."""
+        if not self.has_edge(u, v):
+            return False
+        i, j = self.index[u], self.index[v]
+        self.rows[i] &= ~(1 << j)
+        self.rows[j] &= ~(1 << i)
+        self._num_edges -= 1
+        return True
+
+    def copy(self) -> "BitsetGraph":
+        return BitsetGraph(list(self.labels), list(self.rows))
+
+    # ------------------------------------------------------------------
+    # Graph interface (label based)
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.labels)
+
+    def __contains__(self, u: Hashable) -> bool:
+        return u in self.index
+
+    def nodes(self) -> List[Hashable]:
+        return list(self.labels)
+
+    def number_of_nodes(self) -> int:
+        return len(self.labels)
+
+    def number_of_edges(self) -> int:
+        return self._num_edges
+
+    def neighbors(self, u: Hashable) -> Iterator[Hashable]:
+        labels = self.labels
+        return (labels[j] for j in iter_bits(self.rows[self.index[u]]))
+
+    def has_edge(self, u: Hashable, v: Hashable) -> bool:
+        i = self.index.get(u)
+        j = self.index.get(v)
+        if i is None or j is None:
+            return False
+        return bool(self.rows[i] >> j & 1)
+
+    def degree(self, u: Hashable) -> int:
+        return self.rows[self.index[u]].bit_count()
+
+    def edges(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        labels = self.labels
+        for i, row in enumerate(self.rows):
+            # Only j > i, so every edge is produced once
+            for j in iter_bits(row >> (i + 1)):
+                yield labels[i], labels[i + 1 + j]
+
+    # ------------------------------------------------------------------
+    # Index / mask interface
+    # ------------------------------------------------------------------
+    def mask(self, nodes: Iterable[Hashable]) -> int:
+        """Return the bitmask of a collection of vertex labels."""
+        index = self.index
+        m = 0
+        for u in nodes:
+            m |= 1 << index[u]
+        return m
+
+    def members(self, mask: int) -> List[Hashable]:
+        """Return the vertex labels whose bits are set in ``mask``."""
+        labels = self.labels
+        return [labels[i] for i in iter_bits(mask)]
+
+    def common_neighbors(self, mask: int) -> int:
+        """
+        Return the mask of vertices adjacent to every vertex in ``mask``.
+
+        For an empty ``mask`` every vertex qualifies.
+        """
+        rows = self.rows
+        common = self.full_mask
+        for i in iter_bits(mask):
+            common &= rows[i]
+            if not common:
+                break
+        return common
+
+    def reordered(self, order: List[Hashable]) -> "BitsetGraph":
+        """Return a copy whose index ``i`` is the vertex ``order[i]``."""
+        position = [0] * len(self.labels)
+        for new, label in enumerate(order):
+            position[self.index[label]] = new
+
+        rows = [0] * len(self.labels)
+        for new, label in enumerate(order):
+            row = 0
+            for j in iter_bits(self.rows[self.index[label]]):
+                row |= 1 << position[j]
+            rows[new] = row
+        return BitsetGraph(list(order), rows)
+
+    def complement(self) -> "BitsetGraph":
+        """Return the complement graph (no self-loops) on the same labels."""
+        full = self.full_mask
+        rows = [~row & full & ~(1 << i) for i, row in enumerate(self.rows)]
+        return BitsetGraph(list(self.labels), rows)
+
+
+def as_bitset(G) -> BitsetGraph:
+    """Return ``G`` itself if it is already a ``BitsetGraph``, otherwise convert it."""
+    if isinstance(G, BitsetGraph):
+        return G
+    return BitsetGraph.from_graph(G)
@@ -0,0 +1,181 @@
+import time
+from dataclasses import dataclass
+from typing import Hashable, List, Optional, Set, Tuple
+
+from src.bitset import BitsetGraph, as_bitset, iter_bits
+from src.bucket_queue import BucketQueue
+from src.budget import ImproveCallback
+from src.csr import CSRGraph, core_numbers
+
+
+@dataclass
+class UpperBound:
+    """Upper bound on the clique number, with the bounds it combines."""
+
+    value: int
+    core: int
+    coloring: Optional[int]
+    method: str
+    elapsed: float
+
+    def gap(self, clique_size: int) -> int:
+        """Distance between the bound and a clique of ``clique_size`` vertices."""
+        return max(0, self.value - clique_size)
+
+    def certifies(self, clique_size: int) -> bool:
+        """True if a clique of ``clique_size`` vertices is proven maximum."""
+        return clique_size >= self.value
+
+
+def smallest_last(B: BitsetGraph) -> Tuple[List[int], int]:
+    """
+    Smallest-last ordering of a bitset graph.
+
+    Vertices are repeatedly removed by minimum residual degree.
+
+    Returns
+    -------
+    tuple
+        ``(order, degeneracy)``: the vertex indices in reverse removal
+        order (densest core first) and the largest residual degree met at
+        removal time. Every clique has at most ``degeneracy + 1`` vertices.
+    """
+    rows = B.rows
+    queue = BucketQueue(max((row.bit_count() for row in rows), default=0))
+    for i, row in enumerate(rows):
+        queue.insert(i, row.bit_count())
+
+    alive = B.full_mask
+    removed = []
+    degeneracy = 0
+    while len(queue):
+        key = queue.min_key()
+        degeneracy = max(degeneracy, key)
+        v = queue.bucket(key)[-1]
+        queue.remove(v)
+        alive &= ~(1 << v)
+        removed.append(v)
+        for w in iter_bits(rows[v] & alive):
+            queue.decrement(w)
+
+    removed.reverse()
+    return removed, degeneracy
+
+
+def core_bound(G) -> int:
+    """
+    Degeneracy bound ``max core number + 1``.
+
+    On a ``CSRGraph`` the vectorized core decomposition of ``src/csr.py``
+    is used, so the bound is available on graphs too large for bitsets.
+    """
+    if isinstance(G, CSRGraph):
+        return int(core_numbers(G).max()) + 1 if len(G) else 0
+    B = as_bitset(G)
+    return smallest_last(B)[1] + 1 if len(B) else 0
+
+
+def greedy_coloring(B: BitsetGraph, order: List[int]) -> List[int]:
+    """
+    Sequential greedy coloring: every vertex of ``order`` (indices) joins
+    the first color class holding none of its neighbours.
+
+    Returns
+    -------
+    list of int
+        The color classes as bitmasks; their number bounds every clique.
+    """
+    rows = B.rows
+    classes: List[int] = []
+    for v in order:
+        row = rows[v]
+        for c, members in enumerate(classes):
+            if not members & row:
+                classes[c] = members | (1 << v)
+                break
+        else:
+            classes.append(1 << v)
+    return classes
+
+
+def iterated_coloring(B: BitsetGraph, classes: List[int], iterations: int, target: int = 0) -> List[int]:
+    """
+    Culberson's iterated greedy refinement of a coloring.
+
+    Each round recolors the vertices class by class, alternating reverse
+    class order and decreasing class size. Since the vertices of a class
+    are mutually non-adjacent, a round never uses more colors than the
+    previous one. Stops after ``iterations`` rounds, when a round brings no
+    improvement over the last two, or once ``target`` colors are reached.
+    """
+    history = [len(classes)]
+    for round_ in range(iterations):
+        if len(classes) <= target:
+            break
+        if round_ % 2 == 0:
+            ordered = classes[::-1]
+        else:
+            ordered = sorted(classes, key=int.bit_count, reverse=True)
+        classes = greedy_coloring(B, [v for members in ordered for v in iter_bits(members)])
+        history.append(len(classes))
+        if len(history) > 2 and history[-1] == history[-3]:
+            break
+    return classes
+
+
+def upper_bound(G, iterations: int = 10, lower_bound: int = 0) -> UpperBound:
+    """
+    Cheap upper bound on the clique number of ``G``.
+
+    The degeneracy (core) bound comes from the smallest-last ordering;
+    greedy coloring in that same order never uses more than
+    ``degeneracy + 1`` colors, and ``iterations`` rounds of iterated greedy
+    refinement can tighten it further. On a ``CSRGraph`` only the core
+    bound is computed.
+
+    Parameters
+    ----------
+    G : graph
+        Input graph (a ``BitsetGraph`` avoids the conversion).
+    iterations : int
+        Rounds of iterated coloring refinement (0 = plain greedy coloring).
+    lower_bound : int
+        Size of a known clique: the refinement stops once it reaches it.
+
+    Returns
+    -------
+    UpperBound
+        The smallest of the bounds and the bound that gave it.
+    """
+    start = time.perf_counter()
+    if isinstance(G, CSRGraph):
+        core = core_bound(G)
+        return UpperBound(core, core, None, "core", time.perf_counter() - start)
+
+    B = as_bitset(G)
+    if not len(B):
+        return UpperBound(0, 0, 0, "core", time.perf_counter() - start)
+
+    order, degeneracy = smallest_last(B)
+    core = degeneracy + 1
+    classes = greedy_coloring(B, order)
+    coloring = len(classes)
+    method = "coloring" if coloring < core else "core"
+    if iterations > 0 and coloring > lower_bound:
+        classes = iterated_coloring(B, classes, iterations, target=lower_bound)
+        if len(classes) < coloring:
+            coloring = len(classes)
+            method = "iterated coloring"
+    return UpperBound(min(core, coloring), core, coloring, method, time.perf_counter() - start)
+
+
+def stop_at(bound: int) -> ImproveCallback:
+    """
+    ``on_improve`` callback stopping a search as soon as its incumbent
+    reaches ``bound``: no larger clique exists, so nothing is left to find.
+    """
+
+    def on_improve(solution: Set[Hashable], elapsed: float) -> bool:
+        return len(solution) >= bound
+
+    return on_improve
@@ -0,0 +1,112 @@
+from typing import Dict, Hashable, List
+
+
+class BucketQueue:
+    """
+    Priority structure for items with small non-negative integer keys.
+
+    Items live in one bucket per key value (a list, so that a uniformly
+    random item of a bucket can be drawn with ``random.choice``). Insertion,
+    removal and key changes are O(1): a removed item is swapped with the last
+    item of its bucket. The current minimum and maximum keys are tracked with
+    lazy pointers, so ``min_key``/``max_key`` are amortized O(1) when keys
+    move monotonically, as residual degrees do in the greedy constructions.
+
+    Parameters
+    ----------
+    max_key : int
+        Largest key that will ever be stored.
+    """
+
+    __slots__ = ("_buckets", "_key", "_pos", "_min", "_max")
+
+    def __init__(self, max_key: int):
+        self._buckets: List[List[Hashable]] = [[] for _ in range(max_key + 1)]
+        self._key: Dict[Hashable, int] = {}
+        self._pos: Dict[Hashable, int] = {}
+        self._min = max_key + 1
+        self._max = -1
+
+    def __len__(self) -> int:
+        return len(self._key)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._key
+
+    def key(self, item: Hashable) -> int:
+        return self._key[item]
+
+    def insert(self, item: Hashable, key: int) -> None:
+        bucket = self._buckets[key]
+        self._key[item] = key
+        self._pos[item] = len(bucket)
+        bucket.append(item)
+        if key < self._min:
+            self._min = key
+        if key > self._max:
+            self._max = key
+
+    def remove(self, item: Hashable) -> None:
+        key = self._key.pop(item)
+        pos = self._pos.pop(item)
+        bucket = self._buckets[key]
+        last = bucket.pop()
+        if pos < len(bucket):
+            bucket[pos] = last
+            self._pos[last] = pos
+
+    def update(self, item: Hashable, key: int) -> None:
+        self.remove(item)
+        self.insert(item, key)
+
+    def decrement(self, item: Hashable) -> None:
+        self.update(item, self._key[item] - 1)
+
+    def increment(self, item: Hashable) -> None:
+        self.update(item, self._key[item] + 1)
+
+    def min_key(self) -> int:
+        """Return the smallest key in the queue (the queue must not be empty)."""
+        buckets = self._buckets
+        while not buckets[self._min]:
+            self._min += 1
+        return self._min
+
+    def max_key(self) -> int:
+        """Return the largest key in the queue (the queue must not be empty)."""
+        buckets = self._buckets
+        while not buckets[self._max]:
+            self._max -= 1
+        return self._max
+
+    def bucket(self, key: int) -> List[Hashable]:
+        """Return the items with the given key (read-only view)."""
+        return self._buckets[key]
+
+    def smallest(self, k: int) -> List[Hashable]:
+        """Return up to ``k`` items in non-decreasing key order."""
+        result: List[Hashable] = []
+        if not self._key:
+            return result
+        buckets = self._buckets
+        for key in range(self.min_key(), self._max + 1):
+            bucket = buckets[key]
+            if bucket:
+                result.extend(bucket[:k - len(result)])
+                if len(result) >= k:
+                    break
+        return result
+
+    def largest(self, k: int) -> List[Hashable]:
+        """Return up to ``k`` items in non-increasing key order."""
+        result: List[Hashable] = []
+        if not self._key:
+            return result
+        buckets = self._buckets
+        for key in range(self.max_key(), self._min - 1, -1):
+            bucket = buckets[key]
+            if bucket:
+                result.extend(bucket[:k - len(result)])
+                if len(result) >= k:
+                    break
+        return result
@@ -0,0 +1,101 @@
+import time
+from typing import Callable, Hashable, Optional, Set
+
+# Called with the new incumbent and the seconds elapsed since the start of
+# the search; returning True asks the search to stop.
+ImproveCallback = Callable[[Set[Hashable], float], Optional[bool]]
+
+
+class SearchBudget:
+    """
+    Stopping rules shared by the ``solve_*`` strategies and the ILS.
+
+    A search runs until its iteration count is reached or, whichever comes
+    first, until
+
+    * ``time_limit`` seconds have elapsed (checked after every iteration,
+      so at least one iteration always runs and a solution is returned),
+    * ``stagnation`` consecutive iterations brought no improvement,
+    * ``on_improve`` returned True.
+
+    Usage inside a search loop::
+
+        budget = SearchBudget(time_limit, stagnation, on_improve)
+        for _ in range(num_iter):
+            ...
+            if improved:
+                budget.improve(best)
+            if budget.done():
+                break
+
+    ``best`` always holds the last incumbent passed to ``improve``, so an
+    anytime result can be read while the search is running.
+
+    Parameters
+    ----------
+    time_limit : float, optional
+        Wall-clock budget in seconds.
+    stagnation : int, optional
+        Maximum number of consecutive iterations without improvement.
+    on_improve : callable, optional
+        ``on_improve(solution, elapsed)``, invoked on every new incumbent.
+    """
+
+    __slots__ = ("start", "deadline", "stagnation", "on_improve", "best", "iterations", "idle", "stopped", "_improved")
+
+    def __init__(
+        self,
+        time_limit: Optional[float] = None,
+        stagnation: Optional[int] = None,
+        on_improve: Optional[ImproveCallback] = None,
+    ):
+        self.start = time.perf_counter()
+        self.deadline = self.start + time_limit if time_limit is not None else None
+        self.stagnation = stagnation
+        self.on_improve = on_improve
+        self.best: Optional[Set[Hashable]] = None
+        self.iterations = 0
+        self.idle = 0
+        self.stopped = False
+        self._improved = False
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def improve(self, solution: Set[Hashable]) -> None:
+        """Record a new incumbent and notify the callback."""
+        self.best = solution
+        self._improved = True
+        if self.on_improve is not None and self.on_improve(solution, self.elapsed()):
+            self.stopped = True
+
+    def state(self) -> dict:
+        """Counters needed to continue the search later (see ``restore``)."""
+        return {"iterations": self.iterations, "idle": self.idle, "elapsed": self.elapsed()}
+
+    def restore(self, best: Set[Hashable], iterations: int, idle: int, elapsed: float) -> None:
+        """
+        Continue a search saved with ``state``: the counters and the clock
+        pick up where they stopped (the time limit includes the time
+        already spent) and ``on_improve`` is told about the restored
+        incumbent, without counting it as an improvement of this iteration.
+        """
+        self.start -= elapsed
+        if self.deadline is not None:
+            self.deadline -= elapsed
+        self.iterations = iterations
+        self.idle = idle
+        self.best = best
+        if self.on_improve is not None and self.on_improve(best, self.elapsed()):
+            self.stopped = True
+
+    def done(self) -> bool:
+        """Close the current iteration; True if the search must stop."""
+        self.iterations += 1
+        self.idle = 0 if self._improved else self.idle + 1
+        self._improved = False
+        if self.stopped:
+            return True
+        if self.stagnation is not None and self.idle >= self.stagnation:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
@@ -0,0 +1,104 @@
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Bump when the checkpoint layout changes so stale files are rejected.
+CHECKPOINT_VERSION = 2
+# Default seconds between two checkpoints of a running search.
+DEFAULT_INTERVAL = 60.0
+
+
+def rng_state() -> list:
+    """The state of the global ``random`` generator, as JSON-friendly lists."""
+    version, internal, gauss_next = random.getstate()
+    return [version, list(internal), gauss_next]
+
+
+def set_rng_state(state: list) -> None:
+    """Restore a state returned by ``rng_state``."""
+    version, internal, gauss_next = state
+    random.setstate((version, tuple(internal), gauss_next))
+
+
+def write_atomic(path: str | Path, data: Dict[str, Any]) -> None:
+    """
+    Write ``data`` as JSON to ``path`` atomically: the file is written and
+    fsync'ed under a temporary name, then renamed over the previous
+    checkpoint, so a process killed mid-write leaves the old one intact.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_checkpoint(path: str | Path, kind: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the checkpoint of a ``kind`` search (``"ils"``, ``"multistart"``)
+    from ``path``; None if there is none.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a checkpoint of this kind and version.
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    if data.get("kind") != kind or data.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{path}: not a version {CHECKPOINT_VERSION} {kind} checkpoint")
+    return data
+
+
+def check_matches(data: Dict[str, Any], path: str | Path, **expected: Any) -> None:
+    """Raise ValueError if the checkpoint was written by a different run."""
+    for name, value in expected.items():
+        if data.get(name) != value:
+            raise ValueError(f"{path}: checkpoint has {name}={data.get(name)!r}, this run has {value!r}")
+
+
+class Checkpointer:
+    """
+    Time-triggered checkpoint writer of one search.
+
+    The search calls ``due()`` once per iteration (a clock read) and
+    ``save`` only when it returns True, so the cost of checkpointing is one
+    JSON dump every ``interval`` seconds, whatever the iteration rate.
+
+    Parameters
+    ----------
+    path : str or Path
+        Checkpoint file, replaced atomically on every save.
+    kind : str
+        Search type, stored in the file and checked on resume.
+    interval : float
+        Seconds between two checkpoints (0 = after every iteration).
+    """
+
+    __slots__ = ("path", "kind", "interval", "_next")
+
+    def __init__(self, path: str | Path, kind: str, interval: float = DEFAULT_INTERVAL):
+        self.path = Path(path)
+        self.kind = kind
+        self.interval = interval
+        self._next = time.perf_counter() + interval
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        return read_checkpoint(self.path, self.kind)
+
+    def due(self) -> bool:
+        return time.perf_counter() >= self._next
+
+    def save(self, **state: Any) -> None:
+        """Write ``state`` with the ``random`` state and restart the timer."""
+        write_atomic(self.path, dict(state, kind=self.kind, version=CHECKPOINT_VERSION, random_state=rng_state()))
+        self._next = time.perf_counter() + self.interval
@@ -0,0 +1,164 @@
+import contextlib
+import heapq
+from typing import Collection, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Pool of the current process, None when no pool is collecting. Like the
+# recorder of src/instrumentation.py, hot loops read it once through
+# ``active()`` and skip the hooks when it is None.
+_ACTIVE: Optional["CliquePool"] = None
+
+# Heap entry: (size, -sequence, fingerprint, members). The smallest and,
+# among equals, most recent clique sits at the top and is evicted first;
+# sequence numbers are unique, so the comparison never reaches the sets.
+_Entry = Tuple[int, int, int, frozenset]
+
+
+class CliquePool:
+    """
+    Bounded pool of the ``capacity`` largest distinct cliques seen.
+
+    Every phase offers its local optima (each restart of a strategy, each
+    ILS iteration), not only its new records. The pool is a min-heap keyed
+    by size, so once it is full ``offer`` rejects a clique no larger than
+    the smallest one kept with a single comparison, before touching its
+    vertices; an accepted clique costs O(log capacity) heap work.
+
+    Duplicates are detected with an order-independent fingerprint, the sum
+    of the vertex hashes, computed without copying the candidate;
+    fingerprint collisions are resolved by comparing the vertex sets. Only
+    a clique that enters the pool is copied (into a frozenset).
+
+    With ``min_distance > 0`` the kept cliques are also pairwise diverse:
+    a candidate whose Jaccard distance ``1 - |A & B| / |A | B|`` to a kept
+    clique is below ``min_distance`` replaces it if strictly larger and is
+    rejected otherwise. This check scans the pool, so it is only run on
+    candidates that passed the size and duplicate tests.
+
+    Parameters
+    ----------
+    capacity : int
+        Maximum number of cliques kept.
+    min_distance : float
+        Minimum Jaccard distance between two kept cliques, in [0, 1]
+        (0 = only exact duplicates are merged).
+    """
+
+    __slots__ = ("capacity", "min_distance", "_heap", "_index", "_sequence")
+
+    def __init__(self, capacity: int, min_distance: float = 0.0):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not 0.0 <= min_distance <= 1.0:
+            raise ValueError("min_distance must be in [0, 1]")
+        self.capacity = capacity
+        self.min_distance = min_distance
+        self._heap: List[_Entry] = []
+        self._index: Dict[int, List[_Entry]] = {}
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __iter__(self) -> Iterator[Set[Hashable]]:
+        return iter(self.cliques())
+
+    def min_size(self) -> int:
+        """Size a clique must exceed to enter the pool (0 while not full)."""
+        heap = self._heap
+        return heap[0][0] if len(heap) >= self.capacity else 0
+
+    def admits(self, size: int) -> bool:
+        """
+        True if a clique of ``size`` vertices can enter the pool. Callers
+        holding a clique in another form (a bitmask, an index array) check
+        this before building the vertex set to ``offer``.
+        """
+        heap = self._heap
+        return size > 0 and (len(heap) < self.capacity or size > heap[0][0])
+
+    def offer(self, clique: Collection[Hashable]) -> bool:
+        """
+        Submit a clique (any collection of distinct vertices).
+
+        Returns
+        -------
+        bool
+            True if the clique was added to the pool.
+        """
+        size = len(clique)
+        heap = self._heap
+        if size == 0 or (len(heap) >= self.capacity and size <= heap[0][0]):
+            return False
+
+        fingerprint = sum(map(hash, clique))
+        bucket = self._index.get(fingerprint)
+        if bucket is not None:
+            for entry in bucket:
+                # Same size and a superset: the same vertex set
+                if entry[0] == size and entry[3].issuperset(clique):
+                    return False
+
+        members = frozenset(clique)
+        if self.min_distance > 0.0:
+            close = [entry for entry in heap if self._too_close(members, entry[3])]
+            if any(entry[0] >= size for entry in close):
+                return False
+            if close:
+                for entry in close:
+                    heap.remove(entry)
+                    self._unindex(entry)
+                heapq.heapify(heap)
+
+        self._sequence += 1
+        entry = (size, -self._sequence, fingerprint, members)
+        if len(heap) < self.capacity:
+            heapq.heappush(heap, entry)
+        else:
+            self._unindex(heapq.heapreplace(heap, entry))
+        self._index.setdefault(fingerprint, []).append(entry)
+        return True
+
+    def update(self, cliques: Iterable[Collection[Hashable]]) -> None:
+        """Offer every clique of ``cliques`` (e.g. the pool of a worker)."""
+        for clique in cliques:
+            self.offer(clique)
+
+    def cliques(self) -> List[Set[Hashable]]:
+        """The kept cliques, largest first; ties in order of discovery."""
+        return [set(entry[3]) for entry in sorted(self._heap, key=lambda entry: (-entry[0], -entry[1]))]
+
+    def as_lists(self) -> List[List[Hashable]]:
+        """``cliques()`` as sorted vertex lists, for JSON and pickling."""
+        return [sorted(clique) for clique in self.cliques()]
+
+    def _too_close(self, a: frozenset, b: frozenset) -> bool:
+        common = len(a & b)
+        return 1.0 - common / (len(a) + len(b) - common) < self.min_distance
+
+    def _unindex(self, entry: _Entry) -> None:
+        bucket = self._index[entry[2]]
+        bucket.remove(entry)
+        if not bucket:
+            del self._index[entry[2]]
+
+
+def active() -> Optional[CliquePool]:
+    """Return the pool collecting in this process, or None."""
+    return _ACTIVE
+
+
+@contextlib.contextmanager
+def collecting(pool: Optional[CliquePool]) -> Iterator[Optional[CliquePool]]:
+    """
+    Make ``pool`` collect the cliques of every search run inside the block
+    (the strategies, ``multistart`` including its worker processes, and the
+    ILS). ``None`` leaves collection disabled, so callers can write
+    ``with collecting(pool if wanted else None):``.
+    """
+    global _ACTIVE
+    previous = _ACTIVE
+    _ACTIVE = pool
+    try:
+        yield pool
+    finally:
+        _ACTIVE = previous
@@ -0,0 +1,176 @@
+from typing import Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+from src.bitset import BitsetGraph, iter_bits
+
+
+class ComplementView:
+    """
+    Read-only view of the complement H of a graph G.
+
+    H is never materialized; its neighbor sets, degrees and edges are
+    answered on the fly from G's adjacency:
+
+        u ~_H v  <=>  u != v  and  v not in N_G(u)
+
+    so the independent-set and vertex-cover strategies can work on H without
+    building its O(n^2) edges, which is what ``nx.complement`` does.
+
+    When G is a ``BitsetGraph`` the view keeps a reference to its rows and
+    the complement row of index ``i`` is computed when needed as
+    ``full_mask & ~rows[i] & ~(1 << i)``; restricted queries are then one
+    AND and one popcount. Any other graph is copied into adjacency sets
+    (O(n + m) memory), which is the right trade-off for large sparse graphs
+    where n^2 bits would not fit.
+
+    Parameters
+    ----------
+    G : graph
+        Any graph exposing ``nodes()`` and ``neighbors(u)`` (``nx.Graph``,
+        ``BitsetGraph``, ``CSRGraph``, ...).
+
+    Attributes
+    ----------
+    bitset : BitsetGraph or None
+        The underlying bitset graph, or None for the set-based view. In the
+        bitset view the restricted queries (``neighbors_in``, ``degree_in``,
+        ``base_degree_in``) take vertex *indices* and subset *bitmasks*;
+        ``members``/``mask`` convert to and from labels.
+    """
+
+    __slots__ = ("bitset", "_nodes", "_adj", "_num_edges")
+
+    def __init__(self, G):
+        self.bitset: Optional[BitsetGraph] = G if isinstance(G, BitsetGraph) else None
+        self._nodes: List[Hashable] = list(G.nodes())
+        n = len(self._nodes)
+        if self.bitset is not None:
+            self._adj: Optional[Dict[Hashable, Set[Hashable]]] = None
+            self._num_edges = n * (n - 1) // 2 - G.number_of_edges()
+            return
+
+        self._adj = {u: set(G.neighbors(u)) for u in self._nodes}
+        for u, nbrs in self._adj.items():
+            nbrs.discard(u)
+        base_edges = sum(len(nbrs) for nbrs in self._adj.values()) // 2
+        self._num_edges = n * (n - 1) // 2 - base_edges
+
+    # ------------------------------------------------------------------
+    # Graph interface of H (vertex labels, both views)
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._nodes)
+
+    def __contains__(self, u: Hashable) -> bool:
+        if self.bitset is not None:
+            return u in self.bitset.index
+        return u in self._adj
+
+    def nodes(self) -> List[Hashable]:
+        return list(self._nodes)
+
+    def number_of_nodes(self) -> int:
+        return len(self._nodes)
+
+    def number_of_edges(self) -> int:
+        return self._num_edges
+
+    def has_edge(self, u: Hashable, v: Hashable) -> bool:
+        B = self.bitset
+        if B is not None:
+            return u != v and u in B.index and v in B.index and not B.has_edge(u, v)
+        return u != v and u in self._adj and v in self._adj and v not in self._adj[u]
+
+    def degree(self, u: Hashable) -> int:
+        return len(self._nodes) - 1 - self.base_degree(u)
+
+    def neighbors(self, u: Hashable) -> Iterator[Hashable]:
+        B = self.bitset
+        if B is not None:
+            return iter(B.members(self.row(B.index[u])))
+        base = self._adj[u]
+        return (v for v in self._nodes if v != u and v not in base)
+
+    def edges(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        """Generate the edges of H one at a time (O(n^2) time, O(1) memory)."""
+        B = self.bitset
+        if B is not None:
+            labels = B.labels
+            for i in range(len(labels)):
+                for j in iter_bits(self.row(i) >> (i + 1)):
+                    yield labels[i], labels[i + 1 + j]
+            return
+        nodes = self._nodes
+        adj = self._adj
+        for i, u in enumerate(nodes):
+            base = adj[u]
+            for v in nodes[i + 1:]:
+                if v not in base:
+                    yield u, v
+
+    # ------------------------------------------------------------------
+    # Index / mask interface (bitset view only)
+    # ------------------------------------------------------------------
+    @property
+    def full_mask(self) -> int:
+        return self.bitset.full_mask
+
+    def row(self, i: int) -> int:
+        """Return the H-neighbors of index ``i`` as a bitmask."""
+        B = self.bitset
+        return B.full_mask & ~B.rows[i] & ~(1 << i)
+
+    def mask(self, nodes) -> int:
+        return self.bitset.mask(nodes)
+
+    def members(self, mask: int) -> List[Hashable]:
+        return self.bitset.members(mask)
+
+    # ------------------------------------------------------------------
+    # Restricted queries (cost proportional to the subset, not to H)
+    # ------------------------------------------------------------------
+    # Bitset view: ``u`` is an index, ``subset`` a bitmask, and the result of
+    # neighbors_in is a bitmask. Set view: labels and sets of labels.
+    def neighbors_in(self, u, subset):
+        """Return the H-neighbors of ``u`` inside ``subset``."""
+        B = self.bitset
+        if B is not None:
+            return subset & ~B.rows[u] & ~(1 << u)
+        result = subset.difference(self._adj[u])
+        result.discard(u)
+        return result
+
+    def degree_in(self, u, subset) -> int:
+        """Return the H-degree of ``u`` in the subgraph induced by ``subset``."""
+        B = self.bitset
+        if B is not None:
+            return (subset & ~B.rows[u] & ~(1 << u)).bit_count()
+        return len(subset) - self.base_degree_in(u, subset) - (u in subset)
+
+    # ------------------------------------------------------------------
+    # Access to the underlying graph G
+    # ------------------------------------------------------------------
+    def base_neighbors(self, u: Hashable) -> Set[Hashable]:
+        """Return the neighbor set of ``u`` in G (do not modify it)."""
+        B = self.bitset
+        if B is not None:
+            return set(B.neighbors(u))
+        return self._adj[u]
+
+    def base_degree(self, u: Hashable) -> int:
+        B = self.bitset
+        if B is not None:
+            return B.degree(u)
+        return len(self._adj[u])
+
+    def base_degree_in(self, u, subset) -> int:
+        """Return the G-degree of ``u`` in the subgraph induced by ``subset``."""
+        B = self.bitset
+        if B is not None:
+            return (B.rows[u] & subset).bit_count()
+        base = self._adj[u]
+        if len(base) < len(subset):
+            return sum(1 for v in base if v in subset)
+        return sum(1 for v in subset if v in base)
@@ -0,0 +1,449 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Bump when the on-disk layout written by ``CSRGraph.save`` changes.
+CSR_FORMAT_VERSION = 1
+# Adjacency entries processed per block by the streaming kernels, to bound
+# the temporaries on graphs with tens of millions of edges.
+_BLOCK = 1 << 22
+
+
+class CSRGraph:
+    """
+    Undirected graph in compressed sparse row form.
+
+    The neighbours of vertex ``i`` are ``targets[offsets[i]:offsets[i + 1]]``,
+    sorted and without duplicates or self-loops. ``targets`` is ``int32``;
+    ``offsets`` is ``int32`` too unless the graph has 2^31 or more adjacency
+    entries. An edge costs 8 bytes (both directions), against hundreds of
+    bytes in a networkx dict-of-dicts, and both arrays can be memory-mapped
+    from a directory written by ``save``.
+
+    Vertex labels are integers: ``base + i`` by default (``base=1`` gives
+    the DIMACS numbering), or ``labels[i]`` when a label array is given.
+    The class exposes the graph interface used by the project (``nodes``,
+    ``neighbors``, ``has_edge``, ``degree``, ...) in terms of labels; the
+    index-level API (``neighbors_of``, ``degrees``, ``members``) is what the
+    kernels use. Like ``nx.Graph``, ``graph`` holds free-form metadata
+    (the loader stores the digest and fingerprint there).
+
+    Parameters
+    ----------
+    offsets : np.ndarray
+        ``n + 1`` row offsets.
+    targets : np.ndarray
+        Concatenated sorted neighbour lists.
+    base : int
+        Label of index 0 when ``labels`` is None.
+    labels : np.ndarray, optional
+        Integer label of every index.
+    """
+
+    __slots__ = ("offsets", "targets", "base", "labels", "graph", "_index")
+
+    def __init__(
+        self,
+        offsets: np.ndarray,
+        targets: np.ndarray,
+        base: int = 1,
+        labels: Optional[np.ndarray] = None,
+        graph: Optional[Dict[str, Any]] = None,
+    ):
+        if len(offsets) == 0 or int(offsets[-1]) != len(targets):
+            raise ValueError("offsets must have n + 1 entries ending at len(targets)")
+        if labels is not None and len(labels) != len(offsets) - 1:
+            raise ValueError("labels must have one entry per vertex")
+        self.offsets = offsets
+        self.targets = targets
+        self.base = base
+        self.labels = labels
+        self.graph: Dict[str, Any] = dict(graph or {})
+        self._index: Optional[Dict[int, int]] = None
+
+    # ------------------------------------------------------------------
+    # Construction and persistence
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_edges(cls, num_nodes: int, edges: np.ndarray, base: int = 1) -> "CSRGraph":
+        """
+        Build the CSR arrays from an ``(m, 2)`` array of labels
+        ``base..base+n-1`` (e.g. the edges returned by the loader).
+
+        Both directions of every edge are sorted in a single ``int64`` key
+        array, so the peak memory is about 16 bytes per edge on top of the
+        input. Duplicated edges and self-loops are dropped; endpoints beyond
+        ``num_nodes`` extend the vertex range.
+        """
+        edges = np.asarray(edges).reshape(-1, 2)
+        src = edges[:, 0].astype(np.int64) - base
+        dst = edges[:, 1].astype(np.int64) - base
+        keep = src != dst
+        src, dst = src[keep], dst[keep]
+        if src.size and min(int(src.min()), int(dst.min())) < 0:
+            raise ValueError(f"vertex labels must be >= {base}")
+        n = max(num_nodes, int(max(src.max(), dst.max())) + 1 if src.size else 0)
+
+        key = np.concatenate([src * n + dst, dst * n + src])
+        del src, dst, keep
+        key.sort()
+        if key.size:
+            key = key[np.concatenate(([True], key[1:] != key[:-1]))]
+        counts = np.bincount(key // n, minlength=n) if key.size else np.zeros(n, dtype=np.int64)
+        targets = (key % n).astype(np.int32) if key.size else np.zeros(0, dtype=np.int32)
+        del key
+
+        offsets = np.zeros(n + 1, dtype=np.int32 if targets.size < 2**31 else np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(offsets, targets, base=base)
+
+    @classmethod
+    def from_graph(cls, G) -> "CSRGraph":
+        """
+        Build a CSR graph from any graph exposing ``nodes()`` and
+        ``neighbors(u)`` with integer labels (e.g. ``nx.Graph``,
+        ``BitsetGraph``). Indices follow the order of ``nodes()``.
+        """
+        labels = list(G.nodes())
+        if not all(isinstance(u, (int, np.integer)) for u in labels):
+            raise TypeError("CSRGraph requires integer vertex labels")
+        index = {u: i for i, u in enumerate(labels)}
+        counts = np.zeros(len(labels), dtype=np.int64)
+        rows = []
+        for i, u in enumerate(labels):
+            row = sorted({index[v] for v in G.neighbors(u) if v != u})
+            counts[i] = len(row)
+            rows.append(np.asarray(row, dtype=np.int32))
+        offsets = np.zeros(len(labels) + 1, dtype=np.int32 if counts.sum() < 2**31 else np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        targets = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32)
+        return cls(offsets, targets, labels=np.asarray(labels, dtype=np.int64))
+
+    def save(self, directory: str | Path) -> Path:
+        """
+        Write the graph as ``.npy`` arrays plus a ``meta.json`` (written
+        last, so an interrupted save is never read back as valid).
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "meta.json").unlink(missing_ok=True)
+        np.save(directory / "offsets.npy", self.offsets)
+        np.save(directory / "targets.npy", self.targets)
+        if self.labels is not None:
+            np.save(directory / "labels.npy", self.labels)
+        meta = {"version": CSR_FORMAT_VERSION, "base": self.base, "labels": self.labels is not None, "graph": self.graph}
+        tmp = directory / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, directory / "meta.json")
+        return directory
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> Optional["CSRGraph"]:
+        """
+        Read a graph written by ``save``; with ``mmap`` the arrays are
+        memory-mapped read-only instead of read into memory. Returns None if
+        the directory holds no complete graph of the current format.
+        """
+        directory = Path(directory)
+        try:
+            meta = json.loads((directory / "meta.json").read_text())
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != CSR_FORMAT_VERSION:
+            return None
+        mode = "r" if mmap else None
+        offsets = np.load(directory / "offsets.npy", mmap_mode=mode)
+        targets = np.load(directory / "targets.npy", mmap_mode=mode)
+        labels = np.load(directory / "labels.npy", mmap_mode=mode) if meta["labels"] else None
+        return cls(offsets, targets, base=meta["base"], labels=labels, graph=meta["graph"])
+
+    def fingerprint(self) -> str:
+        """
+        Canonical hash of the graph, computed block by block from the
+        sorted rows. With the default labels it equals
+        ``loader.graph_fingerprint`` of the edge list, so a graph gets the
+        same key in the result store whichever backend loaded it.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(np.int64(len(self)).tobytes())
+        offsets, targets = self.offsets, self.targets
+        n = len(self)
+        start = 0
+        while start < n:
+            # Rows [start, stop) hold about _BLOCK adjacency entries
+            stop = int(np.searchsorted(offsets, int(offsets[start]) + _BLOCK, side="right"))
+            stop = min(max(stop - 1, start + 1), n)
+            lo, hi = int(offsets[start]), int(offsets[stop])
+            src = np.repeat(np.arange(start, stop, dtype=np.int64), np.diff(offsets[start:stop + 1]))
+            dst = targets[lo:hi].astype(np.int64)
+            upper = dst > src
+            pairs = np.empty((int(upper.sum()), 2), dtype="<i8")
+            pairs[:, 0] = self._label_array(src[upper])
+            pairs[:, 1] = self._label_array(dst[upper])
+            h.update(pairs.tobytes())
+            start = stop
+        return h.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Graph interface (label based)
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.nodes())
+
+    def __contains__(self, u: Hashable) -> bool:
+        return self.index_of(u) is not None
+
+    def nodes(self) -> List[int]:
+        if self.labels is None:
+            return list(range(self.base, self.base + len(self)))
+        return self.labels.tolist()
+
+    def number_of_nodes(self) -> int:
+        return len(self)
+
+    def number_of_edges(self) -> int:
+        return len(self.targets) // 2
+
+    def neighbors(self, u: Hashable) -> Iterator[int]:
+        return iter(self.members(self.neighbors_of(self._require(u))))
+
+    def has_edge(self, u: Hashable, v: Hashable) -> bool:
+        i, j = self.index_of(u), self.index_of(v)
+        if i is None or j is None:
+            return False
+        row = self.neighbors_of(i)
+        pos = int(np.searchsorted(row, j))
+        return pos < len(row) and int(row[pos]) == j
+
+    def degree(self, u: Hashable) -> int:
+        i = self._require(u)
+        return int(self.offsets[i + 1] - self.offsets[i])
+
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        for i in range(len(self)):
+            row = self.neighbors_of(i)
+            upper = row[np.searchsorted(row, i, side="right"):]
+            label = self.label_of(i)
+            for v in self.members(upper):
+                yield label, v
+
+    # ------------------------------------------------------------------
+    # Index interface
+    # ------------------------------------------------------------------
+    def index_of(self, u: Hashable) -> Optional[int]:
+        """Index of label ``u``, or None if it is not a vertex."""
+        if self.labels is None:
+            if not isinstance(u, (int, np.integer)):
+                return None
+            i = int(u) - self.base
+            return i if 0 <= i < len(self) else None
+        if self._index is None:
+            self._index = {u: i for i, u in enumerate(self.labels.tolist())}
+        return self._index.get(u)
+
+    def _require(self, u: Hashable) -> int:
+        i = self.index_of(u)
+        if i is None:
+            raise KeyError(u)
+        return i
+
+    def label_of(self, i: int) -> int:
+        return int(self.labels[i]) if self.labels is not None else self.base + int(i)
+
+    def _label_array(self, indices: np.ndarray) -> np.ndarray:
+        return self.labels[indices] if self.labels is not None else indices + self.base
+
+    def indices(self, nodes: Iterable[Hashable]) -> np.ndarray:
+        """Sorted index array of a collection of labels."""
+        return np.sort(np.fromiter((self._require(u) for u in nodes), dtype=np.int64))
+
+    def members(self, indices: np.ndarray) -> List[int]:
+        """Labels of an index array."""
+        return self._label_array(np.asarray(indices, dtype=np.int64)).tolist()
+
+    def neighbors_of(self, i: int) -> np.ndarray:
+        """Sorted neighbour indices of index ``i`` (a view, no copy)."""
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+
+# ----------------------------------------------------------------------
+# Kernels
+# ----------------------------------------------------------------------
+def intersect_sorted(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Intersection of two sorted arrays of distinct indices, sorted.
+
+    Every element of the shorter array is binary-searched in the longer
+    one: O(min log max), which beats a merge when a small candidate set is
+    intersected with a hub's neighbour list.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return a[:0]
+    pos = np.searchsorted(b, a)
+    pos[pos == len(b)] = 0
+    return a[b[pos] == a]
+
+
+def intersect_size(a: np.ndarray, b: np.ndarray) -> int:
+    """Size of the intersection of two sorted arrays of distinct indices."""
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return 0
+    pos = np.searchsorted(b, a)
+    pos[pos == len(b)] = 0
+    return int(np.count_nonzero(b[pos] == a))
+
+
+def contains_sorted(a: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Boolean mask: which ``values`` occur in the sorted array ``a``."""
+    values = np.asarray(values)
+    if not len(a):
+        return np.zeros(len(values), dtype=bool)
+    pos = np.searchsorted(a, values)
+    pos[pos == len(a)] = 0
+    return a[pos] == values
+
+
+def has_edges(G: CSRGraph, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """
+    Vectorized adjacency test of index pairs: ``out[k]`` is True iff
+    ``v[k]`` is a neighbour of ``u[k]``. All the rows are binary-searched
+    at once, so no lookup structure beyond the CSR arrays is needed.
+    """
+    u = np.asarray(u, dtype=np.int64)
+    v = np.asarray(v, dtype=np.int64)
+    targets = G.targets
+    if not len(targets) or not len(u):
+        return np.zeros(len(u), dtype=bool)
+    lo = G.offsets[u].astype(np.int64)
+    end = G.offsets[u + 1].astype(np.int64)
+    hi = end.copy()
+    last = len(targets) - 1
+    active = lo < hi
+    while active.any():
+        mid = (lo + hi) >> 1
+        right = active & (targets[np.minimum(mid, last)] < v)
+        lo = np.where(right, mid + 1, lo)
+        hi = np.where(active & ~right, mid, hi)
+        active = lo < hi
+    return (lo < end) & (targets[np.minimum(lo, last)] == v)
+
+
+def gather(G: CSRGraph, vertices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Concatenated neighbour lists of ``vertices``, and for each entry the
+    position in ``vertices`` of the vertex it belongs to.
+    """
+    vertices = np.asarray(vertices, dtype=np.int64)
+    starts = G.offsets[vertices].astype(np.int64)
+    lengths = G.offsets[vertices + 1].astype(np.int64) - starts
+    total = int(lengths.sum())
+    owner = np.repeat(np.arange(len(vertices)), lengths)
+    if not total:
+        return G.targets[:0], owner
+    first = np.cumsum(lengths) - lengths
+    positions = np.arange(total, dtype=np.int64) + np.repeat(starts - first, lengths)
+    return G.targets[positions], owner
+
+
+def neighbor_sums(G: CSRGraph, values: np.ndarray) -> np.ndarray:
+    """
+    ``out[i] = sum(values[j] for j in neighbours of i)``, i.e. the product
+    of the adjacency matrix with ``values``, computed by blocks of rows.
+    """
+    n = len(G)
+    out = np.zeros(n, dtype=np.float64)
+    offsets, targets = G.offsets, G.targets
+    start = 0
+    while start < n:
+        stop = int(np.searchsorted(offsets, int(offsets[start]) + _BLOCK, side="right"))
+        stop = min(max(stop - 1, start + 1), n)
+        lo = int(offsets[start])
+        segment = np.concatenate(([0.0], np.cumsum(values[targets[lo:int(offsets[stop])]], dtype=np.float64)))
+        bounds = offsets[start:stop + 1].astype(np.int64) - lo
+        out[start:stop] = segment[bounds[1:]] - segment[bounds[:-1]]
+        start = stop
+    return out
+
+
+def forward_degrees(G: CSRGraph, rank: np.ndarray) -> np.ndarray:
+    """
+    ``out[i]`` = number of neighbours ``j`` of ``i`` with ``rank[j] > rank[i]``,
+    computed by blocks of rows. With the ranks of a degeneracy ordering
+    every entry is at most the degeneracy.
+    """
+    n = len(G)
+    out = np.zeros(n, dtype=np.int64)
+    offsets, targets = G.offsets, G.targets
+    start = 0
+    while start < n:
+        stop = int(np.searchsorted(offsets, int(offsets[start]) + _BLOCK, side="right"))
+        stop = min(max(stop - 1, start + 1), n)
+        lo, hi = int(offsets[start]), int(offsets[stop])
+        owner = np.repeat(np.arange(start, stop), np.diff(offsets[start:stop + 1]))
+        later = rank[targets[lo:hi]] > rank[owner]
+        out[start:stop] = np.bincount(owner[later] - start, minlength=stop - start)
+        start = stop
+    return out
+
+
+def _peel(G: CSRGraph) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Core decomposition by batch peeling.
+
+    For k = 0, 1, ... every vertex whose residual degree is at most k is
+    removed, in rounds, together with the other vertices of its round; the
+    residual degrees of the neighbours are updated with one vectorized
+    gather per round. Returns the removal order and the core numbers.
+    """
+    n = len(G)
+    degree = G.degrees().astype(np.int64)
+    alive = np.ones(n, dtype=bool)
+    core = np.zeros(n, dtype=np.int32)
+    order = np.empty(n, dtype=np.int64)
+    filled = 0
+    k = 0
+    while filled < n:
+        remaining = np.flatnonzero(alive)
+        k = max(k, int(degree[remaining].min()))
+        frontier = remaining[degree[remaining] <= k]
+        while frontier.size:
+            alive[frontier] = False
+            core[frontier] = k
+            order[filled:filled + frontier.size] = frontier
+            filled += frontier.size
+            neighbours, _ = gather(G, frontier)
+            neighbours = neighbours[alive[neighbours]]
+            if not neighbours.size:
+                break
+            touched, counts = np.unique(neighbours, return_counts=True)
+            degree[touched] -= counts
+            frontier = touched[degree[touched] <= k]
+    return order, core
+
+
+def degeneracy_order(G: CSRGraph) -> np.ndarray:
+    """
+    Indices in degeneracy (smallest-last) order, densest core first, as
+    ``exact.degeneracy_order``: every vertex has at most ``d`` neighbours
+    before it, ``d`` being the degeneracy.
+    """
+    return _peel(G)[0][::-1].copy()
+
+
+def core_numbers(G: CSRGraph) -> np.ndarray:
+    """Core number of every index."""
+    return _peel(G)[1]
@@ -0,0 +1,476 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from multiprocessing import Value, shared_memory
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.bitset import BitsetGraph, iter_bits
+from src.budget import ImproveCallback
+from src.csr import CSRGraph, degeneracy_order, forward_degrees, gather, has_edges, intersect_sorted
+from src.exact import max_clique_exact
+from src.local_search import local_search
+from src.strategies.registry import STRATEGIES
+
+# Vertices whose subproblem bound is tested at once, before chunking.
+_WINDOW = 8192
+# Vertices with more later neighbours than this skip the vectorized screen:
+# it tests every pair of them.
+_SCREEN_LIMIT = 64
+
+# Solver of the current worker process, built once by ``_init_worker``.
+_WORKER: Optional["_EgoSolver"] = None
+# Shared memory blocks the worker's arrays live in (kept open while it runs).
+_WORKER_BLOCKS: List[shared_memory.SharedMemory] = []
+
+
+@dataclass
+class DecompositionResult:
+    """Outcome of the ego-network decomposition."""
+
+    clique: Set[Hashable]
+    optimal: bool
+    degeneracy: int
+    subproblems: int
+    exact: int
+    skipped: int
+    elapsed: float
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+def ego_subgraph(G: CSRGraph, rank: np.ndarray, v: int, floor: int = 0) -> Optional[BitsetGraph]:
+    """
+    Bitset graph of vertex ``v`` and its later neighbours (higher ``rank``).
+
+    Every clique of ``G`` lies in the subgraph of its lowest-ranked member,
+    where that member is adjacent to all the other vertices. Only cliques
+    larger than ``floor`` are of interest, so later neighbours with fewer
+    than ``floor - 1`` neighbours among the others are peeled away
+    (repeatedly). Index 0 is ``v``; labels are those of ``G``.
+
+    Returns
+    -------
+    BitsetGraph or None
+        None when what is left cannot hold a clique larger than ``floor``.
+    """
+    nbrs = G.neighbors_of(v)
+    later = nbrs[rank[nbrs] > rank[v]]
+    if later.size + 1 <= floor:
+        return None
+
+    rows = []
+    for w in later.tolist():
+        row = 0
+        for q in np.searchsorted(later, intersect_sorted(G.neighbors_of(w), later)).tolist():
+            row |= 1 << q
+        rows.append(row)
+
+    full = alive = (1 << len(rows)) - 1
+    need = floor - 1
+    changed = need > 0
+    while changed:
+        changed = False
+        for i in iter_bits(alive):
+            if (rows[i] & alive).bit_count() < need:
+                alive &= ~(1 << i)
+                changed = True
+    if alive.bit_count() + 1 <= floor:
+        return None
+
+    # v becomes index 0, adjacent to every kept vertex
+    if alive == full:
+        keep = list(range(len(rows)))
+        local = [(row << 1) | 1 for row in rows]
+    else:
+        keep = list(iter_bits(alive))
+        position = {i: new + 1 for new, i in enumerate(keep)}
+        local = []
+        for i in keep:
+            row = 1
+            for j in iter_bits(rows[i] & alive):
+                row |= 1 << position[j]
+            local.append(row)
+    labels = [G.label_of(v)] + G.members(later[keep])
+    return BitsetGraph(labels, [((1 << len(keep)) - 1) << 1] + local)
+
+
+def screen(G: CSRGraph, rank: np.ndarray, vertices: np.ndarray, floor: int) -> np.ndarray:
+    """
+    Vectorized first peeling round of ``ego_subgraph`` over many vertices.
+
+    For every later-neighbour pair of every vertex the adjacency is tested
+    in one ``has_edges`` call. A vertex is kept only if at least ``floor``
+    of its later neighbours have ``floor - 1`` or more neighbours among the
+    others, which a clique larger than ``floor`` needs. Vertices with more
+    than ``_SCREEN_LIMIT`` later neighbours are kept untested.
+    """
+    if floor < 2 or not len(vertices):
+        return vertices
+    nbrs, owner = gather(G, vertices)
+    later = rank[nbrs] > rank[vertices[owner]]
+    nbrs, owner = nbrs[later], owner[later]
+    size = np.bincount(owner, minlength=len(vertices))
+    large = size > _SCREEN_LIMIT
+    nbrs, owner = nbrs[~large[owner]], owner[~large[owner]]
+
+    # All ordered pairs (a, b) of positions in nbrs with the same owner: the
+    # later neighbours of a vertex are contiguous, from start[owner]
+    kept = np.where(large, 0, size)
+    start = np.cumsum(kept) - kept
+    group = kept[owner]
+    a = np.repeat(np.arange(len(nbrs)), group)
+    b = np.repeat(start[owner], group) + np.arange(len(a)) - np.repeat(np.cumsum(group) - group, group)
+    distinct = a != b
+    a, b = a[distinct], b[distinct]
+    adjacent = has_edges(G, nbrs[a], nbrs[b])
+    degree = np.bincount(a[adjacent], minlength=len(nbrs))
+
+    useful = np.bincount(owner[degree >= floor - 1], minlength=len(vertices))
+    return vertices[(useful >= floor) | large]
+
+
+def solve_ego(
+    B: BitsetGraph,
+    floor: int,
+    strategy: str = "4",
+    num_iter: int = 20,
+    exact_size: int = 96,
+    exact_node_limit: Optional[int] = 20000,
+) -> Tuple[Set[Hashable], bool]:
+    """
+    Largest clique of one ego subgraph, if larger than ``floor``.
+
+    Subgraphs of at most ``exact_size`` vertices go to the branch and bound
+    (with ``floor`` as lower bound and ``exact_node_limit`` search nodes);
+    larger ones, or those the exact search could not close, to the
+    ``strategy`` of the registry (``num_iter`` restarts) and ``local_search``.
+
+    Returns
+    -------
+    tuple
+        ``(clique, exact)``: ``exact`` is True when the subgraph is proven
+        to hold no clique larger than ``max(floor, len(clique))``.
+    """
+    best: Set[Hashable] = set()
+    if len(B) <= exact_size:
+        result = max_clique_exact(B, node_limit=exact_node_limit, lower_bound=floor)
+        if result.optimal:
+            return result.clique, True
+        best = result.clique
+    _, func, params = STRATEGIES[strategy]
+    found = local_search(func(B, num_iter=num_iter, **params), B)
+    return (found if len(found) > len(best) else best), False
+
+
+class _EgoSolver:
+    """
+    Solves chunks of ego subproblems against an incumbent size, shared
+    with the other workers through ``shared`` (a ``multiprocessing.Value``)
+    when given.
+    """
+
+    def __init__(self, G: CSRGraph, rank: np.ndarray, settings: Dict[str, Any], shared=None):
+        self.G = G
+        self.rank = rank
+        self.settings = settings
+        self.shared = shared
+        self.best_size = 0
+
+    def floor(self) -> int:
+        if self.shared is not None:
+            return max(self.best_size, self.shared.value)
+        return self.best_size
+
+    def solve(self, vertices: Iterable[int]) -> Tuple[List[Hashable], List[int]]:
+        """
+        Solve the subproblems of ``vertices`` in order.
+
+        Returns
+        -------
+        tuple
+            The best clique found by the chunk if it beat the incumbent
+            (else empty) and the counts ``[solved, exact, pruned]``.
+        """
+        found: Set[Hashable] = set()
+        counts = [0, 0, 0]
+        for v in vertices:
+            floor = self.floor()
+            B = ego_subgraph(self.G, self.rank, v, floor)
+            if B is None:
+                counts[2] += 1
+                continue
+            clique, exact = solve_ego(B, floor, **self.settings)
+            counts[0] += 1
+            counts[1] += exact
+            if len(clique) > floor:
+                found = clique
+                self.best_size = len(clique)
+                if self.shared is not None:
+                    with self.shared.get_lock():
+                        if len(clique) > self.shared.value:
+                            self.shared.value = len(clique)
+        return sorted(found), counts
+
+
+class _SharedArrays:
+    """NumPy arrays published in shared memory blocks, attached by name in the workers."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self._blocks = []
+        self.spec: Dict[str, Tuple[str, Tuple[int, ...], str]] = {}
+        for name, array in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            self._blocks.append(shm)
+            self.spec[name] = (shm.name, array.shape, array.dtype.str)
+
+    def close(self) -> None:
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self) -> "_SharedArrays":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def attach(spec: Dict[str, Tuple[str, Tuple[int, ...], str]]):
+        """Return the arrays of ``spec`` (views on the blocks) and the open blocks."""
+        arrays, blocks = {}, []
+        for name, (shm_name, shape, dtype) in spec.items():
+            shm = shared_memory.SharedMemory(name=shm_name)
+            blocks.append(shm)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        return arrays, blocks
+
+
+def _init_worker(spec, base: int, settings: Dict[str, Any], shared) -> None:
+    global _WORKER, _WORKER_BLOCKS
+    arrays, _WORKER_BLOCKS = _SharedArrays.attach(spec)
+    G = CSRGraph(arrays["offsets"], arrays["targets"], base=base, labels=arrays.get("labels"))
+    _WORKER = _EgoSolver(G, arrays["rank"], settings, shared)
+
+
+def _worker_solve(vertices: List[int]) -> Tuple[List[Hashable], List[int]]:
+    return _WORKER.solve(vertices)
+
+
+def ego_decomposition(
+    G,
+    strategy: str = "4",
+    num_iter: int = 20,
+    exact_size: int = 96,
+    exact_node_limit: Optional[int] = 20000,
+    workers: int = 1,
+    chunk_size: int = 256,
+    incumbent: Optional[Iterable[Hashable]] = None,
+    time_limit: Optional[float] = None,
+    on_improve: Optional[ImproveCallback] = None,
+) -> DecompositionResult:
+    """
+    Maximum clique of a large sparse graph by ego-network decomposition.
+
+    With the vertices ranked by a degeneracy (smallest-last) ordering, the
+    lowest-ranked member ``v`` of any clique is adjacent to all the others,
+    which are later neighbours of ``v``: at most ``degeneracy`` of them. So
+    instead of one search over the whole graph, every vertex gets a small
+    bitset subproblem (``ego_subgraph``), solved exactly or heuristically
+    (``solve_ego``). Vertices are visited densest core first and, since a
+    subproblem of ``v`` holds at most ``forward degree + 1`` vertices, all
+    those that cannot beat the incumbent are skipped without being built;
+    a vectorized peeling round (``screen``) rules out most of the others.
+
+    The vertices stream in chunks of ``chunk_size`` through ``workers``
+    processes (the CSR arrays are published once in shared memory), with
+    at most two chunks in flight per worker. The incumbent size is shared
+    by all workers, so every subproblem is skipped or pruned against the
+    best clique found anywhere so far.
+
+    Parameters
+    ----------
+    G : graph
+        A ``CSRGraph`` (other graphs with integer labels are converted).
+    strategy : str
+        Key of ``STRATEGIES`` used on the subproblems not solved exactly.
+    num_iter : int
+        Restarts of the strategy per subproblem.
+    exact_size : int
+        Subproblems up to this many vertices are solved exactly.
+    exact_node_limit : int, optional
+        Search nodes of the exact solve of one subproblem.
+    workers : int
+        Worker processes; 1 solves everything in this process.
+    chunk_size : int
+        Vertices per task.
+    incumbent : iterable, optional
+        A known clique of ``G``: only larger ones are searched.
+    time_limit : float, optional
+        Seconds after which no further chunk is started.
+    on_improve : callable, optional
+        ``on_improve(clique, elapsed)`` on every new incumbent, as the
+        chunks complete; returning True stops the search.
+
+    Returns
+    -------
+    DecompositionResult
+        The best clique; ``optimal`` is True when every subproblem was
+        either skipped by the bounds or solved exactly. ``skipped`` counts
+        the subproblems ruled out by the bounds, ``subproblems`` and
+        ``exact`` the solved ones.
+    """
+    start = time.perf_counter()
+    if not isinstance(G, CSRGraph):
+        G = CSRGraph.from_graph(G)
+    n = len(G)
+
+    order = degeneracy_order(G)
+    # Removal position: later neighbours of v are those with a higher rank
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n - 1, -1, -1)
+    forward = forward_degrees(G, rank)
+    degeneracy = int(forward.max()) if n else 0
+    settings = {"strategy": strategy, "num_iter": num_iter, "exact_size": exact_size, "exact_node_limit": exact_node_limit}
+    deadline = start + time_limit if time_limit is not None else None
+
+    best: Set[Hashable] = set(incumbent or ())
+    shared = Value("q", len(best)) if workers > 1 else None
+    counts = [0, 0, 0]
+    skipped = [0, 0]
+    stopped = False
+
+    def floor() -> int:
+        return max(len(best), shared.value) if shared is not None else len(best)
+
+    def chunks() -> Iterator[List[int]]:
+        # Windows of vertices are tested at once against the incumbent: the
+        # forward degree bounds every subproblem, then the screen peels
+        # one round; only the survivors are chunked and built
+        for lo in range(0, n, _WINDOW):
+            if floor() > degeneracy:
+                skipped[0] += n - lo
+                return
+            window = order[lo:lo + _WINDOW]
+            keep = window[forward[window] >= floor()]
+            skipped[0] += window.size - keep.size
+            screened = screen(G, rank, keep, floor())
+            skipped[1] += keep.size - screened.size
+            for first in range(0, screened.size, chunk_size):
+                yield screened[first:first + chunk_size].tolist()
+
+    def collect(clique: List[Hashable], chunk_counts: List[int]) -> None:
+        nonlocal best, stopped
+        for i, count in enumerate(chunk_counts):
+            counts[i] += count
+        if len(clique) > len(best):
+            best = set(clique)
+            if on_improve is not None and on_improve(best, time.perf_counter() - start):
+                stopped = True
+        if deadline is not None and time.perf_counter() >= deadline:
+            stopped = True
+
+    source = chunks()
+    exhausted = False
+    if workers <= 1:
+        solver = _EgoSolver(G, rank, settings)
+        solver.best_size = len(best)
+        for chunk in source:
+            collect(*solver.solve(chunk))
+            if stopped:
+                break
+        else:
+            exhausted = True
+    else:
+        arrays = {"offsets": G.offsets, "targets": G.targets, "rank": rank}
+        if G.labels is not None:
+            arrays["labels"] = G.labels
+        with _SharedArrays(arrays) as blocks, ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(blocks.spec, G.base, settings, shared),
+        ) as executor:
+            pending = set()
+            while True:
+                # Keep two chunks per worker in flight, drawn lazily so the
+                # skip test sees the latest incumbent
+                while not stopped and not exhausted and len(pending) < 2 * workers:
+                    chunk = next(source, None)
+                    if chunk is None:
+                        exhausted = True
+                    else:
+                        pending.add(executor.submit(_worker_solve, chunk))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(*future.result())
+
+    solved, exact, pruned = counts
+    return DecompositionResult(
+        clique=best,
+        optimal=exhausted and solved == exact,
+        degeneracy=degeneracy,
+        subproblems=solved,
+        exact=exact,
+        skipped=sum(skipped) + pruned,
+        elapsed=time.perf_counter() - start,
+        stats={"skipped_by_degree": skipped[0], "skipped_by_screen": skipped[1], "pruned_by_core": pruned},
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.decomposition",
+        description="Maximum clique of a large sparse DIMACS graph by ego-network decomposition.",
+    )
+    parser.add_argument("file", help="DIMACS graph file (loaded into the CSR backend)")
+    parser.add_argument("-s", "--strategy", default="4", choices=list(STRATEGIES), help="strategy of the large subproblems")
+    parser.add_argument("--iter", type=int, default=20, help="strategy restarts per subproblem")
+    parser.add_argument("--exact-size", type=int, default=96, help="largest subproblem solved exactly")
+    parser.add_argument("--exact-node-limit", type=int, default=20000, help="search nodes per exact subproblem")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=256, help="vertices per task")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds before no further chunk is started")
+    return parser
+
+
+def main(argv=None) -> int:
+    """Command-line entry point: one JSON line with the clique and the counters."""
+    from src.loader import load_dimacs_csr
+    from src.verify import verify_clique
+
+    args = build_parser().parse_args(argv)
+    start = time.perf_counter()
+    G = load_dimacs_csr(args.file)
+    load_time = time.perf_counter() - start
+
+    result = ego_decomposition(
+        G,
+        strategy=args.strategy,
+        num_iter=args.iter,
+        exact_size=args.exact_size,
+        exact_node_limit=args.exact_node_limit,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        time_limit=args.time_limit,
+    )
+    record = dict(asdict(result), clique=sorted(result.clique))
+    record.update(
+        file=args.file,
+        nodes=G.number_of_nodes(),
+        edges=G.number_of_edges(),
+        size=len(result.clique),
+        valid=verify_clique(G, result.clique),
+        load_time=load_time,
+    )
+    print(json.dumps(record))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
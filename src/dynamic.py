@@ -0,0 +1,181 @@
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Hashable, Iterable, List, Optional, Set, Tuple
+
+from src import instrumentation
+from src.bitset import BitsetGraph, as_bitset
+from src.local_search import _greedy_clique_on_candidates, iterative_local_search, local_search
+from src.reduction import degeneracy_clique
+
+Edge = Tuple[Hashable, Hashable]
+
+
+@dataclass
+class DeltaResult:
+    """Outcome of one ``DynamicSolver.apply``."""
+
+    clique: Set[Hashable]
+    previous_size: int
+    added: int
+    removed: int
+    broken: bool
+    repaired_size: int
+    elapsed: float
+
+    @property
+    def size(self) -> int:
+        return len(self.clique)
+
+
+def read_delta(path: str | Path) -> Tuple[List[Edge], List[Edge]]:
+    """
+    Read an edge delta file: one change per line, ``a u v`` to insert and
+    ``d u v`` to delete an edge (integer vertex ids, DIMACS numbering);
+    ``c`` lines are comments.
+
+    Returns
+    -------
+    tuple
+        ``(added, removed)`` edge lists.
+    """
+    added, removed = [], []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            fields = line.split()
+            if not fields or fields[0] == "c":
+                continue
+            if fields[0] not in ("a", "d") or len(fields) != 3:
+                raise ValueError(f"{path}:{number}: expected 'a u v' or 'd u v', got {line.strip()!r}")
+            (added if fields[0] == "a" else removed).append((int(fields[1]), int(fields[2])))
+    return added, removed
+
+
+class DynamicSolver:
+    """
+    Keeps a graph and its best known clique up to date under edge deltas.
+
+    ``apply`` updates the bitset adjacency in place and repairs the clique
+    instead of solving the new snapshot from scratch:
+
+    1. deleted edges inside the clique break it: the endpoints involved in
+       the most deleted edges are dropped until it is a clique again;
+    2. vertices now adjacent to the whole clique (new edges next to it) are
+       added greedily;
+    3. every inserted edge ``(u, v)`` whose common neighbourhood could hold
+       a larger clique seeds a greedy clique through it: any clique larger
+       than the previous one must use an inserted edge;
+    4. ``local_search`` polishes the result and a short ILS (without the
+       tightness engine, whose setup is linear in the graph size) runs
+       from it for ``ils_iter_per_change`` iterations per changed edge.
+
+    Every step works on the bitsets of the vertices touched by the delta
+    or of the clique, so the cost of a re-solve follows the delta, not the
+    graph. A delta that only deletes edges outside the clique leaves it
+    untouched (deletions cannot create a larger clique).
+
+    Parameters
+    ----------
+    G : graph
+        Initial graph; it is copied, so later deltas do not modify it.
+    clique : set, optional
+        Best known clique of ``G``; by default a degeneracy clique refined
+        by ``local_search``.
+    k : int
+        Perturbation strength of the ILS.
+    ils_iter_per_change : int
+        ILS iterations per changed edge.
+    max_ils_iter : int
+        Cap on the ILS iterations of a single delta.
+    time_limit : float, optional
+        Wall-clock budget of the ILS of a single delta.
+    """
+
+    def __init__(
+        self,
+        G,
+        clique: Optional[Iterable[Hashable]] = None,
+        k: int = 2,
+        ils_iter_per_change: int = 5,
+        max_ils_iter: int = 1000,
+        time_limit: Optional[float] = None,
+    ):
+        B = as_bitset(G)
+        self.graph: BitsetGraph = B.copy() if B is G else B
+        self.k = k
+        self.ils_iter_per_change = ils_iter_per_change
+        self.max_ils_iter = max_ils_iter
+        self.time_limit = time_limit
+        start = set(clique) if clique is not None else degeneracy_clique(self.graph)
+        self.clique: Set[Hashable] = local_search(start, self.graph)
+
+    def apply(self, added: Iterable[Edge] = (), removed: Iterable[Edge] = ()) -> DeltaResult:
+        """Apply an edge delta (deletions first) and return the repaired clique."""
+        start = time.perf_counter()
+        B = self.graph
+        rows = B.rows
+        previous_size = len(self.clique)
+
+        removed_idx = [(B.index[u], B.index[v]) for u, v in removed if B.remove_edge(u, v)]
+        added_idx = [(B.index[u], B.index[v]) for u, v in added if B.add_edge(u, v)]
+
+        with instrumentation.phase("dynamic.repair"):
+            C = B.mask(self.clique)
+            broken = [(i, j) for i, j in removed_idx if C >> i & 1 and C >> j & 1]
+            was_broken = bool(broken)
+            while broken:
+                conflicts = Counter(x for edge in broken for x in edge)
+                # Most deleted edges first; on ties the lower-degree endpoint
+                drop = max(conflicts, key=lambda x: (conflicts[x], -rows[x].bit_count()))
+                C &= ~(1 << drop)
+                broken = [edge for edge in broken if drop not in edge]
+
+            if was_broken or added_idx:
+                free = B.common_neighbors(C) & ~C
+                C |= _greedy_clique_on_candidates(B, free)
+
+            touched = 0
+            for i, j in added_idx:
+                touched |= (1 << i) | (1 << j)
+            for i, j in added_idx:
+                if C >> i & 1 and C >> j & 1:
+                    continue
+                candidates = rows[i] & rows[j]
+                if candidates.bit_count() + 2 <= C.bit_count():
+                    continue
+                # Inserted edges tend to cluster: grow the seed inside the
+                # touched vertices first, then over the rest of the candidates
+                seed = (1 << i) | (1 << j) | _greedy_clique_on_candidates(B, candidates & touched)
+                seed |= _greedy_clique_on_candidates(B, B.common_neighbors(seed) & ~seed)
+                if seed.bit_count() > C.bit_count():
+                    C = seed
+
+            clique = set(B.members(C))
+            if was_broken or added_idx:
+                clique = local_search(clique, B)
+        repaired_size = len(clique)
+
+        changes = len(added_idx) + len(removed_idx)
+        if was_broken or added_idx:
+            with instrumentation.phase("dynamic.ils"):
+                clique = iterative_local_search(
+                    B,
+                    clique,
+                    max_iter=min(self.max_ils_iter, self.ils_iter_per_change * changes),
+                    k=self.k,
+                    verbose=False,
+                    tightness=False,
+                    time_limit=self.time_limit,
+                )
+
+        self.clique = clique
+        return DeltaResult(
+            clique=set(clique),
+            previous_size=previous_size,
+            added=len(added_idx),
+            removed=len(removed_idx),
+            broken=was_broken,
+            repaired_size=repaired_size,
+            elapsed=time.perf_counter() - start,
+        )
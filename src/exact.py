@@ -0,0 +1,228 @@
+import time
+from dataclasses import dataclass
+from typing import Hashable, Iterable, List, Optional, Set
+
+from src.bitset import BitsetGraph, as_bitset
+from src.bounds import smallest_last
+
+
+@dataclass
+class ExactResult:
+    """Outcome of the exact maximum-clique search."""
+
+    clique: Set[Hashable]
+    optimal: bool
+    upper_bound: int
+    nodes: int
+    elapsed: float
+
+    @property
+    def gap(self) -> int:
+        """Difference between the proven upper bound and the clique found."""
+        return self.upper_bound - len(self.clique)
+
+
+class _LimitReached(Exception):
+    pass
+
+
+class _BoundReached(Exception):
+    pass
+
+
+def degeneracy_order(G) -> List[Hashable]:
+    """
+    Return the vertices of ``G`` in degeneracy (smallest-last) order.
+
+    Vertices are repeatedly removed by minimum residual degree; the result
+    lists them in reverse removal order, so the densest core first.
+    """
+    B = as_bitset(G)
+    order, _ = smallest_last(B)
+    return [B.labels[i] for i in order]
+
+
+class _BranchAndBound:
+    """
+    Bitset branch and bound with greedy-coloring bounds (MCQ/MCS family,
+    coloring as in BBMC).
+    """
+
+    def __init__(
+        self,
+        B: BitsetGraph,
+        best: List[int],
+        node_limit: Optional[int],
+        deadline: Optional[float],
+        target: Optional[int] = None,
+        floor: int = 0,
+    ):
+        self.rows = B.rows
+        self.best = best
+        # Size a clique must exceed to be recorded: the incumbent, or the
+        # lower bound known from elsewhere if larger
+        self.bar = max(len(best), floor)
+        self.target = target
+        self.node_limit = node_limit
+        self.deadline = deadline
+        self.nodes = 0
+        self.root_bound = len(B)
+
+    def _color_order(self, P: int, k_min: int):
+        """
+        Greedy sequential coloring of the candidate set ``P``.
+
+        Returns ``(vertex, color)`` pairs in non-decreasing color order,
+        skipping the vertices whose color is below ``k_min``: they cannot
+        lead to a clique larger than the incumbent.
+        """
+        rows = self.rows
+        order = []
+        uncolored = P
+        color = 0
+        while uncolored:
+            color += 1
+            available = uncolored
+            while available:
+                low = available & -available
+                v = low.bit_length() - 1
+                available &= ~rows[v] & ~low
+                uncolored &= ~low
+                if color >= k_min:
+                    order.append((v, color))
+        return order
+
+    def _enter(self, depth: int, P: int):
+        """Count a new search node and return its branching order."""
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise _LimitReached
+        if self.deadline is not None and self.nodes % 1024 == 0 and time.perf_counter() > self.deadline:
+            raise _LimitReached
+        return self._color_order(P, self.bar - depth + 1)
+
+    def expand(self, clique: List[int], P: int) -> None:
+        """
+        Search the subtree of ``clique`` with candidate set ``P``.
+
+        The tree is walked with an explicit stack rather than recursion, so
+        the depth (the clique size, over 1000 on MANN_a81) is not bounded by
+        the interpreter's recursion limit. A frame holds the candidate set
+        of a node, its branching order (highest color last) and the position
+        of the next branch.
+        """
+        rows = self.rows
+        order = self._enter(len(clique), P)
+        stack = [[P, order, len(order) - 1]]
+        while stack:
+            frame = stack[-1]
+            P, order, i = frame
+            if i < 0 or len(clique) + order[i][1] <= self.bar:
+                # Subtree exhausted or pruned: back to the parent, which
+                # drops the vertex it branched on from its candidates
+                stack.pop()
+                if stack:
+                    stack[-1][0] &= ~(1 << clique.pop())
+                continue
+
+            v, color = order[i]
+            frame[2] = i - 1
+            if not clique:
+                self.root_bound = color
+
+            clique.append(v)
+            new_P = P & rows[v]
+            if new_P:
+                order = self._enter(len(clique), new_P)
+                stack.append([new_P, order, len(order) - 1])
+                continue
+            if len(clique) > self.bar:
+                self.best[:] = clique
+                self.bar = len(clique)
+                if self.target is not None and len(clique) >= self.target:
+                    raise _BoundReached
+            clique.pop()
+            frame[0] = P & ~(1 << v)
+
+
+def max_clique_exact(
+    G,
+    incumbent: Optional[Iterable[Hashable]] = None,
+    node_limit: Optional[int] = None,
+    time_limit: Optional[float] = None,
+    upper_bound: Optional[int] = None,
+    lower_bound: int = 0,
+) -> ExactResult:
+    """
+    Exact maximum clique by branch and bound with coloring bounds.
+
+    Vertices are renumbered in degeneracy order, then explored with the
+    bitset BBMC scheme: at every node the candidate set is greedily colored
+    and a branch is pruned as soon as ``|C| + color`` cannot beat the
+    incumbent. A good incumbent (e.g. the output of a ``solve_*`` strategy
+    or of ``iterative_local_search``) prunes most of the tree from the start.
+
+    Parameters
+    ----------
+    G : graph
+        Input graph.
+    incumbent : iterable, optional
+        A known clique used as initial lower bound.
+    node_limit : int, optional
+        Maximum number of search nodes.
+    time_limit : float, optional
+        Maximum wall-clock time in seconds.
+    upper_bound : int, optional
+        A known upper bound on the clique number (e.g. from
+        ``src/bounds.py``): the search stops as soon as a clique of that
+        size is found, and an incumbent of that size skips it entirely.
+    lower_bound : int
+        Size of a clique known elsewhere (e.g. in another subproblem of
+        ``src/decomposition.py``): only larger cliques are searched. If
+        none exists, the result is the incumbent (possibly empty) and
+        ``optimal`` means that no clique beats ``lower_bound``.
+
+    Returns
+    -------
+    ExactResult
+        The best clique found. If the search completed, ``optimal`` is True
+        and ``upper_bound == len(clique)``; otherwise ``upper_bound`` is the
+        coloring bound of the unexplored part of the tree and ``gap`` the
+        remaining distance.
+    """
+    start = time.perf_counter()
+    B = as_bitset(G)
+
+    incumbent = list(incumbent or [])
+    for i, u in enumerate(incumbent):
+        for v in incumbent[i + 1:]:
+            if not B.has_edge(u, v):
+                raise ValueError("The incumbent is not a clique")
+
+    R = B.reordered(degeneracy_order(B))
+    best = [R.index[u] for u in incumbent]
+
+    deadline = start + time_limit if time_limit is not None else None
+    search = _BranchAndBound(R, best, node_limit, deadline, target=upper_bound, floor=lower_bound)
+    optimal = True
+    try:
+        if upper_bound is None or search.bar < upper_bound:
+            search.expand([], R.full_mask)
+    except _BoundReached:
+        pass
+    except _LimitReached:
+        optimal = False
+
+    bound = search.bar
+    if not optimal:
+        bound = max(bound, search.root_bound)
+        if upper_bound is not None:
+            bound = min(bound, upper_bound)
+
+    return ExactResult(
+        clique={R.labels[i] for i in best},
+        optimal=optimal,
+        upper_bound=bound,
+        nodes=search.nodes,
+        elapsed=time.perf_counter() - start,
+    )
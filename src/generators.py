@@ -0,0 +1,112 @@
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Set, Tuple
+
+
+@dataclass
+class Instance:
+    """
+    A synthetic graph on the vertices ``1..num_nodes`` (DIMACS numbering).
+
+    ``planted`` is the hidden clique, if any: its size is a lower bound on
+    the clique number and, for the dense generators, the intended optimum.
+    """
+
+    name: str
+    num_nodes: int
+    edges: List[Tuple[int, int]]
+    planted: Set[int] = field(default_factory=set)
+
+
+def _plant(rng: random.Random, num_nodes: int, edges: Set[Tuple[int, int]], size: int) -> Set[int]:
+    clique = set(rng.sample(range(1, num_nodes + 1), size)) if size else set()
+    members = sorted(clique)
+    for i, u in enumerate(members):
+        for v in members[i + 1:]:
+            edges.add((u, v))
+    return clique
+
+
+def gnp(num_nodes: int, p: float, seed: int = 0, clique_size: int = 0) -> Instance:
+    """Erdős–Rényi G(n, p), optionally with a planted clique."""
+    rng = random.Random(seed)
+    edges = {(u, v) for u in range(1, num_nodes + 1) for v in range(u + 1, num_nodes + 1) if rng.random() < p}
+    planted = _plant(rng, num_nodes, edges, clique_size)
+    return Instance(f"gnp-{num_nodes}-{p}-{seed}", num_nodes, sorted(edges), planted)
+
+
+def p_hat_like(num_nodes: int, low: float, high: float, seed: int = 0, clique_size: int = 0) -> Instance:
+    """
+    Generator in the spirit of the DIMACS ``p_hat`` family: every vertex
+    draws a density in ``[low, high]`` and an edge ``(u, v)`` appears with
+    the mean density of its endpoints, so degrees spread widely.
+    """
+    rng = random.Random(seed)
+    density = [0.0] + [rng.uniform(low, high) for _ in range(num_nodes)]
+    edges = {
+        (u, v)
+        for u in range(1, num_nodes + 1)
+        for v in range(u + 1, num_nodes + 1)
+        if rng.random() < (density[u] + density[v]) / 2
+    }
+    planted = _plant(rng, num_nodes, edges, clique_size)
+    return Instance(f"p_hat-{num_nodes}-{low}-{high}-{seed}", num_nodes, sorted(edges), planted)
+
+
+def brock_like(num_nodes: int, p: float, clique_size: int, seed: int = 0) -> Instance:
+    """
+    Generator in the spirit of the DIMACS ``brock`` family: a clique is
+    hidden in G(n, p) and its members get fewer outside edges, so their
+    expected degree matches the rest of the graph and degree-based greedy
+    rules are not drawn towards it.
+    """
+    rng = random.Random(seed)
+    clique = set(rng.sample(range(1, num_nodes + 1), clique_size))
+    # (k - 1) + q (n - k) = p (n - 1): outside density of the clique members
+    outside = num_nodes - clique_size
+    q = max(0.0, (p * (num_nodes - 1) - (clique_size - 1)) / outside) if outside else 0.0
+
+    edges = set()
+    for u in range(1, num_nodes + 1):
+        for v in range(u + 1, num_nodes + 1):
+            in_u, in_v = u in clique, v in clique
+            if in_u and in_v:
+                edges.add((u, v))
+            elif rng.random() < (q if in_u or in_v else p):
+                edges.add((u, v))
+    return Instance(f"brock-{num_nodes}-{p}-{clique_size}-{seed}", num_nodes, sorted(edges), clique)
+
+
+def power_law(num_nodes: int, m: int, seed: int = 0, clique_size: int = 0) -> Instance:
+    """
+    Sparse Barabási–Albert graph (preferential attachment, ``m`` edges per
+    new vertex), optionally with a planted clique. Models the large sparse
+    real-world instances where the reduction removes most of the graph.
+    """
+    rng = random.Random(seed)
+    edges: Set[Tuple[int, int]] = set()
+    # Every endpoint is repeated once per incident edge: sampling from the
+    # list picks a vertex with probability proportional to its degree.
+    endpoints: List[int] = list(range(1, m + 1))
+    for v in range(m + 1, num_nodes + 1):
+        targets = set()
+        while len(targets) < m:
+            targets.add(rng.choice(endpoints))
+        for u in targets:
+            edges.add((u, v))
+            endpoints.extend((u, v))
+    planted = _plant(rng, num_nodes, edges, clique_size)
+    return Instance(f"powerlaw-{num_nodes}-{m}-{seed}", num_nodes, sorted(edges), planted)
+
+
+def write_dimacs(instance: Instance, path: str | Path) -> Path:
+    """Write ``instance`` as a DIMACS ``p edge`` file and return its path."""
+    path = Path(path)
+    lines = [f"c {instance.name}"]
+    if instance.planted:
+        lines.append(f"c planted clique of size {len(instance.planted)}")
+    lines.append(f"p edge {instance.num_nodes} {len(instance.edges)}")
+    lines.extend(f"e {u} {v}" for u, v in instance.edges)
+    path.write_text("\n".join(lines) + "\n")
+    return path
@@ -0,0 +1,170 @@
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Protocol, Set, Tuple, runtime_checkable
+
+
+@runtime_checkable
+class GraphLike(Protocol):
+    """
+    Minimal graph interface used by the strategies, the local searches and
+    the reports.
+
+    ``Graph`` below, ``BitsetGraph``, ``CSRGraph`` and ``nx.Graph`` all
+    satisfy it, so none of the algorithms needs networkx: an ``nx.Graph``
+    passed by a caller works as is, without this package importing it.
+    """
+
+    def nodes(self) -> Iterable[Hashable]: ...
+
+    def neighbors(self, u: Hashable) -> Iterable[Hashable]: ...
+
+    def has_edge(self, u: Hashable, v: Hashable) -> bool: ...
+
+    def degree(self, u: Hashable) -> int: ...
+
+    def number_of_nodes(self) -> int: ...
+
+    def number_of_edges(self) -> int: ...
+
+    def __len__(self) -> int: ...
+
+    def __iter__(self) -> Iterator[Hashable]: ...
+
+    def __contains__(self, u: Hashable) -> bool: ...
+
+
+class Graph:
+    """
+    Lightweight undirected graph: a dict of adjacency sets.
+
+    It implements ``GraphLike`` with the same method names as ``nx.Graph``
+    (plus ``add_node(s_from)``/``add_edge(s_from)`` and the free-form
+    ``graph`` metadata dict), which is all the loader and the reduction
+    need to build graphs; importing it costs nothing, unlike networkx.
+    Self-loops are ignored, since they never belong to a clique.
+    ``to_networkx`` converts it when networkx-specific algorithms are
+    wanted, importing networkx only then.
+
+    Parameters
+    ----------
+    edges : iterable of pairs, optional
+        Initial edges.
+    **attr
+        Graph metadata stored in ``graph`` (e.g. ``digest``, ``fingerprint``).
+    """
+
+    __slots__ = ("adj", "graph", "_num_edges")
+
+    def __init__(self, edges: Iterable[Tuple[Hashable, Hashable]] = (), **attr: Any):
+        self.adj: Dict[Hashable, Set[Hashable]] = {}
+        self.graph: Dict[str, Any] = dict(attr)
+        self._num_edges = 0
+        self.add_edges_from(edges)
+
+    @classmethod
+    def from_graph(cls, G) -> "Graph":
+        """Copy any graph exposing ``nodes()`` and ``neighbors(u)``."""
+        H = cls(**dict(getattr(G, "graph", None) or {}))
+        H.add_nodes_from(G.nodes())
+        for u in G.nodes():
+            for v in G.neighbors(u):
+                H.add_edge(u, v)
+        return H
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    def add_node(self, u: Hashable) -> None:
+        if u not in self.adj:
+            self.adj[u] = set()
+
+    def add_nodes_from(self, nodes: Iterable[Hashable]) -> None:
+        adj = self.adj
+        for u in nodes:
+            if u not in adj:
+                adj[u] = set()
+
+    def add_edge(self, u: Hashable, v: Hashable) -> None:
+        if u == v:
+            return
+        adj = self.adj
+        nbrs_u = adj.get(u)
+        if nbrs_u is None:
+            nbrs_u = adj[u] = set()
+        if v in nbrs_u:
+            return
+        nbrs_u.add(v)
+        nbrs_v = adj.get(v)
+        if nbrs_v is None:
+            nbrs_v = adj[v] = set()
+        nbrs_v.add(u)
+        self._num_edges += 1
+
+    def add_edges_from(self, edges: Iterable[Tuple[Hashable, Hashable]]) -> None:
+        # add_edge inlined: this loop builds every loaded graph
+        adj = self.adj
+        added = 0
+        for u, v in edges:
+            if u == v:
+                continue
+            nbrs_u = adj.get(u)
+            if nbrs_u is None:
+                nbrs_u = adj[u] = set()
+            elif v in nbrs_u:
+                continue
+            nbrs_u.add(v)
+            nbrs_v = adj.get(v)
+            if nbrs_v is None:
+                nbrs_v = adj[v] = set()
+            nbrs_v.add(u)
+            added += 1
+        self._num_edges += added
+
+    # ------------------------------------------------------------------
+    # GraphLike interface
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.adj)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.adj)
+
+    def __contains__(self, u: Hashable) -> bool:
+        return u in self.adj
+
+    def nodes(self) -> List[Hashable]:
+        return list(self.adj)
+
+    def number_of_nodes(self) -> int:
+        return len(self.adj)
+
+    def number_of_edges(self) -> int:
+        return self._num_edges
+
+    def neighbors(self, u: Hashable) -> Iterator[Hashable]:
+        return iter(self.adj[u])
+
+    def has_edge(self, u: Hashable, v: Hashable) -> bool:
+        nbrs = self.adj.get(u)
+        return nbrs is not None and v in nbrs
+
+    def degree(self, u: Hashable) -> int:
+        return len(self.adj[u])
+
+    def edges(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        seen = set()
+        for u, nbrs in self.adj.items():
+            for v in nbrs:
+                if v not in seen:
+                    yield u, v
+            seen.add(u)
+
+    # ------------------------------------------------------------------
+    # networkx interoperability
+    # ------------------------------------------------------------------
+    def to_networkx(self):
+        """Return an equivalent ``nx.Graph`` (networkx is imported here)."""
+        import networkx as nx
+
+        G = nx.Graph(**self.graph)
+        G.add_nodes_from(self.adj)
+        G.add_edges_from(self.edges())
+        return G
@@ -0,0 +1,206 @@
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Recorder of the current process, None when instrumentation is disabled.
+# Hot loops read it once through ``active()`` and skip every measurement
+# when it is None, so a disabled layer costs one comparison per loop.
+_ACTIVE: Optional["Recorder"] = None
+
+
+class Distribution:
+    """Running summary (count, sum, min, max) of an observed quantity."""
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def as_dict(self) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+            "sum": self.total,
+        }
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: a daemon thread records the Python stack of the
+    observed thread every ``interval`` seconds.
+
+    Stacks are aggregated in collapsed form (``outer;...;inner``, one
+    ``module:function`` per frame), the input format of flame-graph tools.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                module = os.path.splitext(os.path.basename(code.co_filename))[0]
+                stack.append(f"{module}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> List[str]:
+        """Return the samples as ``stack count`` lines, most frequent first."""
+        return [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+
+
+class Recorder:
+    """
+    Collects counters, distributions, accumulated timers, events and phase
+    spans of a search.
+
+    Metric names are dotted (``ls.candidates``, ``ils.perturbation.worse``);
+    the instrumented modules document the ones they emit. ``to_trace``
+    exports everything as a Chrome trace-event JSON document (loadable in
+    ``chrome://tracing`` or Perfetto) with an extra ``metrics`` section.
+
+    Parameters
+    ----------
+    sample_interval : float, optional
+        If set, a ``SamplingProfiler`` with this interval runs while the
+        recorder is active (see ``recording``).
+    """
+
+    def __init__(self, sample_interval: Optional[float] = None):
+        self.origin = time.perf_counter()
+        self.counters: Counter = Counter()
+        self.distributions: Dict[str, Distribution] = {}
+        self.timers: Counter = Counter()
+        self.trace_events: List[Dict[str, Any]] = []
+        self.profiler = SamplingProfiler(sample_interval) if sample_interval else None
+
+    def _timestamp(self) -> float:
+        return (time.perf_counter() - self.origin) * 1e6
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        distribution = self.distributions.get(name)
+        if distribution is None:
+            distribution = self.distributions[name] = Distribution()
+        distribution.add(value)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        self.timers[name] += seconds
+
+    def event(self, name: str, **fields: Any) -> None:
+        """Record an instant event with arbitrary JSON-serializable fields."""
+        self.trace_events.append({"name": name, "ph": "i", "s": "p", "ts": self._timestamp(), "args": fields})
+
+    @contextlib.contextmanager
+    def phase(self, name: str, **fields: Any) -> Iterator[None]:
+        """Time a block as a span; its duration is also added to ``timers``."""
+        start = time.perf_counter()
+        ts = self._timestamp()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timers[f"phase.{name}"] += elapsed
+            self.trace_events.append({"name": name, "ph": "X", "ts": ts, "dur": elapsed * 1e6, "args": fields})
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "counters": dict(self.counters),
+            "distributions": {name: d.as_dict() for name, d in self.distributions.items()},
+            "timers": dict(self.timers),
+        }
+
+    def to_trace(self) -> Dict[str, Any]:
+        pid = os.getpid()
+        events = [dict(event, pid=pid, tid=0) for event in self.trace_events]
+        trace: Dict[str, Any] = {"traceEvents": events, "displayTimeUnit": "ms", "metrics": self.metrics()}
+        if self.profiler is not None:
+            trace["profile"] = {"interval": self.profiler.interval, "samples": self.profiler.collapsed()}
+        return trace
+
+    def dump(self, path: str | Path) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_trace(), f)
+
+
+def active() -> Optional[Recorder]:
+    """Return the recorder of this process, or None when disabled."""
+    return _ACTIVE
+
+
+@contextlib.contextmanager
+def recording(recorder: Optional[Recorder] = None, sample_interval: Optional[float] = None) -> Iterator[Recorder]:
+    """
+    Enable instrumentation for the duration of the block.
+
+    Only code running in this process is recorded: worker processes of
+    ``multistart`` or ``ils_portfolio`` do not report to the recorder.
+
+    Usage::
+
+        with recording(sample_interval=0.005) as rec:
+            iterative_local_search(G, C, max_iter=100, k=2)
+        rec.dump("trace.json")
+    """
+    global _ACTIVE
+    recorder = recorder if recorder is not None else Recorder(sample_interval)
+    previous = _ACTIVE
+    _ACTIVE = recorder
+    if recorder.profiler is not None:
+        recorder.profiler.start()
+    try:
+        yield recorder
+    finally:
+        if recorder.profiler is not None:
+            recorder.profiler.stop()
+        _ACTIVE = previous
+
+
+def phase(name: str, **fields: Any):
+    """``Recorder.phase`` of the active recorder, a no-op context when disabled."""
+    recorder = _ACTIVE
+    if recorder is None:
+        return contextlib.nullcontext()
+    return recorder.phase(name, **fields)
@@ -1,40 +1,252 @@
-import networkx as nx
+import hashlib
+import mmap
+import os
+import re
+import numpy as np
 from pathlib import Path
+from typing import Tuple
 
+from src.csr import CSRGraph
+from src.graph import Graph, GraphLike
 
-def load_dimacs_graph(path: str | Path) -> nx.Graph:
+# Bump when the sidecar layout changes so stale caches are ignored.
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".cache.npz"
+# Directory of the memory-mappable CSR arrays (see ``load_dimacs_csr``).
+CSR_CACHE_SUFFIX = ".csr"
+
+_HEADER_RE = re.compile(rb"^[ \t]*p[ \t]+\S+[ \t]+(\d+)[ \t]+(\d+)", re.MULTILINE)
+# Every line that does not start with 'e' (comments, header, blank lines).
+_NON_EDGE_LINE_RE = re.compile(rb"^[ \t]*[^e \t\r\n].*$", re.MULTILINE)
+
+
+def cache_path_for(path: str | Path) -> Path:
+    """Return the path of the binary sidecar cache of a graph file."""
+    path = Path(path)
+    return path.with_name(path.name + CACHE_SUFFIX)
+
+
+def csr_cache_path_for(path: str | Path) -> Path:
+    """Return the path of the CSR sidecar directory of a graph file."""
+    path = Path(path)
+    return path.with_name(path.name + CSR_CACHE_SUFFIX)
+
+
+def _content_digest(buffer) -> str:
+    return hashlib.blake2b(buffer, digest_size=16).hexdigest()
+
+
+def graph_fingerprint(num_nodes: int, edges: np.ndarray) -> str:
     """
-    Load an undirected graph from a DIMACS-like edge list file.
+    Canonical hash of a graph on the vertices ``1..num_nodes``.
 
-    Expected format:
-        Lines starting with 'e u v' define an edge between nodes u and v.
+    Unlike the content digest of the file, it does not depend on comments,
+    edge order, endpoint order or duplicated edges: two files describing
+    the same graph get the same fingerprint.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    canonical = np.unique(np.sort(edges, axis=1), axis=0) if edges.size else edges
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.int64(num_nodes).tobytes())
+    h.update(np.ascontiguousarray(canonical, dtype="<i8").tobytes())
+    return h.hexdigest()
+
+
+def parse_dimacs_buffer(buffer) -> Tuple[int, np.ndarray]:
+    """
+    Parse the header and all edges of a DIMACS buffer in bulk.
+
+    ``buffer`` is any bytes-like object (a memory-mapped file, or a
+    payload received by the solve service). The non-edge lines are
+    stripped with a single regex pass, the 'e' markers are deleted and the
+    remaining integers are converted by NumPy in one call, so no Python
+    code runs per edge.
+    """
+    header = _HEADER_RE.search(buffer)
+    num_nodes = int(header.group(1)) if header else 0
+
+    body = _NON_EDGE_LINE_RE.sub(b"", buffer).translate(None, b"e")
+    values = np.fromstring(body, dtype=np.int64, sep=" ")
+    if values.size % 2:
+        raise ValueError("Malformed DIMACS edge list: odd number of endpoints")
+
+    edges = values.reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]  # Self-loops are never part of a clique
+    if edges.size:
+        num_nodes = max(num_nodes, int(edges.max()))
+
+    return num_nodes, edges.astype(np.int32)
+
+
+def _read_cache(cache_path: Path, digest: str) -> Tuple[int, np.ndarray, str] | None:
+    try:
+        with np.load(cache_path) as data:
+            if int(data["version"]) != CACHE_VERSION or str(data["digest"]) != digest:
+                return None
+            return int(data["num_nodes"]), data["edges"], str(data["fingerprint"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _write_cache(cache_path: Path, digest: str, num_nodes: int, edges: np.ndarray, fingerprint: str) -> None:
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        with tmp_path.open("wb") as file:
+            np.savez(
+                file,
+                version=np.int64(CACHE_VERSION),
+                digest=np.array(digest),
+                num_nodes=np.int64(num_nodes),
+                edges=edges,
+                fingerprint=np.array(fingerprint),
+            )
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # A read-only data directory only costs us the cache, not the load.
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_dimacs_arrays(path: str | Path, use_cache: bool = True) -> Tuple[int, np.ndarray, str, str]:
+    """
+    Load a DIMACS graph file as raw arrays.
+
+    The file is memory-mapped and parsed in bulk. When ``use_cache`` is
+    True the parsed edge array is stored in a sidecar ``<file>.cache.npz``
+    together with a content hash of the source and the canonical graph
+    fingerprint; later loads of an unchanged file only hash it and read the
+    cache.
 
     Parameters
     ----------
     path : str or Path
         Path to the DIMACS graph file.
+    use_cache : bool
+        Read and write the binary sidecar cache.
 
     Returns
     -------
-    nx.Graph
-        The loaded undirected graph.
+    tuple of (int, np.ndarray, str, str)
+        Number of vertices (from the ``p`` header, extended to the largest
+        endpoint seen), an ``(m, 2)`` int32 array of edges without
+        self-loops, the hex content digest of the file and the canonical
+        fingerprint of the graph (see ``graph_fingerprint``).
     """
     path = Path(path)
 
     if not path.exists():
         raise FileNotFoundError(f"Graph file not found: {path}")
 
-    G = nx.Graph()
+    if path.stat().st_size == 0:
+        edges = np.empty((0, 2), dtype=np.int32)
+        return 0, edges, _content_digest(b""), graph_fingerprint(0, edges)
+
+    with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        digest = _content_digest(buffer)
+
+        cache_path = cache_path_for(path)
+        if use_cache and cache_path.exists():
+            cached = _read_cache(cache_path, digest)
+            if cached is not None:
+                return cached[0], cached[1], digest, cached[2]
+
+        num_nodes, edges = parse_dimacs_buffer(buffer)
+
+    fingerprint = graph_fingerprint(num_nodes, edges)
+    if use_cache:
+        _write_cache(cache_path, digest, num_nodes, edges, fingerprint)
+
+    return num_nodes, edges, digest, fingerprint
 
-    with path.open("r") as file:
-        for line in file:
-            line = line.strip()
-            if not line or line.startswith("c"):
-                # Skip empty lines and comments
-                continue
 
-            if line.startswith("e"):
-                _, u, v = line.split()
-                G.add_edge(int(u), int(v))
+def load_dimacs_graph(path: str | Path, use_cache: bool = True, as_networkx: bool = False) -> GraphLike:
+    """
+    Load an undirected graph from a DIMACS-like edge list file.
+
+    Expected format:
+        An optional header 'p edge N M' declares the N vertices 1..N
+        (isolated vertices included); lines starting with 'e u v' define an
+        edge between nodes u and v.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to the DIMACS graph file.
+    use_cache : bool
+        Use the binary sidecar cache (see ``load_dimacs_arrays``).
+    as_networkx : bool
+        Return an ``nx.Graph`` (networkx is imported only in this case)
+        instead of the built-in ``Graph``.
+
+    Returns
+    -------
+    Graph or nx.Graph
+        The loaded undirected graph. ``G.graph["digest"]`` holds the content
+        hash of the source file, ``G.graph["fingerprint"]`` the canonical
+        hash of the graph (e.g. the key of a result store).
+    """
+    num_nodes, edges, digest, fingerprint = load_dimacs_arrays(path, use_cache=use_cache)
+
+    if as_networkx:
+        import networkx as nx
+
+        G = nx.Graph(digest=digest, fingerprint=fingerprint)
+    else:
+        G = Graph(digest=digest, fingerprint=fingerprint)
+    G.add_nodes_from(range(1, num_nodes + 1))
+    G.add_edges_from(edges.tolist())
+
+    return G
+
+
+def load_dimacs_csr(path: str | Path, use_cache: bool = True, mmap_arrays: bool = True) -> CSRGraph:
+    """
+    Load a DIMACS graph file into the compressed sparse row backend,
+    without building an adjacency-set graph.
+
+    With ``use_cache`` the CSR arrays are written to a sidecar directory
+    ``<file>.csr`` validated by the content hash of the source; later loads
+    only hash the file and, with ``mmap_arrays``, memory-map the arrays, so
+    the adjacency is paged in from disk on demand instead of being held in
+    memory.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to the DIMACS graph file.
+    use_cache : bool
+        Read and write the CSR sidecar.
+    mmap_arrays : bool
+        Memory-map the sidecar arrays (only with ``use_cache``).
+
+    Returns
+    -------
+    CSRGraph
+        Vertices ``1..N``; ``G.graph`` holds the ``digest`` and the
+        ``fingerprint`` as in ``load_dimacs_graph``.
+    """
+    path = Path(path)
+
+    if not path.exists():
+        raise FileNotFoundError(f"Graph file not found: {path}")
+
+    cache_path = csr_cache_path_for(path)
+    if path.stat().st_size == 0:
+        digest = _content_digest(b"")
+        num_nodes, edges = 0, np.empty((0, 2), dtype=np.int32)
+    else:
+        with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            digest = _content_digest(buffer)
+            if use_cache:
+                cached = CSRGraph.load(cache_path, mmap=mmap_arrays)
+                if cached is not None and cached.graph.get("digest") == digest:
+                    return cached
+            num_nodes, edges = parse_dimacs_buffer(buffer)
 
-    return G
\ No newline at end of file
+    G = CSRGraph.from_edges(num_nodes, edges)
+    del edges
+    G.graph.update(digest=digest, fingerprint=G.fingerprint())
+    if use_cache:
+        G.save(cache_path)
+        if mmap_arrays:
+            G = CSRGraph.load(cache_path, mmap=True)
+    return G
@@ -1,90 +1,404 @@
-import networkx as nx
+import numpy as np
 import random
-from typing import Set
+import time
+from typing import Callable, Iterable, Optional, Set
+
+from src import clique_pool, instrumentation
+from src.bitset import BitsetGraph, as_bitset, iter_bits
+from src.budget import ImproveCallback, SearchBudget
+from src.checkpoint import DEFAULT_INTERVAL, Checkpointer, check_matches, set_rng_state
+from src.csr import CSRGraph, contains_sorted, gather, intersect_size, intersect_sorted
+from src.graph import GraphLike
+from src.tightness import TightnessSearch
+
+# Oltre questa taglia i gradi interni ai candidati (CSR) si calcolano con un
+# unico gather vettoriale invece di un'intersezione per nodo.
+_CSR_GATHER_THRESHOLD = 1024
 
 # =============================================================================
 # HELPER: Euristica per trovare una cricca nei candidati
 # =============================================================================
-def _greedy_clique_on_candidates(G: nx.Graph, candidates: Set[int]) -> Set[int]:
+def _greedy_clique_on_candidates(B: BitsetGraph, candidates: int) -> int:
+    """
+    Candidati e cricca restituita sono bitmask sugli indici di B.
+    Il grado nel sottografo indotto è un popcount: nessun subgraph da costruire.
+    Su un CSRGraph candidati e cricca sono invece array ordinati di indici
+    (vedi _greedy_clique_csr); l'ordine di visita è lo stesso.
+    """
+    if isinstance(B, CSRGraph):
+        return _greedy_clique_csr(B, candidates)
     if not candidates:
-        return set()
+        return 0
     
-    subgraph = G.subgraph(candidates)
-    sorted_nodes = sorted(list(subgraph.nodes()), key=lambda n: subgraph.degree(n), reverse=True)
+    rows = B.rows
+    sorted_nodes = sorted(iter_bits(candidates), key=lambda n: (rows[n] & candidates).bit_count(), reverse=True)
     
-    new_clique = set()
+    new_clique = 0
+    compatible = candidates
     for node in sorted_nodes:
-        if all(G.has_edge(node, existing) for existing in new_clique):
-            new_clique.add(node)
+        if compatible >> node & 1:
+            new_clique |= 1 << node
+            compatible &= rows[node]
             
     return new_clique
 
+def _greedy_clique_csr(G: CSRGraph, candidates: np.ndarray, internal: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Versione CSR: grado nel sottografo indotto per intersezione di liste
+    ordinate, poi la stessa greedy per grado decrescente (a parità, indice
+    crescente) della versione a bitset. 'internal' permette di passare i
+    gradi indotti se già noti.
+    """
+    if not candidates.size:
+        return candidates
+    if internal is None:
+        if candidates.size > _CSR_GATHER_THRESHOLD:
+            neighbors, owner = gather(G, candidates)
+            is_candidate = np.zeros(len(G), dtype=bool)
+            is_candidate[candidates] = True
+            internal = np.bincount(owner[is_candidate[neighbors]], minlength=candidates.size)
+        else:
+            internal = np.fromiter(
+                (intersect_size(G.neighbors_of(u), candidates) for u in candidates.tolist()),
+                dtype=np.int64,
+                count=candidates.size,
+            )
+    # visit_rank[i] = posizione di candidates[i] nell'ordine di visita
+    visit_rank = np.empty(candidates.size, dtype=np.int64)
+    visit_rank[np.argsort(-internal, kind="stable")] = np.arange(candidates.size)
+
+    # Il prossimo nodo è il primo compatibile nell'ordine di visita: si
+    # guarda solo l'insieme dei compatibili, che si restringe a ogni passo
+    clique = []
+    compatible = candidates
+    while compatible.size:
+        ranks = visit_rank[np.searchsorted(candidates, compatible)]
+        node = int(compatible[np.argmin(ranks)])
+        clique.append(node)
+        compatible = intersect_sorted(compatible, G.neighbors_of(node))
+    return np.sort(np.asarray(clique, dtype=np.int64))
+
 # =============================================================================
 # SEZIONE 3.1: PERTURBAZIONE
 # =============================================================================
 def perturbation(clique: Set[int], k: int) -> Set[int]:
-    C = clique.copy()
-    if k >= len(C):
-        if not C:
+    # Nodi in ordine canonico: l'esito dipende solo dal contenuto della
+    # cricca e dallo stato di random, non dalla storia del set, così una
+    # ILS ripresa da un checkpoint prosegue identica (src/checkpoint.py).
+    nodes = sorted(clique)
+    if k >= len(nodes):
+        if not nodes:
             return set()
-        return {random.choice(list(C))}
+        return {random.choice(nodes)}
 
-    nodes_to_remove = random.sample(list(C), k)
-    for node in nodes_to_remove:
-        C.remove(node)
-    return C
+    nodes_to_remove = set(random.sample(nodes, k))
+    return {node for node in nodes if node not in nodes_to_remove}
 
 # =============================================================================
 # SEZIONE 3.2: LOCAL SEARCH (1,k)-swap
 # =============================================================================
-def local_search(initial_clique: Set[int], G: nx.Graph) -> Set[int]:
-    C = initial_clique.copy()
+def local_search(initial_clique: Set[int], G: GraphLike) -> Set[int]:
+    """
+    Metriche (con instrumentation attiva): ls.passes.improving/non_improving,
+    ls.candidates (taglia dei candidati per swap), ls.adjacency_queries
+    (righe lette), tempi ls.intersection e ls.greedy.
+
+    Su un CSRGraph la ricerca lavora sulle liste di adiacenza ordinate
+    (vedi _local_search_csr) senza convertire il grafo.
+    """
+    if isinstance(G, CSRGraph):
+        return _local_search_csr(initial_clique, G)
+    B = as_bitset(G)
+    C = B.mask(initial_clique)
     improved = True
+    rec = instrumentation.active()
 
     while improved:
         improved = False
-        nodes_to_check = list(C)
+        nodes_to_check = list(iter_bits(C))
         
         for u in nodes_to_check:
-            C_prime = C - {u}
+            C_prime = C & ~(1 << u)
             
-            if not C_prime:
-                candidates = set(G.nodes()) - {u}
-            else:
-                iterator = iter(C_prime)
-                first_node = next(iterator)
-                candidates = set(G.neighbors(first_node))
-                for member in iterator:
-                    candidates.intersection_update(G.neighbors(member))
-                candidates -= C
-
-            K = _greedy_clique_on_candidates(G, candidates)
+            if rec is not None:
+                t0 = time.perf_counter()
+            # Vicinato comune di C - {u}: un AND sulle righe (tutti i nodi se C' è vuoto)
+            candidates = B.common_neighbors(C_prime) & ~C
+
+            if rec is not None:
+                t1 = time.perf_counter()
+            K = _greedy_clique_on_candidates(B, candidates)
+
+            if rec is not None:
+                rec.add_time("ls.intersection", t1 - t0)
+                rec.add_time("ls.greedy", time.perf_counter() - t1)
+                num_candidates = candidates.bit_count()
+                rec.observe("ls.candidates", num_candidates)
+                # Righe lette: AND per C', popcount per ordinare, AND per K
+                rec.count("ls.adjacency_queries", C_prime.bit_count() + num_candidates + K.bit_count())
             
-            if len(K) > 1:
-                C = C_prime.union(K)
+            if K.bit_count() > 1:
+                C = C_prime | K
                 improved = True
                 break 
 
-    return C
+        if rec is not None:
+            rec.count("ls.passes.improving" if improved else "ls.passes.non_improving")
+
+    return set(B.members(C))
+
+def _local_search_csr(initial_clique: Set[int], G: CSRGraph) -> Set[int]:
+    """
+    Stessa (1,k)-swap di local_search su un CSRGraph. A ogni passata un solo
+    gather sui vicini di C conta, per ogni nodo w, i membri adiacenti a[w]:
+    i candidati di C - {u} sono i nodi liberi (a[w] = |C|) più quelli con
+    a[w] = |C| - 1 non adiacenti a u. Costo proporzionale ai gradi dei
+    membri di C, non alla taglia del grafo.
+    """
+    C = G.indices(initial_clique)
+    improved = True
+    rec = instrumentation.active()
+    all_nodes = degrees = None
+
+    while improved:
+        improved = False
+        neighbors, _ = gather(G, C)
+        nodes, counts = np.unique(neighbors, return_counts=True)
+        free = nodes[counts == C.size]
+        one_tight = nodes[counts == C.size - 1]
+        one_tight = one_tight[~contains_sorted(C, one_tight)]
+
+        for u in C.tolist():
+            C_prime = C[C != u]
+
+            if rec is not None:
+                t0 = time.perf_counter()
+            internal = None
+            if C_prime.size:
+                # Vicinato comune di C - {u} (u stesso escluso: è in C)
+                tight_u = one_tight[~contains_sorted(G.neighbors_of(u), one_tight)]
+                candidates = np.union1d(free, tight_u)
+            else:
+                # C - {u} vuoto: tutti i nodi tranne u sono candidati e il
+                # grado indotto è il grado, meno 1 per i vicini di u
+                if all_nodes is None:
+                    all_nodes = np.arange(len(G), dtype=np.int64)
+                    degrees = G.degrees().astype(np.int64)
+                internal = degrees.copy()
+                internal[G.neighbors_of(u)] -= 1
+                keep = all_nodes != u
+                candidates, internal = all_nodes[keep], internal[keep]
+
+            if rec is not None:
+                t1 = time.perf_counter()
+            K = _greedy_clique_csr(G, candidates, internal)
+
+            if rec is not None:
+                rec.add_time("ls.intersection", t1 - t0)
+                rec.add_time("ls.greedy", time.perf_counter() - t1)
+                rec.observe("ls.candidates", candidates.size)
+                rec.count("ls.adjacency_queries", C_prime.size + candidates.size + K.size)
+
+            if K.size > 1:
+                C = np.union1d(C_prime, K)
+                improved = True
+                break
+
+        if rec is not None:
+            rec.count("ls.passes.improving" if improved else "ls.passes.non_improving")
+
+    return set(G.members(C))
 
 # =============================================================================
 # SEZIONE 3.3: ITERATIVE LOCAL SEARCH
 # =============================================================================
-def iterative_local_search(G: nx.Graph, initial_solution: Set[int], max_iter: int, k: int) -> Set[int]:
-    print(f"--- Avvio ILS (Max Iter: {max_iter}, k={k}) ---")
+def ils_search(G: GraphLike, tightness: bool = True) -> Callable[[Set[int]], Set[int]]:
+    """
+    Local search usata dalla ILS su G, costruita una volta sola: il motore a
+    tightness (src/tightness.py) precalcola le adiacenze in O(n + m), quindi
+    chi esegue molti passi (la ILS, le catene di src/portfolio.py) lo riusa.
+    Un CSRGraph resta tale e usa la local_search classica (il motore a
+    tightness precalcola liste di adiacenza Python, troppo grandi lì).
+    """
+    if not isinstance(G, CSRGraph):
+        G = as_bitset(G)
+    if tightness and not isinstance(G, CSRGraph):
+        return TightnessSearch(G).search
+    return lambda C: local_search(C, G)
 
-    C_best = local_search(initial_solution, G)
-    C_ref = C_best
-    
-    print(f"Start ILS -> Ottimo locale iniziale: {len(C_best)}")
 
-    for i in range(max_iter):
-        C_prime = perturbation(C_ref, k)
-        C_double_prime = local_search(C_prime, G)
-        
+def ils_step(search: Callable[[Set[int]], Set[int]], C_ref: Set[int], k: int) -> Set[int]:
+    """
+    Un passo della ILS: perturba C_ref, applica 'search' e restituisce il
+    nuovo ottimo locale C''. L'accettazione resta al chiamante. C'' viene
+    offerto al CliquePool attivo e, con instrumentation attiva, il passo
+    aggiorna ils.iterations e le metriche della perturbazione.
+    """
+    C_prime = perturbation(C_ref, k)
+    C_double_prime = search(C_prime)
+    pool = clique_pool.active()
+    if pool is not None:
+        # Ogni ottimo locale, non solo i record, può entrare nel pool
+        pool.offer(C_double_prime)
+
+    rec = instrumentation.active()
+    if rec is not None:
+        # Esito della perturbazione rispetto alla soluzione di riferimento
+        delta = len(C_double_prime) - len(C_ref)
+        rec.count("ils.iterations")
+        rec.observe("ils.perturbation.removed", len(C_ref) - len(C_prime))
+        rec.count("ils.perturbation." + ("improved" if delta > 0 else "equal" if delta == 0 else "worse"))
+    return C_double_prime
+
+# Gli eventi della ILS vanno al Recorder attivo (src/instrumentation.py);
+# con verbose=True vengono anche stampati con questi messaggi.
+_ILS_MESSAGES = {
+    "ils.start": "--- Avvio ILS (Max Iter: {max_iter}, k={k}) ---",
+    "ils.initial": "Start ILS -> Ottimo locale iniziale: {size}",
+    "ils.improve": "[Iter {iteration}] Nuovo record globale trovato: {size}",
+    "ils.resume": "Ripresa ILS dal checkpoint -> Iter {iteration}, record: {size}",
+}
+
+def iterative_local_search(
+    G: GraphLike,
+    initial_solution: Set[int],
+    max_iter: int,
+    k: int,
+    verbose: bool = True,
+    tightness: bool = True,
+    time_limit: Optional[float] = None,
+    stagnation: Optional[int] = None,
+    on_improve: Optional[ImproveCallback] = None,
+    warm_starts: Iterable[Set[int]] = (),
+    checkpoint: Optional[str] = None,
+    checkpoint_interval: float = DEFAULT_INTERVAL,
+) -> Set[int]:
+    """
+    Con tightness=True (default) la local search è quella incrementale di
+    src/tightness.py, costruita una volta e riusata a ogni iterazione;
+    con tightness=False si usa la (1,k)-swap classica di local_search.
+
+    Oltre a max_iter la ricerca si ferma dopo time_limit secondi, dopo
+    'stagnation' iterazioni senza nuovo record globale o quando on_improve
+    restituisce True; on_improve(soluzione, secondi) riceve anche l'ottimo
+    locale iniziale (vedi SearchBudget in src/budget.py).
+
+    warm_starts: cricche note (es. record di run precedenti letti da
+    src/result_store.py); se una è più grande dell'ottimo locale iniziale,
+    la ILS riparte da lei. Devono essere cricche valide di G.
+
+    checkpoint: file in cui salvare, al più ogni checkpoint_interval
+    secondi e a fine ricerca, lo stato a fine iterazione (C_best, C_ref,
+    iterazione, contatori del budget, stato di random), con scrittura
+    atomica. Se il file esiste già la ricerca riparte da lì invece che da
+    initial_solution e prosegue identica a una ricerca mai interrotta (a
+    parità di max_iter; con time_limit conta anche il tempo già speso).
+    Il checkpoint deve venire dallo stesso grafo e dagli stessi max_iter,
+    k e tightness, altrimenti ValueError. Vedi anche resume_ils.
+
+    Con un CliquePool attivo (src/clique_pool.py) gli vengono offerti
+    l'ottimo locale iniziale e quello di ogni iterazione.
+
+    Metriche (con instrumentation attiva): eventi ils.start/initial/improve,
+    ils.iterations, ils.perturbation.removed e gli esiti
+    ils.perturbation.improved/equal/worse rispetto a C_ref.
+    """
+    rec = instrumentation.active()
+    pool = clique_pool.active()
+
+    def report(event: str, **fields) -> None:
+        if rec is not None:
+            rec.event(event, **fields)
+        if verbose:
+            print(_ILS_MESSAGES[event].format(**fields))
+
+    report("ils.start", max_iter=max_iter, k=k)
+
+    # Conversione una volta sola: le local search successive riusano le bitmask.
+    if not isinstance(G, CSRGraph):
+        G = as_bitset(G)
+    search = ils_search(G, tightness)
+
+    ckpt = saved = None
+    run = {"max_iter": max_iter, "k": k, "tightness": tightness,
+           "nodes": G.number_of_nodes(), "edges": G.number_of_edges()}
+    if checkpoint is not None:
+        ckpt = Checkpointer(checkpoint, "ils", checkpoint_interval)
+        saved = ckpt.load()
+        if saved is not None:
+            check_matches(saved, checkpoint, **run)
+
+    budget = SearchBudget(time_limit, stagnation, on_improve)
+    if saved is None:
+        C_best = search(initial_solution)
+        for W in warm_starts:
+            if len(W) > len(C_best):
+                C_best = search(W)
+        C_ref = C_best
+        budget.improve(C_best)
+        report("ils.initial", size=len(C_best))
+        iteration = 0
+    else:
+        C_best, C_ref = set(saved["best"]), set(saved["ref"])
+        iteration = saved["iteration"]
+        set_rng_state(saved["random_state"])
+        budget.restore(C_best, **saved["budget"])
+        report("ils.resume", iteration=iteration, size=len(C_best))
+    if pool is not None:
+        pool.offer(C_best)
+    if saved is not None and saved["done"]:
+        return C_best
+
+    def save(done: bool) -> None:
+        ckpt.save(**run, iteration=iteration, done=done, best=sorted(C_best), ref=sorted(C_ref),
+                  time_limit=time_limit, stagnation=stagnation, budget=budget.state())
+
+    for i in range(iteration, max_iter):
+        if budget.stopped:
+            break
+        C_double_prime = ils_step(search, C_ref, k)
+
         if len(C_double_prime) > len(C_best):
-            print(f"[Iter {i+1}] Nuovo record globale trovato: {len(C_double_prime)}")
+            report("ils.improve", iteration=i + 1, size=len(C_double_prime), elapsed=budget.elapsed())
             C_best = C_double_prime
             C_ref = C_double_prime
-            
-    return C_best
\ No newline at end of file
+            budget.improve(C_best)
+        iteration = i + 1
+        if budget.done():
+            break
+        if ckpt is not None and ckpt.due():
+            save(done=False)
+
+    if ckpt is not None:
+        save(done=True)
+    return C_best
+
+
+def resume_ils(
+    G: GraphLike,
+    checkpoint: str,
+    verbose: bool = True,
+    on_improve: Optional[ImproveCallback] = None,
+    checkpoint_interval: float = DEFAULT_INTERVAL,
+) -> Set[int]:
+    """
+    Riprende la ILS salvata in 'checkpoint' con i suoi parametri (max_iter,
+    k, tightness, time_limit, stagnation), senza doverli ripetere: il
+    risultato è quello della ricerca originale non interrotta.
+    """
+    saved = Checkpointer(checkpoint, "ils").load()
+    if saved is None:
+        raise FileNotFoundError(checkpoint)
+    return iterative_local_search(
+        G,
+        set(),
+        max_iter=saved["max_iter"],
+        k=saved["k"],
+        verbose=verbose,
+        tightness=saved["tightness"],
+        time_limit=saved["time_limit"],
+        stagnation=saved["stagnation"],
+        on_improve=on_improve,
+        checkpoint=checkpoint,
+        checkpoint_interval=checkpoint_interval,
+    )
\ No newline at end of file
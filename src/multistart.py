@@ -0,0 +1,349 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Callable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from src import clique_pool
+from src.bitset import BitsetGraph, as_bitset, iter_bits
+from src.checkpoint import DEFAULT_INTERVAL, Checkpointer, check_matches, set_rng_state
+
+# Graph rebuilt once per worker process by ``init_worker``.
+_WORKER_GRAPH: Optional[BitsetGraph] = None
+# Restarts per seeded run when a checkpointed call gets no explicit seeds.
+CHECKPOINT_BLOCK = 100
+
+
+class SharedGraph:
+    """
+    A ``BitsetGraph`` published once in a shared memory block.
+
+    Layout (int64): ``[n, m, labels[0..n), edges[0..2m)]`` where the edges
+    are pairs of vertex indices. Workers rebuild an identical
+    ``BitsetGraph`` (same labels, same index order) from the block, so a
+    strategy run with a given seed behaves exactly as in the parent.
+
+    Vertex labels must be integers, as in DIMACS files.
+    """
+
+    def __init__(self, G):
+        B = as_bitset(G)
+        if not all(isinstance(u, (int, np.integer)) for u in B.labels):
+            raise TypeError("SharedGraph requires integer vertex labels")
+
+        n, m = len(B), B.number_of_edges()
+        self._shm = shared_memory.SharedMemory(create=True, size=8 * (2 + n + 2 * m) or 8)
+        data = np.ndarray((2 + n + 2 * m,), dtype=np.int64, buffer=self._shm.buf)
+        data[0], data[1] = n, m
+        data[2:2 + n] = B.labels
+        data[2 + n:] = [x for i, row in enumerate(B.rows) for j in iter_bits(row >> (i + 1)) for x in (i, i + 1 + j)]
+        del data
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedGraph":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def attach(name: str) -> BitsetGraph:
+        """Rebuild the ``BitsetGraph`` stored in the shared block ``name``."""
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            data = np.ndarray((shm.size // 8,), dtype=np.int64, buffer=shm.buf)
+            n, m = int(data[0]), int(data[1])
+            labels = data[2:2 + n].tolist()
+            edges = data[2 + n:2 + n + 2 * m].tolist()
+            del data
+        finally:
+            shm.close()
+
+        rows = [0] * n
+        for k in range(0, 2 * m, 2):
+            i, j = edges[k], edges[k + 1]
+            rows[i] |= 1 << j
+            rows[j] |= 1 << i
+        return BitsetGraph(labels, rows)
+
+
+def init_worker(shm_name: str) -> None:
+    """
+    ``ProcessPoolExecutor`` initializer: rebuild the graph published by a
+    ``SharedGraph`` once per worker process (read with ``worker_graph``).
+    """
+    global _WORKER_GRAPH
+    _WORKER_GRAPH = SharedGraph.attach(shm_name)
+
+
+def worker_graph() -> BitsetGraph:
+    """The graph of this worker process, as rebuilt by ``init_worker``."""
+    if _WORKER_GRAPH is None:
+        raise RuntimeError("worker_graph() called outside a process set up by init_worker")
+    return _WORKER_GRAPH
+
+
+def split_iterations(num_iter: int, num_seeds: int) -> List[int]:
+    """Split ``num_iter`` restarts as evenly as possible over ``num_seeds`` runs."""
+    base, extra = divmod(num_iter, num_seeds)
+    return [base + (i < extra) for i in range(num_seeds)]
+
+
+def _run_seed(G, func: Callable[..., Set[int]], seed: int, num_iter: int, params: dict) -> Set[int]:
+    random.seed(seed)
+    return func(G, num_iter=num_iter, **params)
+
+
+def _worker_task(
+    func: Callable[..., Set[int]],
+    seed: int,
+    num_iter: int,
+    params: dict,
+    pool_spec: Optional[Tuple[int, float]] = None,
+    deadline: Optional[float] = None,
+) -> Tuple[List[int], List[List[int]]]:
+    """
+    One seeded run in a worker process. With ``pool_spec`` (the capacity
+    and minimum distance of the parent's clique pool) the run collects
+    into a pool of its own, returned with the clique for the parent to merge.
+    With ``deadline`` (a ``time.time()`` value) the run gets the time left
+    until then as its ``time_limit``, and is skipped if none is left.
+    """
+    if deadline is not None:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return [], []
+        params = dict(params, time_limit=remaining)
+    pool = clique_pool.CliquePool(*pool_spec) if pool_spec is not None else None
+    with clique_pool.collecting(pool):
+        clique = list(_run_seed(worker_graph(), func, seed, num_iter, params))
+    return clique, pool.as_lists() if pool is not None else []
+
+
+def multistart(
+    G,
+    func: Callable[..., Set[int]],
+    num_iter: int,
+    seeds: Optional[Sequence[int]] = None,
+    workers: int = 1,
+    checkpoint: Optional[str] = None,
+    checkpoint_interval: float = DEFAULT_INTERVAL,
+    **params: Any,
+) -> Set[int]:
+    """
+    Run the randomized restarts of a constructive strategy, optionally on
+    several processes.
+
+    The ``num_iter`` restarts are split over the seeds: the run for seed
+    ``s`` reseeds ``random`` with ``s`` and calls
+    ``func(G, num_iter=chunk, **params)``. The best clique over all runs is
+    returned; ties go to the earliest seed, so the result for a given seed
+    set is the same whether the runs are executed serially or in parallel.
+
+    Parameters
+    ----------
+    G : graph
+        Input graph. Runs in this process use it as is; worker processes
+        get a ``BitsetGraph`` copy (see ``SharedGraph``), so serial and
+        parallel runs return the same clique when ``G`` is already a
+        ``BitsetGraph``, as in ``main.py``.
+    func : callable
+        A module-level ``solve_*`` strategy (it must be picklable).
+    num_iter : int
+        Total number of restarts.
+    seeds : sequence of int, optional
+        One seed per run. Defaults to ``range(workers)``. With the default
+        and ``workers == 1``, ``func`` is called once without reseeding.
+    workers : int
+        Number of worker processes; 1 runs everything in this process.
+    checkpoint : str, optional
+        File recording the completed runs (atomically, at most every
+        ``checkpoint_interval`` seconds and at the end). If it exists, the
+        runs it holds are not executed again, so calling ``multistart``
+        again with the same arguments resumes an interrupted call and
+        returns the same clique (and, serially, leaves ``random`` in the
+        same state). Without explicit ``seeds`` the restarts are split
+        into seeded runs of at most ``CHECKPOINT_BLOCK`` restarts, which
+        share the budget of the single call they replace (see below).
+    checkpoint_interval : float
+        Seconds between two checkpoints.
+    **params
+        Extra keyword arguments for ``func`` (e.g. ``k``, ``top_k_ratio``,
+        ``time_limit``, ``stagnation``). ``time_limit`` and ``stagnation``
+        apply to every run, except for the blocks of a checkpointed call
+        without ``seeds``: there the time limit is one deadline for the
+        whole call (time spent before an interruption included), each
+        block getting the time left, and restarts of blocks that did not
+        improve the best clique add up towards ``stagnation``; both are
+        saved in the checkpoint. ``on_improve`` is passed to ``func`` when the
+        runs execute in this process; with worker processes it is called
+        here, as the runs complete and improve on each other, and returning
+        True cancels the runs not started yet.
+
+    With an active ``CliquePool`` (``src/clique_pool.py``) the runs in this
+    process offer their cliques to it directly; worker processes fill a
+    pool of the same size each, merged into it in seed order. Runs
+    restored from a checkpoint contribute their best clique only.
+
+    Returns
+    -------
+    set
+        The largest clique found.
+    """
+    # Blocks of one checkpointed call share its time and stagnation budget
+    shared_budget = seeds is None and checkpoint is not None
+    if seeds is None:
+        if checkpoint is not None:
+            # A run is the unit of resumption: keep runs short
+            seeds = range(max(workers, -(-num_iter // CHECKPOINT_BLOCK)))
+        elif workers <= 1:
+            return func(G, num_iter=num_iter, **params)
+        else:
+            seeds = range(workers)
+
+    runs = [(seed, chunk) for seed, chunk in zip(seeds, split_iterations(num_iter, len(seeds))) if chunk > 0]
+
+    # Completed runs by position; restored from the checkpoint, if any
+    results: List[Optional[Set[int]]] = [None] * len(runs)
+    ckpt = saved = None
+    # Time spent and restarts since the best clique last improved, over
+    # the blocks of a shared budget
+    spent = 0.0
+    idle = 0
+    run_info = {"func": func.__name__, "num_iter": num_iter, "runs": [list(run) for run in runs]}
+    if checkpoint is not None:
+        ckpt = Checkpointer(checkpoint, "multistart", checkpoint_interval)
+        saved = ckpt.load()
+        if saved is not None:
+            check_matches(saved, checkpoint, **run_info)
+            results = [set(clique) if clique is not None else None for clique in saved["results"]]
+            spent, idle = saved["elapsed"], saved["idle"]
+
+    time_limit = params.get("time_limit")
+    stagnation = params.get("stagnation")
+
+    def finished(position: int, clique: Set[int]) -> None:
+        nonlocal idle
+        best_size = max((len(other) for other in results if other is not None), default=0)
+        idle = 0 if len(clique) > best_size else idle + runs[position][1]
+        results[position] = clique
+        if ckpt is not None and ckpt.due():
+            save()
+
+    def save() -> None:
+        ckpt.save(
+            **run_info,
+            results=[sorted(clique) if clique is not None else None for clique in results],
+            elapsed=time.perf_counter() - start,
+            idle=idle,
+        )
+
+    def exhausted() -> bool:
+        """True once the shared time or stagnation budget is used up."""
+        if not shared_budget:
+            return False
+        if time_limit is not None and time.perf_counter() - start >= time_limit:
+            return True
+        return stagnation is not None and idle >= stagnation
+
+    def block_params() -> dict:
+        """``params`` of the next block: what is left of the shared budget."""
+        if not shared_budget:
+            return params
+        left = dict(params)
+        if time_limit is not None:
+            left["time_limit"] = time_limit - (time.perf_counter() - start)
+        if stagnation is not None:
+            left["stagnation"] = stagnation - idle
+        return left
+
+    start = time.perf_counter() - spent
+    on_improve = params.pop("on_improve", None)
+    pool = clique_pool.active()
+    restored = [clique for clique in results if clique is not None]
+    if pool is not None:
+        pool.update(restored)
+    incumbent = max(map(len, restored), default=0)
+    stop = False
+    if restored and on_improve is not None:
+        stop = bool(on_improve(max(restored, key=len), 0.0))
+
+    if workers <= 1:
+        # The callback only hears about cliques larger than those of the
+        # previous runs
+
+        def forward(clique: Set[int], _elapsed: float) -> bool:
+            nonlocal incumbent, stop
+            if len(clique) > incumbent:
+                incumbent = len(clique)
+                stop = bool(on_improve(clique, time.perf_counter() - start))
+            return stop
+
+        if on_improve is not None:
+            params = dict(params, on_improve=forward)
+        executed = False
+        for position, (seed, chunk) in enumerate(runs):
+            if stop or exhausted():
+                break
+            if results[position] is not None:
+                continue
+            finished(position, _run_seed(G, func, seed, chunk, block_params()))
+            executed = True
+        if saved is not None and not executed:
+            # Every run was restored: leave ``random`` as the last one did
+            set_rng_state(saved["random_state"])
+    elif not stop and not exhausted():
+        pending = [position for position, clique in enumerate(results) if clique is None]
+        pool_spec = (pool.capacity, pool.min_distance) if pool is not None else None
+        # Queued blocks start late: they read the time left from a wall-clock
+        # deadline rather than getting the whole time limit
+        deadline = None
+        if shared_budget and time_limit is not None:
+            deadline = time.time() + time_limit - (time.perf_counter() - start)
+        found: List[List[List[int]]] = [[] for _ in runs]
+        with SharedGraph(G) as shared, ProcessPoolExecutor(
+            max_workers=min(workers, len(pending)) or 1,
+            initializer=init_worker,
+            initargs=(shared.name,),
+        ) as executor:
+            futures = {
+                executor.submit(_worker_task, func, *runs[position], params, pool_spec, deadline): position
+                for position in pending
+            }
+            # Anytime notifications in completion order; the reduction below
+            # stays in seed order
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                members, found[futures[future]] = future.result()
+                clique = set(members)
+                finished(futures[future], clique)
+                cancel = exhausted()
+                if on_improve is not None and len(clique) > incumbent:
+                    incumbent = len(clique)
+                    cancel = bool(on_improve(clique, time.perf_counter() - start)) or cancel
+                if cancel:
+                    for other in futures:
+                        other.cancel()
+        if pool is not None:
+            for cliques in found:
+                pool.update(cliques)
+
+    if ckpt is not None:
+        save()
+
+    # Global reduction: largest clique wins, ties go to the earlier seed
+    best = set()
+    for clique in results:
+        if clique is not None and len(clique) > len(best):
+            best = clique
+    return best
@@ -0,0 +1,189 @@
+import contextlib
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Set, Tuple
+
+from src.bitset import as_bitset
+from src.local_search import ils_search, ils_step
+from src.multistart import SharedGraph, init_worker, worker_graph
+
+
+@dataclass
+class ChainStats:
+    """Statistics of one ILS chain of the portfolio."""
+
+    chain: int
+    seed: int
+    k: int
+    best_size: int = 0
+    iterations: int = 0
+    restarts: int = 0
+    time_to_best: float = 0.0
+    wall_time: float = 0.0
+
+
+@dataclass
+class PortfolioResult:
+    """Global best clique of the portfolio plus per-chain statistics."""
+
+    best: Set[int]
+    chains: List[ChainStats] = field(default_factory=list)
+
+
+def _publish(elite, lock, clique: Set[int], elite_size: int) -> List[Tuple[int, ...]]:
+    """
+    Offer ``clique`` to the elite pool and return a snapshot of the pool.
+
+    The pool holds at most ``elite_size`` distinct cliques (as sorted
+    tuples), largest first.
+    """
+    key = tuple(sorted(clique))
+    with lock:
+        entries = list(elite)
+        if key and key not in entries:
+            entries.append(key)
+            entries.sort(key=len, reverse=True)
+            del entries[elite_size:]
+            elite[:] = entries
+    return entries
+
+
+def _run_chain(
+    G,
+    chain: int,
+    seed: int,
+    k: int,
+    initial_solution: Set[int],
+    max_iter: int,
+    epoch: int,
+    elite,
+    lock,
+    elite_size: int,
+) -> Tuple[List[int], ChainStats]:
+    """
+    Run one ILS chain, exchanging with the elite pool every ``epoch``
+    iterations.
+
+    The chain is one continuous ILS walk: its local search engine is built
+    once and its reference solution carries over from epoch to epoch. At
+    the end of each epoch the chain publishes its best clique; a chain
+    whose best is smaller than the best elite solution restarts from a
+    random elite clique of maximum size.
+    """
+    start = time.perf_counter()
+    random.seed(seed)
+    stats = ChainStats(chain=chain, seed=seed, k=k)
+
+    search = ils_search(G)
+    C_best = C_ref = search(set(initial_solution))
+    stats.time_to_best = time.perf_counter() - start
+    for done in range(1, max_iter + 1):
+        C_double_prime = ils_step(search, C_ref, k)
+        if len(C_double_prime) > len(C_best):
+            C_best = C_ref = C_double_prime
+            stats.time_to_best = time.perf_counter() - start
+
+        if done % epoch and done < max_iter:
+            continue
+        snapshot = _publish(elite, lock, C_best, elite_size)
+        if snapshot and len(snapshot[0]) > len(C_best):
+            top = [entry for entry in snapshot if len(entry) == len(snapshot[0])]
+            C_best = C_ref = set(random.choice(top))
+            stats.time_to_best = time.perf_counter() - start
+            stats.restarts += 1
+
+    stats.best_size = len(C_best)
+    stats.iterations = max_iter
+    stats.wall_time = time.perf_counter() - start
+    return list(C_best), stats
+
+
+def _worker_chain(*args) -> Tuple[List[int], ChainStats]:
+    return _run_chain(worker_graph(), *args)
+
+
+def ils_portfolio(
+    G,
+    initial_solution: Set[int],
+    max_iter: int,
+    num_chains: int,
+    ks: Optional[Sequence[int]] = None,
+    seeds: Optional[Sequence[int]] = None,
+    epoch: int = 50,
+    elite_size: int = 8,
+    workers: Optional[int] = None,
+) -> PortfolioResult:
+    """
+    Run several Iterated Local Search chains with elite-solution exchange.
+
+    Every chain starts from ``initial_solution`` with its own seed and
+    perturbation strength ``k`` and runs ``max_iter`` ILS iterations,
+    split in epochs of ``epoch`` iterations. At the end of each epoch the
+    chain publishes its best clique to a shared elite pool; chains lagging
+    behind the best elite solution restart from it.
+
+    Parameters
+    ----------
+    G : graph
+        Input graph (converted once to a ``BitsetGraph``).
+    initial_solution : set
+        Starting clique of every chain (e.g. the constructive phase output).
+    max_iter : int
+        ILS iterations per chain.
+    num_chains : int
+        Number of chains.
+    ks : sequence of int, optional
+        Perturbation strength per chain. Defaults to cycling over 1..4.
+    seeds : sequence of int, optional
+        Seed per chain. Defaults to ``range(num_chains)``.
+    epoch : int
+        Iterations between two exchanges with the elite pool.
+    elite_size : int
+        Maximum number of distinct cliques kept in the elite pool.
+    workers : int, optional
+        Number of processes; defaults to ``min(num_chains, cpu_count)``.
+        With 1 the chains run one after the other in this process.
+
+    Returns
+    -------
+    PortfolioResult
+        Global best clique and per-chain statistics.
+    """
+    ks = list(ks) if ks is not None else [1 + c % 4 for c in range(num_chains)]
+    seeds = list(seeds) if seeds is not None else list(range(num_chains))
+    if len(ks) != num_chains or len(seeds) != num_chains:
+        raise ValueError("ks and seeds must have one entry per chain")
+    if workers is None:
+        workers = min(num_chains, multiprocessing.cpu_count())
+
+    B = as_bitset(G)
+    epoch = max(1, epoch)
+    jobs = [
+        (chain, seeds[chain], ks[chain], set(initial_solution), max_iter, epoch)
+        for chain in range(num_chains)
+    ]
+
+    if workers <= 1:
+        elite: list = []
+        outcomes = [_run_chain(B, *job, elite, contextlib.nullcontext(), elite_size) for job in jobs]
+    else:
+        with multiprocessing.Manager() as manager, SharedGraph(B) as shared, ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(shared.name,),
+        ) as pool:
+            elite = manager.list()
+            lock = manager.Lock()
+            futures = [pool.submit(_worker_chain, *job, elite, lock, elite_size) for job in jobs]
+            outcomes = [future.result() for future in futures]
+
+    best: Set[int] = set()
+    chains = []
+    for clique, stats in outcomes:
+        chains.append(stats)
+        if len(clique) > len(best):
+            best = set(clique)
+    return PortfolioResult(best=best, chains=chains)
@@ -0,0 +1,193 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, List, Set
+
+from src.graph import Graph
+
+
+@dataclass
+class ReducedGraph:
+    """
+    Graph left after preprocessing, with compact vertex ids.
+
+    ``graph`` has vertices ``0..n'-1``; ``labels[i]`` is the original id of
+    vertex ``i``.
+    """
+
+    graph: Graph
+    labels: List[Hashable]
+    lower_bound: int
+    removed_nodes: int
+    removed_edges: int
+    index: Dict[Hashable, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.index = {u: i for i, u in enumerate(self.labels)}
+
+    def lift(self, clique: Iterable[int]) -> Set[Hashable]:
+        """Map a clique of the reduced graph back to the original ids."""
+        return {self.labels[i] for i in clique}
+
+    def project(self, clique: Iterable[Hashable]) -> Set[int]:
+        """Map original ids to reduced ids, dropping the removed vertices."""
+        return {self.index[u] for u in clique if u in self.index}
+
+
+def _adjacency(G) -> Dict[Hashable, Set[Hashable]]:
+    adj = {u: set(G.neighbors(u)) for u in G.nodes()}
+    for u, nbrs in adj.items():
+        nbrs.discard(u)
+    return adj
+
+
+def _peel(adj: Dict[Hashable, Set[Hashable]], min_degree: int) -> None:
+    """Remove in place every vertex outside the ``min_degree``-core."""
+    queue = deque(u for u, nbrs in adj.items() if len(nbrs) < min_degree)
+    while queue:
+        u = queue.popleft()
+        nbrs = adj.pop(u, None)
+        if nbrs is None:
+            continue
+        for v in nbrs:
+            nbrs_v = adj[v]
+            nbrs_v.discard(u)
+            if len(nbrs_v) == min_degree - 1:
+                queue.append(v)
+
+
+def _prune_triangles(adj: Dict[Hashable, Set[Hashable]], min_common: int) -> int:
+    """
+    Remove in place the edges whose endpoints have fewer than
+    ``min_common`` common neighbors. Returns the number of removed edges.
+    """
+    order = {u: i for i, u in enumerate(adj)}
+    doomed = [
+        (u, v)
+        for u, nbrs in adj.items()
+        for v in nbrs
+        if order[u] < order[v] and len(nbrs & adj[v]) < min_common
+    ]
+    for u, v in doomed:
+        adj[u].discard(v)
+        adj[v].discard(u)
+    return len(doomed)
+
+
+def _drop_small_components(adj: Dict[Hashable, Set[Hashable]], min_size: int) -> None:
+    seen: Set[Hashable] = set()
+    for start in list(adj):
+        if start in seen:
+            continue
+        component = [start]
+        seen.add(start)
+        for u in component:
+            for v in adj[u]:
+                if v not in seen:
+                    seen.add(v)
+                    component.append(v)
+        if len(component) < min_size:
+            for u in component:
+                del adj[u]
+
+
+def degeneracy_clique(G) -> Set[Hashable]:
+    """
+    Cheap lower bound: greedy clique grown from a vertex of maximum core
+    number, visiting its neighbors by decreasing core number.
+
+    Runs on adjacency sets in O(n + m) plus the greedy step, so it can be
+    used on graphs too large for the bitset representation.
+    """
+    adj = _adjacency(G)
+    if not adj:
+        return set()
+
+    # Smallest-last peeling with lazy buckets to get the core numbers
+    degree = {u: len(nbrs) for u, nbrs in adj.items()}
+    buckets: List[Set[Hashable]] = [set() for _ in range(max(degree.values()) + 1)]
+    for u, d in degree.items():
+        buckets[d].add(u)
+    core: Dict[Hashable, int] = {}
+    current = 0
+    k = 0
+    for _ in range(len(adj)):
+        current = max(0, current - 1)
+        while not buckets[current]:
+            current += 1
+        u = buckets[current].pop()
+        k = max(k, current)
+        core[u] = k
+        for v in adj[u]:
+            if v not in core:
+                buckets[degree[v]].discard(v)
+                degree[v] -= 1
+                buckets[degree[v]].add(v)
+
+    start = max(core, key=core.get)
+    clique = {start}
+    candidates = set(adj[start])
+    for v in sorted(adj[start], key=core.get, reverse=True):
+        if v in candidates:
+            clique.add(v)
+            candidates &= adj[v]
+    return clique
+
+
+def reduce_graph(G, lower_bound: int, triangle_pruning: bool = False) -> ReducedGraph:
+    """
+    Shrink ``G`` to the part that can still hold a clique of size
+    ``lower_bound`` (the size of the best known clique, ω').
+
+    Repeated until nothing changes:
+
+    * vertices outside the (ω'-1)-core are peeled (a vertex of a clique of
+      size ω' has at least ω'-1 neighbors inside it);
+    * with ``triangle_pruning``, edges whose endpoints share fewer than
+      ω'-2 neighbors are removed (an edge of such a clique lies in ω'-2
+      of its triangles);
+    * connected components with fewer than ω' vertices are dropped.
+
+    Every clique of size >= ω' survives, the incumbent included.
+
+    Parameters
+    ----------
+    G : graph
+        Input graph (``Graph``, ``nx.Graph``, ``BitsetGraph``, ...).
+    lower_bound : int
+        Size ω' of a known clique.
+    triangle_pruning : bool
+        Also apply the edge-based triangle-count rule.
+
+    Returns
+    -------
+    ReducedGraph
+        The reduced graph relabeled to ``0..n'-1`` with the id mapping.
+    """
+    adj = _adjacency(G)
+    original_nodes = len(adj)
+    original_edges = sum(len(nbrs) for nbrs in adj.values()) // 2
+
+    min_degree = max(lower_bound - 1, 0)
+    while True:
+        before = (len(adj), sum(len(nbrs) for nbrs in adj.values()))
+        _peel(adj, min_degree)
+        if triangle_pruning and lower_bound > 2:
+            _prune_triangles(adj, lower_bound - 2)
+            _peel(adj, min_degree)
+        _drop_small_components(adj, lower_bound)
+        if (len(adj), sum(len(nbrs) for nbrs in adj.values())) == before:
+            break
+
+    labels = list(adj)
+    index = {u: i for i, u in enumerate(labels)}
+    H = Graph()
+    H.add_nodes_from(range(len(labels)))
+    H.add_edges_from((index[u], index[v]) for u, nbrs in adj.items() for v in nbrs if index[u] < index[v])
+
+    return ReducedGraph(
+        graph=H,
+        labels=labels,
+        lower_bound=lower_bound,
+        removed_nodes=original_nodes - H.number_of_nodes(),
+        removed_edges=original_edges - H.number_of_edges(),
+    )
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Set
+
+from src.verify import verify_clique
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    params TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    clique TEXT NOT NULL,
+    timings TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_fingerprint ON results (fingerprint, size);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+
+@dataclass
+class StoredResult:
+    """A cached run: best clique (original vertex labels), its size and timings."""
+
+    fingerprint: str
+    strategy: str
+    params: Dict[str, Any]
+    seed: int
+    clique: Set[Hashable]
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.clique)
+
+
+def result_key(fingerprint: str, strategy: str, params: Dict[str, Any], seed: int) -> str:
+    """Stable key of a run: graph fingerprint, strategy, parameters and seed."""
+    payload = json.dumps([fingerprint, strategy, params, seed], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class ResultStore:
+    """
+    On-disk cache of solved runs, backed by SQLite.
+
+    Entries are keyed by ``result_key`` (the canonical graph fingerprint
+    computed by the loader, the strategy, its parameters and the seed).
+    The store keeps at most ``max_entries`` entries and evicts the least
+    recently used ones. Entries read with a graph are validated with
+    ``verify_clique`` and dropped if they are not a clique of it (e.g. a
+    fingerprint collision or a corrupted row).
+
+    ``best_clique`` returns the largest valid clique stored for a graph,
+    whatever the strategy: it is meant as a warm start for
+    ``iterative_local_search``.
+
+    Parameters
+    ----------
+    path : str or Path
+        SQLite database file (created if missing).
+    max_entries : int
+        Size bound of the LRU eviction.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = 10000):
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _row_to_result(self, row) -> StoredResult:
+        fingerprint, strategy, params, seed, clique, timings = row
+        return StoredResult(
+            fingerprint=fingerprint,
+            strategy=strategy,
+            params=json.loads(params),
+            seed=seed,
+            clique=set(json.loads(clique)),
+            timings=json.loads(timings),
+        )
+
+    def _valid(self, key: str, result: StoredResult, G) -> bool:
+        if G is None or (all(u in G for u in result.clique) and verify_clique(G, result.clique)):
+            return True
+        with self._db:
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+        return False
+
+    def get(self, fingerprint: str, strategy: str, params: Dict[str, Any], seed: int, G=None) -> Optional[StoredResult]:
+        """
+        Return the stored run, or None. With ``G`` the clique is validated
+        against the graph first. A hit refreshes the entry's LRU position.
+        """
+        key = result_key(fingerprint, strategy, params, seed)
+        row = self._db.execute(
+            "SELECT fingerprint, strategy, params, seed, clique, timings FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        result = self._row_to_result(row)
+        if not self._valid(key, result, G):
+            return None
+        with self._db:
+            self._db.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return result
+
+    def put(
+        self,
+        fingerprint: str,
+        strategy: str,
+        params: Dict[str, Any],
+        seed: int,
+        clique: Set[Hashable],
+        timings: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """
+        Store a run. An existing entry with the same key is only replaced
+        by a clique at least as large.
+        """
+        key = result_key(fingerprint, strategy, params, seed)
+        now = time.time()
+        with self._db:
+            self._db.execute(
+                """
+                INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    size = excluded.size, clique = excluded.clique,
+                    timings = excluded.timings, last_used = excluded.last_used
+                WHERE excluded.size >= results.size
+                """,
+                (
+                    key,
+                    fingerprint,
+                    strategy,
+                    json.dumps(params, sort_keys=True, default=str),
+                    seed,
+                    len(clique),
+                    json.dumps(sorted(clique)),
+                    json.dumps(timings or {}),
+                    now,
+                    now,
+                ),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)", (excess,)
+            )
+
+    def best_clique(self, fingerprint: str, G=None) -> Set[Hashable]:
+        """
+        Largest valid clique stored for the graph with this fingerprint
+        (empty set if none), for use as a warm start.
+        """
+        rows = self._db.execute(
+            "SELECT key, fingerprint, strategy, params, seed, clique, timings FROM results "
+            "WHERE fingerprint = ? ORDER BY size DESC",
+            (fingerprint,),
+        ).fetchall()
+        for key, *row in rows:
+            result = self._row_to_result(row)
+            if self._valid(key, result, G):
+                with self._db:
+                    self._db.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+                return result.clique
+        return set()
+
+    def results_for(self, fingerprint: str) -> List[StoredResult]:
+        """All the runs stored for a graph, largest clique first."""
+        rows = self._db.execute(
+            "SELECT fingerprint, strategy, params, seed, clique, timings FROM results "
+            "WHERE fingerprint = ? ORDER BY size DESC",
+            (fingerprint,),
+        ).fetchall()
+        return [self._row_to_result(row) for row in rows]
@@ -0,0 +1,285 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Set
+
+from src.bitset import BitsetGraph
+from src.bounds import stop_at, upper_bound
+from src.local_search import iterative_local_search
+from src.loader import parse_dimacs_buffer
+from src.reduction import degeneracy_clique, reduce_graph
+from src.strategies.registry import STRATEGIES
+
+# Largest request line accepted (DIMACS payloads travel inline).
+MAX_LINE = 256 * 1024 * 1024
+# Share of the time budget given to the constructive phase; the ILS gets
+# what is left.
+CONSTRUCTIVE_SHARE = 0.4
+DEFAULT_TIME_LIMIT = 1.0
+
+
+def request_graph(request: Dict[str, Any]) -> BitsetGraph:
+    """
+    Build the graph of a request.
+
+    Either ``dimacs`` (the text of a DIMACS file, vertices ``1..n``) or
+    ``edges`` (a list of ``[u, v]`` pairs, with an optional ``nodes`` list
+    for isolated vertices) must be present.
+    """
+    if "dimacs" in request:
+        num_nodes, edges = parse_dimacs_buffer(request["dimacs"].encode())
+        return BitsetGraph.from_edges(range(1, num_nodes + 1), edges.tolist())
+    if "edges" in request:
+        return BitsetGraph.from_edges(request.get("nodes", []), (tuple(edge) for edge in request["edges"]))
+    raise ValueError("request needs 'dimacs' or 'edges'")
+
+
+def solve_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Solve one request: reduction, constructive strategy and ILS within the
+    request's ``time_limit`` (seconds).
+
+    Optional fields: ``seed``, ``num_iter`` (constructive restarts) and
+    ``ils_iter``/``ils_k``/``ils_stagnation``; iteration counts are upper
+    bounds, the time budget usually stops the search first. The search
+    also stops, and the response reports ``optimal: true``, as soon as the
+    clique reaches the upper bound of ``src/bounds.py`` (``bound_iter``
+    rounds of iterated coloring, default 10).
+    """
+    start = time.perf_counter()
+    key = str(request.get("strategy", ""))
+    if key not in STRATEGIES:
+        raise ValueError(f"unknown strategy {key!r}, expected one of {', '.join(STRATEGIES)}")
+    time_limit = float(request.get("time_limit", DEFAULT_TIME_LIMIT))
+    if "seed" in request:
+        random.seed(request["seed"])
+
+    G = request_graph(request)
+    lower_bound = degeneracy_clique(G)
+    reduced = reduce_graph(G, len(lower_bound))
+    B = BitsetGraph.from_graph(reduced.graph)
+    bound = upper_bound(B, iterations=int(request.get("bound_iter", 10)), lower_bound=len(lower_bound))
+    stop = stop_at(bound.value)
+
+    def remaining(share: float = 1.0) -> float:
+        return max(0.0, (time_limit - (time.perf_counter() - start)) * share)
+
+    clique: Set[Any] = lower_bound
+    if not bound.certifies(len(lower_bound)):
+        _, func, params = STRATEGIES[key]
+        initial = func(
+            B,
+            num_iter=int(request.get("num_iter", 100000)),
+            time_limit=remaining(CONSTRUCTIVE_SHARE),
+            on_improve=stop,
+            **params,
+        )
+        final = initial
+        if not bound.certifies(len(initial)):
+            final = iterative_local_search(
+                B,
+                initial,
+                max_iter=int(request.get("ils_iter", 100000)),
+                k=int(request.get("ils_k", 2)),
+                verbose=False,
+                time_limit=remaining(),
+                stagnation=request.get("ils_stagnation"),
+                on_improve=stop,
+                warm_starts=[reduced.project(lower_bound)],
+            )
+        if len(final) >= len(clique):
+            clique = reduced.lift(final)
+
+    return {
+        "size": len(clique),
+        "clique": sorted(clique),
+        "upper_bound": bound.value,
+        "optimal": bound.certifies(len(clique)),
+        "nodes": G.number_of_nodes(),
+        "edges": G.number_of_edges(),
+        "solve_time": time.perf_counter() - start,
+    }
+
+
+def _warm_worker() -> None:
+    """Pool initializer: run every strategy once on a tiny graph."""
+    request = {"edges": [[1, 2], [2, 3], [1, 3], [3, 4]], "time_limit": 0.0, "num_iter": 1, "ils_iter": 1}
+    for key in STRATEGIES:
+        solve_request(dict(request, strategy=key))
+
+
+class SolveServer:
+    """
+    Long-running JSON Lines solve service.
+
+    Every line received is a request (see ``solve_request``; an ``id``
+    field is echoed back). Requests are solved on a pool of warm worker
+    processes and each response is written as soon as it is ready, so
+    responses come back in completion order, not request order::
+
+        {"id": 7, "ok": true, "size": 12, "clique": [...], "queue_time": 0.01, "solve_time": 0.98, ...}
+        {"id": 8, "ok": false, "error": "unknown strategy '9', ..."}
+
+    Backpressure: at most ``max_pending`` requests (over all connections)
+    are accepted but not yet answered. When the limit is reached the server
+    stops reading, so the OS socket buffers fill up and the producers block.
+    Writes wait for the client to drain its side too.
+
+    Parameters
+    ----------
+    workers : int
+        Worker processes.
+    max_pending : int, optional
+        Maximum accepted, unanswered requests (default ``4 * workers``).
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.max_pending = max_pending or 4 * self.workers
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self._pending: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "SolveServer":
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        self._pending = asyncio.Semaphore(self.max_pending)
+        # Start every worker now instead of on the first requests
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, os.getpid) for _ in range(self.workers)))
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.pool.shutdown(cancel_futures=True)
+
+    async def _handle(self, line: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock) -> None:
+        received = time.perf_counter()
+        response: Dict[str, Any] = {"id": None}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            response["id"] = request.get("id")
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.pool, solve_request, request)
+            response.update(ok=True, **result)
+            response["queue_time"] = max(0.0, time.perf_counter() - received - result["solve_time"])
+        except Exception as exc:  # Reported to the client, the server keeps going
+            response.update(ok=False, error=f"{type(exc).__name__}: {exc}")
+        finally:
+            self._pending.release()
+
+        async with write_lock:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+    async def serve_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection (or stdin/stdout) until end of input."""
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                await self._pending.acquire()
+                task = asyncio.create_task(self._handle(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # ValueError: line longer than MAX_LINE; drop the connection
+            for task in tasks:
+                task.cancel()
+        finally:
+            writer.close()
+
+    async def serve_socket(self, path: Optional[str] = None, host: Optional[str] = None, port: Optional[int] = None) -> None:
+        """Accept connections on a Unix socket ``path`` or on ``host:port``."""
+        if path is not None:
+            server = await asyncio.start_unix_server(self.serve_stream, path=path, limit=MAX_LINE)
+        else:
+            server = await asyncio.start_server(self.serve_stream, host=host, port=port, limit=MAX_LINE)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdio(self) -> None:
+        """Read requests from stdin and write responses to stdout (pipes)."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=MAX_LINE)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        try:
+            transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+            writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        except ValueError:
+            # stdout redirected to a regular file: no pipe transport (and no
+            # need for backpressure), write it directly
+            writer = _FileWriter(sys.stdout.buffer)
+        await self.serve_stream(reader, writer)
+
+
+class _FileWriter:
+    """The part of ``StreamWriter`` used by the server, over a binary file."""
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, data: bytes) -> None:
+        self.file.write(data)
+        self.file.flush()
+
+    async def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.file.flush()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.service", description="JSON Lines max-clique solve service.")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", help="Unix socket path")
+    where.add_argument("--port", type=int, help="TCP port (see --host)")
+    where.add_argument("--stdio", action="store_true", help="serve stdin/stdout (pipes)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=None, help="accepted unanswered requests (default: 4 x workers)")
+    return parser
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    # SIGTERM (and SIGINT, ignored by shells in background jobs) shut the
+    # server down cleanly: the pool is stopped and the socket removed
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, task.cancel)
+    async with SolveServer(args.workers, args.max_pending) as server:
+        if args.stdio:
+            await server.serve_stdio()
+        else:
+            print(f"Serving on {args.socket or f'{args.host}:{args.port}'} with {server.workers} workers", file=sys.stderr)
+            await server.serve_socket(path=args.socket, host=args.host, port=args.port)
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except asyncio.CancelledError:
+        pass
+    finally:
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+from src.service import MAX_LINE
+
+
+class SolveClient:
+    """
+    Client of ``src.service``.
+
+    ``solve_many`` streams requests to the server and yields the responses
+    in completion order, keeping at most ``window`` requests in flight: the
+    client stops sending when the window is full, so a slow server never
+    accumulates an unbounded backlog.
+
+    Usage::
+
+        async with SolveClient(socket="/tmp/mc.sock") as client:
+            async for response in client.solve_many(requests, window=8):
+                print(response["id"], response["size"])
+    """
+
+    def __init__(self, socket: Optional[str] = None, host: str = "127.0.0.1", port: Optional[int] = None):
+        self.socket = socket
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def __aenter__(self) -> "SolveClient":
+        if self.socket is not None:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.socket, limit=MAX_LINE)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port, limit=MAX_LINE)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def solve_many(self, requests: Iterable[Dict[str, Any]], window: int = 8) -> AsyncIterator[Dict[str, Any]]:
+        """Send ``requests`` and yield every response as it arrives."""
+        slots = asyncio.Semaphore(window)
+        sent = 0
+        sending_done = asyncio.Event()
+
+        async def send() -> None:
+            nonlocal sent
+            iterator = iter(requests)
+            while True:
+                # Wait for a free slot before taking the next request, so a
+                # lazy iterable is only consumed as fast as the server answers
+                await slots.acquire()
+                request = next(iterator, None)
+                if request is None:
+                    break
+                self._writer.write(json.dumps(request).encode() + b"\n")
+                await self._writer.drain()
+                sent += 1
+            sending_done.set()
+
+        sender = asyncio.create_task(send())
+        received = 0
+        try:
+            while not (sending_done.is_set() and received == sent):
+                reader = asyncio.create_task(self._reader.readline())
+                done, _ = await asyncio.wait({reader, sender}, return_when=asyncio.FIRST_COMPLETED)
+                if sender in done and sender.exception() is not None:
+                    reader.cancel()
+                    raise sender.exception()
+                if reader not in done:
+                    if received == sent:
+                        # Everything sent has been answered
+                        reader.cancel()
+                        break
+                    line = await reader
+                else:
+                    line = reader.result()
+                if not line:
+                    raise ConnectionError("server closed the connection")
+                received += 1
+                slots.release()
+                yield json.loads(line)
+        finally:
+            sender.cancel()
+
+    async def solve(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one request and wait for its response."""
+        async for response in self.solve_many([request], window=1):
+            return response
+
+
+def file_request(path: str, request_id: Any, strategy: str, time_limit: float) -> Dict[str, Any]:
+    """Request solving the DIMACS file at ``path``."""
+    return {"id": request_id, "strategy": strategy, "time_limit": time_limit, "dimacs": Path(path).read_text()}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.service_client", description="Send DIMACS files to the solve service.")
+    parser.add_argument("files", nargs="+", help="DIMACS files")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", help="Unix socket path")
+    where.add_argument("--port", type=int, help="TCP port (see --host)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-s", "--strategy", default="3", help="strategy key")
+    parser.add_argument("-t", "--time-limit", type=float, default=1.0, help="seconds per graph")
+    parser.add_argument("-w", "--window", type=int, default=8, help="requests in flight")
+    return parser
+
+
+async def _run(args: argparse.Namespace) -> int:
+    missing = [path for path in args.files if not Path(path).is_file()]
+    if missing:
+        print(f"No such file: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    requests = (file_request(path, path, args.strategy, args.time_limit) for path in args.files)
+    failures = 0
+    async with SolveClient(args.socket, args.host, args.port) as client:
+        async for response in client.solve_many(requests, window=args.window):
+            failures += not response["ok"]
+            print(json.dumps(response), flush=True)
+    return 1 if failures else 0
+
+
+def main(argv=None) -> int:
+    return asyncio.run(_run(build_parser().parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
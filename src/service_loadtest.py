@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+from src.generators import brock_like, gnp, p_hat_like, power_law
+from src.service_client import SolveClient
+
+# Request mix: (generator, arguments); every instance is seeded.
+MIX = [
+    (gnp, (150, 0.5)),
+    (p_hat_like, (200, 0.25, 0.75)),
+    (brock_like, (200, 0.6, 18)),
+    (power_law, (3000, 3)),
+]
+
+
+def make_requests(count: int, strategy: str, time_limit: float, distinct: int) -> List[Dict[str, Any]]:
+    """
+    ``count`` edge-list requests cycling over ``distinct`` generated graphs.
+    """
+    graphs = []
+    for i in range(distinct):
+        generator, args = MIX[i % len(MIX)]
+        instance = generator(*args, seed=i)
+        graphs.append((instance.name, list(range(1, instance.num_nodes + 1)), [list(edge) for edge in instance.edges]))
+    requests = []
+    for i in range(count):
+        name, nodes, edges = graphs[i % distinct]
+        requests.append(
+            {"id": i, "graph": name, "strategy": strategy, "time_limit": time_limit, "nodes": nodes, "edges": edges}
+        )
+    return requests
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_load(requests: List[Dict[str, Any]], window: int, **connection) -> Dict[str, Any]:
+    """
+    Send ``requests`` with ``window`` in flight and measure throughput and
+    client-side latency (send to response) of every request.
+    """
+    sent_at: Dict[Any, float] = {}
+
+    def stamped():
+        for request in requests:
+            sent_at[request["id"]] = time.perf_counter()
+            yield request
+
+    latencies, queue_times, errors = [], [], 0
+    start = time.perf_counter()
+    async with SolveClient(**connection) as client:
+        async for response in client.solve_many(stamped(), window=window):
+            latencies.append(time.perf_counter() - sent_at[response["id"]])
+            if response["ok"]:
+                queue_times.append(response["queue_time"])
+            else:
+                errors += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(requests),
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": len(requests) / elapsed,
+        "latency_p50": _percentile(latencies, 0.50),
+        "latency_p95": _percentile(latencies, 0.95),
+        "latency_p99": _percentile(latencies, 0.99),
+        "latency_max": max(latencies),
+        "queue_time_mean": statistics.fmean(queue_times) if queue_times else 0.0,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.service_loadtest", description="Load test of the solve service.")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", help="Unix socket path")
+    where.add_argument("--port", type=int, help="TCP port (see --host)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-n", "--requests", type=int, default=100)
+    parser.add_argument("--distinct", type=int, default=8, help="distinct graphs in the mix")
+    parser.add_argument("-s", "--strategy", default="3", help="strategy key")
+    parser.add_argument("-t", "--time-limit", type=float, default=0.2, help="seconds per request")
+    parser.add_argument("-w", "--window", type=int, default=16, help="requests in flight")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    requests = make_requests(args.requests, args.strategy, args.time_limit, args.distinct)
+    report = asyncio.run(run_load(requests, args.window, socket=args.socket, host=args.host, port=args.port))
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for name, value in report.items():
+            print(f"{name:<16} {value:.4f}" if isinstance(value, float) else f"{name:<16} {value}")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,94 +1,186 @@
-import networkx as nx
+import heapq
 import random
-from typing import Set, List
+from typing import Set, List, Optional
 
-def solve_is_min_degree(G: nx.Graph, num_iter: int = 5000) -> Set[int]:
+from src import clique_pool
+from src.budget import ImproveCallback, SearchBudget
+from src.bitset import iter_bits
+from src.bucket_queue import BucketQueue
+from src.complement import ComplementView
+from src.graph import GraphLike
+
+# =============================================================================
+# HELPER: Gradi residui mantenuti incrementalmente
+# =============================================================================
+# Sia R l'insieme dei nodi rimanenti. Il grado residuo in H di x ∈ R è
+#     deg_H(x, R) = |R| - 1 - g(x),   con g(x) = |N_G(x) ∩ R|.
+# Lo scarto |R| - 1 è uguale per tutti i nodi, quindi il minimo grado in H
+# corrisponde al massimo g: basta tenere g in una BucketQueue e pescare dai
+# bucket più alti. Scegliere u lascia in R solo N_G(u) ∩ R, e i g da
+# aggiornare sono solo quelli dei vicini (in G) dei nodi rimossi.
+# Questo vale per la vista a insiemi; sulla vista bitset (il caso di main.py
+# e batch.py) i gradi si ricalcolano, vedi _greedy_independent_set_bitset.
+
+def _residual_queue(H: ComplementView, nodes: Set[int]) -> BucketQueue:
+    """Costruisce da zero la coda dei g(x) per i nodi in 'nodes'."""
+    queue = BucketQueue(max(len(nodes) - 1, 0))
+    for x in nodes:
+        queue.insert(x, H.base_degree_in(x, nodes))
+    return queue
+
+
+def _greedy_independent_set_bitset(H: ComplementView, k: Optional[int] = None) -> Set[int]:
+    """
+    Come _greedy_independent_set, sulla vista bitset: R è una bitmask e il
+    grado residuo di x è H.degree_in(x, R), un AND e un popcount.
+
+    I gradi si ricalcolano a ogni passo invece di stare in una BucketQueue.
+    R si riduce a N_G(u) ∩ R, quindi una costruzione costa in tutto
+    circa n / (1 - p) popcount (p = densità di G), eseguiti in C. Una coda
+    aggiornata invece paga un decremento in Python per ogni arco di H tra
+    nodi rimossi e superstiti, cioè O(m_H). Misurato per costruzione, a
+    parità di cricche trovate: G(2000, 0.9) 0.025 s contro 0.17 s,
+    G(3000, 0.5) 0.007 s contro 1.3 s, G(3000, 0.1) 0.006 s contro 0.014 s.
+    """
+    rows = H.bitset.rows
+    remaining = H.full_mask
+    independent_set = 0
+
+    while remaining:
+        degrees = [(H.degree_in(x, remaining), x) for x in iter_bits(remaining)]
+        # 1-3. Candidati: tutti i nodi di grado minimo o i k di grado minore
+        if k is None:
+            min_deg = min(degrees)[0]
+            candidates = [x for d, x in degrees if d == min_deg]
+        else:
+            candidates = [x for _, x in heapq.nsmallest(k, degrees)]
+
+        # 4. Scelta casuale
+        u = random.choice(candidates)
+        independent_set |= 1 << u
+
+        # 5. Rimozione di u e dei suoi vicini in H: restano i vicini di u in G
+        remaining &= rows[u]
+
+    return set(H.members(independent_set))
+
+
+def _greedy_independent_set(H: ComplementView, k: Optional[int] = None) -> Set[int]:
+    """
+    Una costruzione greedy di IS su H.
+    Con k=None si sceglie a caso tra TUTTI i nodi di grado minimo,
+    altrimenti tra i k nodi di grado minore.
+    """
+    if H.bitset is not None:
+        return _greedy_independent_set_bitset(H, k)
+
+    remaining_nodes = set(H.nodes())
+    independent_set = set()
+    queue = BucketQueue(max((H.base_degree(x) for x in remaining_nodes), default=0))
+    for x in remaining_nodes:
+        queue.insert(x, H.base_degree(x))
+
+    while remaining_nodes:
+        # 1-3. Candidati: bucket con g massimo (= grado minimo in H) o i k migliori
+        if k is None:
+            candidates = queue.bucket(queue.max_key())
+        else:
+            candidates = queue.largest(k)
+
+        # 4. Scelta casuale
+        u = random.choice(candidates)
+        independent_set.add(u)
+
+        # 5. Rimozione di u e dei suoi vicini in H: restano i vicini di u in G
+        survivors = H.base_neighbors(u) & remaining_nodes
+        if len(survivors) < len(remaining_nodes) - len(survivors):
+            # Restano pochi nodi: ricostruire costa meno che aggiornare
+            queue = _residual_queue(H, survivors)
+        else:
+            removed = remaining_nodes - survivors
+            for w in removed:
+                queue.remove(w)
+            for w in removed:
+                for x in H.base_neighbors(w):
+                    if x in survivors:
+                        queue.decrement(x)
+        remaining_nodes = survivors
+
+    return independent_set
+
+
+def solve_is_min_degree(
+    G: GraphLike,
+    num_iter: int = 5000,
+    time_limit: Optional[float] = None,
+    stagnation: Optional[int] = None,
+    on_improve: Optional[ImproveCallback] = None,
+) -> Set[int]:
     """
     [TESI SEZIONE 2.1.1]
     Algoritmo greedy randomizzato con selezione tra vertici a grado minimo.
     Lavora sul grafo complemento per trovare una Clique (equivalente a IS su H).
+    Oltre a num_iter, si ferma per tempo, stagnazione o su richiesta di
+    on_improve (vedi SearchBudget in src/budget.py).
     """
-    # Lavoriamo sul complemento (H) perché cerchiamo una Clique in G
-    H = nx.complement(G)
-    
-    # Precomputazione adiacenze
-    adjacency = {u: set(H.neighbors(u)) for u in H.nodes()}
+    # Lavoriamo sul complemento (H) perché cerchiamo una Clique in G.
+    # H è una vista implicita: memorizza solo le adiacenze di G.
+    H = ComplementView(G)
     best_solution = set()
+    budget = SearchBudget(time_limit, stagnation, on_improve)
+    pool = clique_pool.active()
 
     for _ in range(num_iter):
-        remaining_nodes = set(H.nodes())
-        independent_set = set()
-
-        while remaining_nodes:
-            # 1. Calcola i gradi nel sottografo indotto dai nodi rimanenti
-            degrees = {u: len(adjacency[u] & remaining_nodes) for u in remaining_nodes}
-            
-            if not degrees:
-                break
-            
-            # 2. Trova il grado minimo
-            min_deg = min(degrees.values())
-            
-            # 3. Candidati: TUTTI i nodi che hanno quel grado minimo
-            candidates = [u for u, d in degrees.items() if d == min_deg]
-
-            # 4. Scelta casuale (Randomized)
-            u = random.choice(candidates)
-            independent_set.add(u)
-
-            # 5. Rimozione nodo e vicini (proprietà Independent Set)
-            to_remove = {u} | (adjacency[u] & remaining_nodes)
-            remaining_nodes -= to_remove
+        independent_set = _greedy_independent_set(H)
+        if pool is not None:
+            pool.offer(independent_set)
 
         if len(independent_set) > len(best_solution):
             best_solution = independent_set
+            budget.improve(best_solution)
+        if budget.done():
+            break
 
     return best_solution
 
 
-def solve_is_k_min_degree(G: nx.Graph, k: int, num_iter: int = 5000) -> Set[int]:
+def solve_is_k_min_degree(
+    G: GraphLike,
+    k: int,
+    num_iter: int = 5000,
+    time_limit: Optional[float] = None,
+    stagnation: Optional[int] = None,
+    on_improve: Optional[ImproveCallback] = None,
+) -> Set[int]:
     """
     [TESI SEZIONE 2.1.2]
     Algoritmo greedy randomizzato con scelta tra i k vertici meno connessi.
-    
+
     Args:
-        G (nx.Graph): Il grafo originale.
+        G (GraphLike): Il grafo originale.
         k (int): Numero di candidati da considerare (es. 3 o 10).
-        num_iter (int): Numero di iterazioni.
+        num_iter (int): Numero massimo di iterazioni.
+        time_limit (float, opzionale): Budget di tempo in secondi.
+        stagnation (int, opzionale): Iterazioni consecutive senza miglioramenti
+            dopo le quali fermarsi.
+        on_improve (callable, opzionale): on_improve(soluzione, secondi),
+            chiamata a ogni nuovo record; se restituisce True la ricerca si ferma.
     """
-    H = nx.complement(G)
-    adjacency = {u: set(H.neighbors(u)) for u in H.nodes()}
+    H = ComplementView(G)
     best_solution = set()
+    budget = SearchBudget(time_limit, stagnation, on_improve)
+    pool = clique_pool.active()
 
     for _ in range(num_iter):
-        remaining_nodes = set(H.nodes())
-        independent_set = set()
-
-        while remaining_nodes:
-            # 1. Calcola i gradi dinamici
-            degrees = {u: len(adjacency[u] & remaining_nodes) for u in remaining_nodes}
-            
-            if not degrees:
-                break
-            
-            # 2. Ordina i nodi per grado crescente
-            # (Sort è O(N log N), un po' più lento del min() puro, ma necessario qui)
-            sorted_nodes = sorted(degrees.keys(), key=lambda x: degrees[x])
-            
-            # 3. Candidati: I primi k nodi della lista ordinata
-            # Se ci sono meno di k nodi, li prendiamo tutti
-            slice_idx = min(len(sorted_nodes), k)
-            candidates = sorted_nodes[:slice_idx]
-
-            # 4. Scelta casuale tra i top k
-            u = random.choice(candidates)
-            independent_set.add(u)
-
-            # 5. Rimozione
-            to_remove = {u} | (adjacency[u] & remaining_nodes)
-            remaining_nodes -= to_remove
+        # I k nodi di grado minore si leggono dai bucket in O(k), senza sort
+        independent_set = _greedy_independent_set(H, k)
+        if pool is not None:
+            pool.offer(independent_set)
 
         if len(independent_set) > len(best_solution):
             best_solution = independent_set
+            budget.improve(best_solution)
+        if budget.done():
+            break
 
-    return best_solution
\ No newline at end of file
+    return best_solution
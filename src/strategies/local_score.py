@@ -1,48 +1,111 @@
-import networkx as nx
 import random
-from typing import Set, List, Dict, Tuple
+from typing import TYPE_CHECKING, Set, List, Dict, Optional, Tuple
 
-def _calculate_scores(G: nx.Graph) -> Dict[int, float]:
+import numpy as np
+
+from src import clique_pool
+from src.bitset import BitsetGraph, as_bitset, iter_bits
+from src.budget import ImproveCallback, SearchBudget
+from src.csr import CSRGraph, intersect_sorted, neighbor_sums
+from src.graph import GraphLike
+
+if TYPE_CHECKING:
+    import scipy.sparse as sp
+
+def _adjacency_matrix(B: BitsetGraph) -> "sp.csr_matrix":
+    """
+    Funzione helper: matrice di adiacenza sparsa (CSR) del BitsetGraph.
+    Ogni riga viene spacchettata con NumPy invece di scorrere i bit in Python.
+    SciPy è importato qui e non a livello di modulo: costa più di metà del
+    tempo di avvio e serve solo quando si calcolano gli score.
+    """
+    import scipy.sparse as sp
+
+    n = len(B)
+    num_bytes = (n + 7) // 8
+    indices = [
+        np.flatnonzero(np.unpackbits(np.frombuffer(row.to_bytes(num_bytes, "little"), dtype=np.uint8), bitorder="little"))
+        for row in B.rows
+    ]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum([len(idx) for idx in indices], out=indptr[1:])
+    indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+    data = np.ones(len(indices), dtype=np.float64)
+    return sp.csr_matrix((data, indices, indptr), shape=(n, n))
+
+def _bitset_rows(A: "sp.csr_matrix") -> List[int]:
+    """
+    Funzione helper: inverso di _adjacency_matrix, una bitmask per riga
+    (impacchettata con NumPy).
+    """
+    n = A.shape[0]
+    bits = np.zeros((n + 7) // 8 * 8, dtype=np.uint8)
+    rows = []
+    for u in range(n):
+        idx = A.indices[A.indptr[u]:A.indptr[u + 1]]
+        bits[idx] = 1
+        rows.append(int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little"))
+        bits[idx] = 0
+    return rows
+
+def _calculate_scores(A) -> np.ndarray:
     """
-    Funzione helper: Calcola lo score per ogni nodo.
+    Funzione helper: Calcola lo score per ogni nodo (indici del BitsetGraph)
+    a partire dalla sua matrice di adiacenza.
     Score(u) = deg(u) / avg_deg(neighbors).
+    Un solo prodotto matrice-vettore: (A @ deg)[u] = somma dei gradi dei vicini.
+    A può essere anche un CSRGraph: il prodotto si fa a blocchi sulle sue
+    liste di adiacenza, senza costruire la matrice.
     """
-    deg = dict(G.degree())
-    score = {}
-    
-    for u in G.nodes():
-        neighbors = list(G.neighbors(u))
-        if not neighbors:
-            score[u] = 0.0
-        else:
-            avg_neighbor_deg = sum(deg[v] for v in neighbors) / len(neighbors)
-            if avg_neighbor_deg > 0:
-                score[u] = deg[u] / avg_neighbor_deg
-            else:
-                score[u] = 0.0
+    if isinstance(A, CSRGraph):
+        deg = A.degrees().astype(np.float64)
+        neighbor_deg_sum = neighbor_sums(A, deg)
+    else:
+        deg = np.diff(A.indptr).astype(np.float64)
+        neighbor_deg_sum = A @ deg
+
+    score = np.zeros(deg.size, dtype=np.float64)
+    valid = neighbor_deg_sum > 0
+    avg_neighbor_deg = neighbor_deg_sum[valid] / deg[valid]
+    score[valid] = deg[valid] / avg_neighbor_deg
     return score
 
-def solve_score_tie_breaking(G: nx.Graph, num_iter: int = 5000) -> Set[int]:
+def solve_score_tie_breaking(
+    G: GraphLike,
+    num_iter: int = 5000,
+    time_limit: Optional[float] = None,
+    stagnation: Optional[int] = None,
+    on_improve: Optional[ImproveCallback] = None,
+) -> Set[int]:
     """
     [TESI SEZIONE 2.2.1]
     Greedy score-based con tie-breaking randomizzato.
     I nodi con lo stesso score vengono mescolati tra loro.
+    Criteri di arresto aggiuntivi: time_limit, stagnation, on_improve
+    (vedi SearchBudget in src/budget.py).
+    Su un CSRGraph gira senza conversioni (vedi _tie_breaking_csr).
     """
-    best_solution = set()
+    if isinstance(G, CSRGraph):
+        return _tie_breaking_csr(G, num_iter, SearchBudget(time_limit, stagnation, on_improve))
+    B = as_bitset(G)
+    rows = B.rows
+    best_solution = 0
     
     # 1. Calcolo score (una volta sola)
-    score_map = _calculate_scores(G)
+    score_map = _calculate_scores(_adjacency_matrix(B))
     
     # 2. Raggruppa nodi per score
     # Struttura: { 1.5: [nodo1, nodo3], 1.2: [nodo2], ... }
     nodes_by_score: Dict[float, List[int]] = {}
-    for u, s in score_map.items():
+    for u, s in enumerate(score_map.tolist()):
         if s not in nodes_by_score:
             nodes_by_score[s] = []
         nodes_by_score[s].append(u)
     
     # Ordina gli score unici dal più alto al più basso
     sorted_scores = sorted(nodes_by_score.keys(), reverse=True)
+    budget = SearchBudget(time_limit, stagnation, on_improve)
+    pool = clique_pool.active()
 
     for _ in range(num_iter):
         # 3. Costruisci l'ordine di visita per questa iterazione
@@ -53,82 +116,183 @@ def solve_score_tie_breaking(G: nx.Graph, num_iter: int = 5000) -> Set[int]:
             current_order.extend(group)
             
         # 4. Costruzione Greedy Standard
-        current_clique = set()
+        # 'candidates' = nodi connessi a TUTTI i nodi già nella clique (AND delle righe)
+        current_clique = 0
+        candidates = B.full_mask
         for u in current_order:
-            # Aggiungi se è connesso a TUTTI i nodi già nella clique
-            if all(G.has_edge(u, v) for v in current_clique):
-                current_clique.add(u)
+            if candidates >> u & 1:
+                current_clique |= 1 << u
+                candidates &= rows[u]
+                if not candidates:
+                    break
+        if pool is not None and pool.admits(current_clique.bit_count()):
+            pool.offer(B.members(current_clique))
         
-        if len(current_clique) > len(best_solution):
+        if current_clique.bit_count() > best_solution.bit_count():
             best_solution = current_clique
+            budget.improve(set(B.members(best_solution)))
+        if budget.done():
+            break
 
-    return best_solution
+    return set(B.members(best_solution))
 
 
-def solve_score_top_k(G: nx.Graph, num_iter: int = 5000, top_k_ratio: float = 0.02) -> Set[int]:
+def solve_score_top_k(
+    G: GraphLike,
+    num_iter: int = 5000,
+    top_k_ratio: float = 0.02,
+    time_limit: Optional[float] = None,
+    stagnation: Optional[int] = None,
+    on_improve: Optional[ImproveCallback] = None,
+) -> Set[int]:
     """
     [TESI SEZIONE 2.2.2]
     Greedy score-based con selezione randomizzata tra i Top-K compatibili.
+    Stessi criteri di arresto di solve_score_tie_breaking.
+    Su un CSRGraph gira senza conversioni (vedi _top_k_csr).
     """
-    best_solution = set()
+    if isinstance(G, CSRGraph):
+        return _top_k_csr(G, num_iter, top_k_ratio, SearchBudget(time_limit, stagnation, on_improve))
+    B = as_bitset(G)
+    best_solution = 0
+    if not B.rows:
+        return set()
     
     # 1. Calcolo e Ordinamento Globale
-    score_map = _calculate_scores(G)
-    # Lista di tutti i nodi ordinati rigidamente per score decrescente
-    global_sorted_nodes = sorted(score_map.keys(), key=lambda x: score_map[x], reverse=True)
+    A = _adjacency_matrix(B)
+    score_map = _calculate_scores(A)
+    # Nodi ordinati rigidamente per score decrescente (ordinamento stabile)
+    global_sorted_nodes = np.argsort(-score_map, kind="stable")
+    # Rietichettatura per rango: la riga i è il nodo di rango i. Così i
+    # candidati compatibili migliori sono i bit più bassi della maschera.
+    A = A[global_sorted_nodes][:, global_sorted_nodes].tocsr()
+    rows = _bitset_rows(A)
+    ranked_labels = [B.labels[u] for u in global_sorted_nodes.tolist()]
     
     # Pool size iniziale
-    initial_k = max(1, int(len(G) * top_k_ratio))
+    initial_k = max(1, int(len(B) * top_k_ratio))
+    budget = SearchBudget(time_limit, stagnation, on_improve)
+    pool = clique_pool.active()
 
     for _ in range(num_iter):
-        current_clique = set()
+        # 2. Scelta del primo nodo (random tra i top-k globali = ranghi 0..k-1)
+        start_node = random.randrange(initial_k)
+        current_clique = 1 << start_node
         
-        # 2. Scelta del primo nodo (random tra i top-k globali)
-        start_node = random.choice(global_sorted_nodes[:initial_k])
-        current_clique.add(start_node)
-        
-        # Nodi rimanenti (potenziali candidati)
-        remaining = set(G.nodes()) - current_clique
+        # Nodi compatibili: vicini di TUTTI i membri della clique.
+        # Con le bitmask basta un AND con la riga del nodo aggiunto.
+        compatible_candidates = rows[start_node]
         
         # 3. Espansione della clique
-        while True:
-            # A. Trova tutti i nodi compatibili con la clique attuale
-            # (Devono essere vicini a TUTTI i membri della clique)
-            compatible_candidates = []
-            for n in remaining:
-                if all(G.has_edge(n, member) for member in current_clique):
-                    compatible_candidates.append(n)
-            
-            if not compatible_candidates:
-                break
-                
-            # B. Filtraggio Top-K basato sull'ordine globale
-            # Dobbiamo prendere i 'k' migliori candidati secondo lo score originale.
-            # L'intersezione tra 'global_sorted_nodes' e 'compatible_candidates' 
-            # mantiene l'ordinamento implicito.
-            
+        while compatible_candidates:
+            # A. Top-K: i 'pool_limit' compatibili con score più alto sono i
+            #    bit meno significativi della maschera (indici = ranghi)
+            pool_limit = max(1, int(compatible_candidates.bit_count() * top_k_ratio))
             valid_pool = []
-            pool_limit = max(1, int(len(compatible_candidates) * top_k_ratio))
+            remaining = compatible_candidates
+            while remaining and len(valid_pool) < pool_limit:
+                low = remaining & -remaining
+                valid_pool.append(low.bit_length() - 1)
+                remaining ^= low
             
-            # Scorrere la lista globale è efficiente per mantenere l'ordine
-            count = 0
-            for node in global_sorted_nodes:
-                if node in compatible_candidates: # Check rapido (se compatible_candidates fosse un set sarebbe O(1))
-                    valid_pool.append(node)
-                    count += 1
-                    if count >= pool_limit:
-                        break
-            
-            # C. Scelta random dal pool ristretto
+            # B. Scelta random dal pool ristretto
             next_node = random.choice(valid_pool)
-            current_clique.add(next_node)
+            current_clique |= 1 << next_node
             
-            # Aggiorna rimanenti: Rimuovi nodo scelto e chi non è suo vicino
-            # (Ottimizzazione importante per ridurre i check futuri)
-            remaining.remove(next_node)
-            remaining = {n for n in remaining if G.has_edge(next_node, n)}
+            # Aggiorna compatibili: restano solo i vicini del nodo scelto
+            compatible_candidates &= rows[next_node]
+        if pool is not None and pool.admits(current_clique.bit_count()):
+            pool.offer([ranked_labels[i] for i in iter_bits(current_clique)])
+
+        if current_clique.bit_count() > best_solution.bit_count():
+            best_solution = current_clique
+            budget.improve({ranked_labels[i] for i in iter_bits(best_solution)})
+        if budget.done():
+            break
+
+    return {ranked_labels[i] for i in iter_bits(best_solution)}
+
+
+def _tie_breaking_csr(G: CSRGraph, num_iter: int, budget: SearchBudget) -> Set[int]:
+    """
+    solve_score_tie_breaking su un CSRGraph. Invece di mescolare ogni gruppo
+    di score a ogni iterazione (O(n)), i pareggi si estraggono quando
+    servono: il prossimo nodo è uno a caso tra i compatibili di score
+    massimo, la stessa distribuzione dell'ordine mescolato. Il flusso
+    random è diverso da quello della versione a bitset.
+    """
+    best_solution: List[int] = []
+    if not len(G):
+        return set()
+
+    score_map = _calculate_scores(G)
+    top_group = np.flatnonzero(score_map == score_map.max())
+    pool = clique_pool.active()
+
+    for _ in range(num_iter):
+        u = int(top_group[random.randrange(top_group.size)])
+        current_clique = [u]
+        compatible = G.neighbors_of(u)
+        while compatible.size:
+            scores = score_map[compatible]
+            ties = compatible[scores == scores.max()]
+            u = int(ties[random.randrange(ties.size)])
+            current_clique.append(u)
+            compatible = intersect_sorted(compatible, G.neighbors_of(u))
+        if pool is not None and pool.admits(len(current_clique)):
+            pool.offer(G.members(current_clique))
+
+        if len(current_clique) > len(best_solution):
+            best_solution = current_clique
+            budget.improve(set(G.members(best_solution)))
+        if budget.done():
+            break
+
+    return set(G.members(best_solution))
+
+
+def _top_k_csr(G: CSRGraph, num_iter: int, top_k_ratio: float, budget: SearchBudget) -> Set[int]:
+    """
+    solve_score_top_k su un CSRGraph: i compatibili sono una lista ordinata
+    di indici e il pool sono i pool_limit di rango minore (np.partition),
+    nello stesso ordine e con le stesse estrazioni random della versione a
+    bitset, quindi a parità di seme il risultato è lo stesso.
+    """
+    best_solution: List[int] = []
+    n = len(G)
+    if not n:
+        return set()
+
+    score_map = _calculate_scores(G)
+    global_sorted_nodes = np.argsort(-score_map, kind="stable")
+    rank = np.empty(n, dtype=np.int64)
+    rank[global_sorted_nodes] = np.arange(n)
+
+    initial_k = max(1, int(n * top_k_ratio))
+    pool = clique_pool.active()
+
+    for _ in range(num_iter):
+        start_node = int(global_sorted_nodes[random.randrange(initial_k)])
+        current_clique = [start_node]
+        compatible_candidates = G.neighbors_of(start_node)
+
+        while compatible_candidates.size:
+            pool_limit = max(1, int(compatible_candidates.size * top_k_ratio))
+            ranks = rank[compatible_candidates]
+            if pool_limit < ranks.size:
+                ranks = np.partition(ranks, pool_limit - 1)[:pool_limit]
+            valid_pool = np.sort(ranks)
+
+            next_node = int(global_sorted_nodes[random.choice(valid_pool)])
+            current_clique.append(next_node)
+            compatible_candidates = intersect_sorted(compatible_candidates, G.neighbors_of(next_node))
+        if pool is not None and pool.admits(len(current_clique)):
+            pool.offer(G.members(current_clique))
 
         if len(current_clique) > len(best_solution):
             best_solution = current_clique
+            budget.improve(set(G.members(best_solution)))
+        if budget.done():
+            break
 
-    return best_solution
\ No newline at end of file
+    return set(G.members(best_solution))
@@ -0,0 +1,20 @@
+from typing import Any, Callable, Dict, Set, Tuple
+
+from src.strategies.independent_set import solve_is_min_degree, solve_is_k_min_degree
+from src.strategies.local_score import solve_score_tie_breaking, solve_score_top_k
+from src.strategies.vertex_cover import solve_vc_max_degree, solve_vc_matching
+
+# Registro delle strategie costruttive: chiave -> (nome, funzione, parametri).
+# Le funzioni sono module-level, quindi serializzabili verso i processi worker.
+STRATEGIES: Dict[str, Tuple[str, Callable[..., Set[int]], Dict[str, Any]]] = {
+    "1": ("IS - Min Degree (Sez 2.1.1)", solve_is_min_degree, {}),
+    "2": ("IS - K-Min Degree (Sez 2.1.2)", solve_is_k_min_degree, {"k": 10}),
+    "3": ("Score - Random Tie (Sez 2.2.1)", solve_score_tie_breaking, {}),
+    "4": ("Score - Top-K (Sez 2.2.2)", solve_score_top_k, {"top_k_ratio": 0.02}),
+    "5": ("VC - Max Degree (Sez 2.3.1)", solve_vc_max_degree, {}),
+    "6": ("VC - Matching (Sez 2.3.2)", solve_vc_matching, {}),
+}
+
+# Strategie che girano anche su un CSRGraph (src/csr.py) senza conversioni;
+# le altre passano dal grafo complementare o dai bitset.
+CSR_STRATEGIES = ("3", "4")
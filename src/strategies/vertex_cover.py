@@ -1,81 +1,232 @@
-import networkx as nx
 import random
-from typing import Set, List, Tuple
+from typing import Set, List, Optional, Tuple
+
+from src import clique_pool
+from src.budget import ImproveCallback, SearchBudget
+from src.bitset import iter_bits
+from src.bucket_queue import BucketQueue
+from src.complement import ComplementView
+from src.graph import GraphLike
 
 # =============================================================================
 # HELPER FUNCTIONS (Funzioni di supporto interne)
 # =============================================================================
+# I vertex cover sono calcolati sul complemento H, passato come ComplementView:
+# H non viene mai materializzato, si interrogano solo le adiacenze di G.
+
+# Sulla vista bitset (H.bitset non None) ogni helper ha una variante a
+# bitmask: i vicini in H di un indice si leggono con H.neighbors_in(u, mask),
+# un AND sulle righe di G, e i risultati tornano etichette con H.members.
+
+def _reduce_to_minimal_bitset(H: ComplementView, cover: Set[int]) -> Set[int]:
+    """Variante a bitmask di _reduce_to_minimal: u è ridondante se H.degree_in(u, O) = 0."""
+    cover_mask = H.mask(cover)
+    outside = H.full_mask & ~cover_mask
+
+    nodes_to_check = list(iter_bits(cover_mask))
+    random.shuffle(nodes_to_check)
+
+    for u in nodes_to_check:
+        if not H.degree_in(u, outside):
+            cover_mask &= ~(1 << u)
+            outside |= 1 << u
+
+    return set(H.members(cover_mask))
 
-def _reduce_to_minimal(G: nx.Graph, cover: Set[int]) -> Set[int]:
+def _reduce_to_minimal(H: ComplementView, cover: Set[int]) -> Set[int]:
     """
     Riduce un Vertex Cover rimuovendo i nodi ridondanti.
     Un nodo è ridondante se, rimuovendolo, tutti gli archi sono ancora coperti
     dagli altri nodi del cover.
+
+    Con O = V - cover, i vicini in H di u ∈ cover che stanno fuori dal cover
+    sono |O| - inside[u], dove inside[u] = |N_G(u) ∩ O|. Il test costa O(1)
+    e ogni rimozione aggiorna solo i contatori dei vicini in G: O(deg).
     """
+    if H.bitset is not None:
+        return _reduce_to_minimal_bitset(H, cover)
+
     cover = cover.copy()
-    edges = list(G.edges())
+    outside_size = len(H) - len(cover)
+    
+    # inside[u] = numero di vicini (in G) di u fuori dal cover
+    inside = dict.fromkeys(cover, 0)
+    for o in H.nodes():
+        if o not in cover:
+            for x in H.base_neighbors(o):
+                if x in inside:
+                    inside[x] += 1
     
     # Mescoliamo l'ordine di verifica per variare il risultato della riduzione
     nodes_to_check = list(cover)
     random.shuffle(nodes_to_check)
     
     for u in nodes_to_check:
-        # Proviamo a rimuovere u
-        temp_cover = cover - {u}
-        
-        # Verifica se temp_cover è ancora un Vertex Cover valido
-        # Un cover è valido se per ogni arco (x, y), almeno uno tra x o y è nel cover.
-        is_valid = True
-        for x, y in edges:
-            if x not in temp_cover and y not in temp_cover:
-                is_valid = False
-                break
-        
-        if is_valid:
-            cover = temp_cover
+        # Gli unici archi scoperti dalla rimozione di u sono quelli incidenti a u:
+        # u è ridondante se nessun suo vicino (in H) è fuori dal cover.
+        if outside_size - inside[u] == 0:
+            cover.remove(u)
+            outside_size += 1
+            for x in H.base_neighbors(u):
+                if x in inside:
+                    inside[x] += 1
 
     return cover
 
-def _heuristic_max_degree(G: nx.Graph) -> Set[int]:
-    """Costruisce un VC scegliendo iterativamente i nodi di grado massimo."""
-    G_copy = G.copy()
+def _heuristic_max_degree_bitset(H: ComplementView) -> Set[int]:
+    """
+    Variante a bitmask di _heuristic_max_degree. La BucketQueue tiene
+    direttamente deg_H(x, A): rimuovere u decrementa solo i suoi vicini in H
+    ancora vivi, letti da H.neighbors_in(u, A). Sui grafi densi H è sparso,
+    quindi una costruzione costa O(n + m_H).
+    """
+    alive = H.full_mask
+    cover = 0
+
+    queue = BucketQueue(len(H))
+    for x in iter_bits(alive):
+        queue.insert(x, H.degree_in(x, alive))
+
+    while alive:
+        max_deg = queue.max_key()
+        if max_deg == 0: break # Nessun arco rimasto
+        # Tie-breaking casuale tra i nodi con grado massimo
+        u = random.choice(queue.bucket(max_deg))
+
+        cover |= 1 << u
+        alive &= ~(1 << u)
+        queue.remove(u)
+        for x in iter_bits(H.neighbors_in(u, alive)):
+            queue.decrement(x)
+
+    return set(H.members(cover))
+
+def _heuristic_max_degree(H: ComplementView) -> Set[int]:
+    """
+    Costruisce un VC scegliendo iterativamente i nodi di grado massimo.
+
+    Con A = nodi non ancora rimossi, deg_H(x, A) = |A| - 1 - g(x) con
+    g(x) = |N_G(x) ∩ A|: il grado massimo in H è il g minimo, letto da una
+    BucketQueue. Nessuna copia del grafo; rimuovere u aggiorna solo i suoi
+    vicini in G, quindi una costruzione costa O(n + m).
+    """
+    if H.bitset is not None:
+        return _heuristic_max_degree_bitset(H)
+
+    alive = set(H.nodes()) # Nodi non ancora rimossi
     cover = set()
+    
+    queue = BucketQueue(max((H.base_degree(x) for x in alive), default=0))
+    for x in alive:
+        queue.insert(x, H.base_degree(x))
 
-    while G_copy.number_of_edges() > 0:
-        # Dizionario gradi attuali
-        degrees = dict(G_copy.degree())
-        if not degrees: break
-        
-        max_deg = max(degrees.values())
+    while alive:
+        # g minimo = |A| - 1  <=>  nessun arco rimasto in H
+        min_g = queue.min_key()
+        if min_g == len(alive) - 1: break
         # Tie-breaking casuale tra i nodi con grado massimo
-        candidates = [n for n, d in degrees.items() if d == max_deg]
-        u = random.choice(candidates)
+        u = random.choice(queue.bucket(min_g))
         
         cover.add(u)
-        G_copy.remove_node(u)
+        alive.remove(u)
+        queue.remove(u)
+        for x in H.base_neighbors(u):
+            if x in alive:
+                queue.decrement(x)
         
     return cover
 
-def _heuristic_max_matching(G: nx.Graph) -> Set[int]:
+def _random_bit(mask: int) -> int:
+    """
+    Indice di un bit a 1 di 'mask' scelto uniformemente: si estrae il rango
+    r e lo si cerca per bisezione, contando i bit di metà intervallo con un
+    popcount (O(log n) operazioni sulla bitmask).
+    """
+    r = random.randrange(mask.bit_count())
+    lo, hi = 0, mask.bit_length()
+    while hi - lo > 1:
+        mid = (lo + hi) >> 1
+        below = ((mask >> lo) & ((1 << (mid - lo)) - 1)).bit_count()
+        if r < below:
+            hi = mid
+        else:
+            r -= below
+            lo = mid
+    return lo
+
+def _heuristic_max_matching_bitset(H: ComplementView) -> Set[int]:
+    """
+    Variante a bitmask di _heuristic_max_matching: ogni nodo libero, in
+    ordine casuale, viene accoppiato a un vicino in H ancora libero scelto
+    uniformemente tra quelli di H.neighbors_in(u, free).
+    """
+    order = list(iter_bits(H.full_mask))
+    random.shuffle(order) # Randomizzazione fondamentale
+    free = H.full_mask
+
+    for u in order:
+        if not free >> u & 1:
+            continue # u è già nel matching
+        partners = H.neighbors_in(u, free)
+        if partners:
+            free &= ~((1 << u) | (1 << _random_bit(partners)))
+
+    return set(H.members(H.full_mask & ~free))
+
+# Estrazioni casuali dai nodi liberi prima di elencare i vicini liberi in H
+_MATCHING_TRIES = 16
+
+def _heuristic_max_matching(H: ComplementView) -> Set[int]:
     """
     [TESI 2.3.2] Costruisce un VC basato su Matching Massimale Casuale.
     Tutti i nodi che toccano gli archi del matching formano il cover.
+
+    Gli archi di H non vengono enumerati: si visitano i nodi in ordine casuale
+    e ogni nodo libero viene accoppiato a un vicino in H libero scelto
+    uniformemente. Il compagno si cerca per rifiuto, estraendo nodi liberi
+    finché uno non è adiacente in G (su G sparso basta quasi sempre un
+    tentativo); dopo _MATCHING_TRIES rifiuti si elencano i candidati.
+    I nodi liberi stanno in una lista con rimozione per scambio, O(1).
     """
-    edges = list(G.edges())
-    random.shuffle(edges) # Randomizzazione fondamentale
-    
+    if H.bitset is not None:
+        return _heuristic_max_matching_bitset(H)
+
+    order = H.nodes()
+    random.shuffle(order) # Randomizzazione fondamentale
+    free = list(order)
+    position = {u: i for i, u in enumerate(free)}
+
+    def drop(x) -> None:
+        i = position.pop(x)
+        last = free.pop()
+        if i < len(free):
+            free[i] = last
+            position[last] = i
+
     cover = set()
-    covered_nodes = set() # Per tenere traccia rapida di chi è già coperto/usato
-    
-    for u, v in edges:
-        # Se l'arco è "libero" (nessuno dei due estremi è già nel matching)
-        if u not in covered_nodes and v not in covered_nodes:
-            # Aggiungiamo l'arco al matching -> aggiungiamo i nodi al cover
+
+    for u in order:
+        if u not in position:
+            continue # u è già nel matching
+        base = H.base_neighbors(u)
+        partner = None
+        for _ in range(_MATCHING_TRIES):
+            w = random.choice(free)
+            if w != u and w not in base:
+                partner = w
+                break
+        else:
+            candidates = [w for w in free if w != u and w not in base]
+            if candidates:
+                partner = random.choice(candidates)
+        # Senza compagni ora, u non ne avrà più: i liberi possono solo calare
+        drop(u)
+        if partner is not None:
+            # Arco (u, partner) di H "libero": lo aggiungiamo al matching
             cover.add(u)
-            cover.add(v)
-            covered_nodes.add(u)
-            covered_nodes.add(v)
-            
+            cover.add(partner)
+            drop(partner)
+
     # Nota teorica: I nodi incidenti a un matching massimale sono un Vertex Cover valido
     # (approssimazione fattore 2).
     return cover
@@ -84,25 +235,42 @@ def _heuristic_max_matching(G: nx.Graph) -> Set[int]:
 # PUBLIC FUNCTIONS (Le strategie richiamabili dal main)
 # =============================================================================
 
-def solve_vc_max_degree(G: nx.Graph, num_iter: int = 5000) -> Set[int]:
+def solve_vc_max_degree(
+    G: GraphLike,
+    num_iter: int = 5000,
+    time_limit: Optional[float] = None,
+    stagnation: Optional[int] = None,
+    on_improve: Optional[ImproveCallback] = None,
+) -> Set[int]:
     """
     [TESI SEZIONE 2.3.1]
     Clique via Vertex Cover (approccio Grado Massimo) su Grafo Complementare.
+    Criteri di arresto oltre a num_iter: time_limit, stagnation, on_improve
+    (vedi SearchBudget). Il record passato a on_improve è V - cover grezza,
+    già una cricca valida prima della riduzione a cover minimale.
     """
     
-    H = nx.complement(G)
+    H = ComplementView(G)
     all_nodes = set(G.nodes())
     
     best_vc = set()
     min_vc_size = float('inf')
+    budget = SearchBudget(time_limit, stagnation, on_improve)
+    pool = clique_pool.active()
     
     # 1. Fase Iterativa: Trova diverse cover grezze
     for _ in range(num_iter):
         vc = _heuristic_max_degree(H)
+        if pool is not None and pool.admits(len(all_nodes) - len(vc)):
+            # Solo le cover abbastanza piccole diventano un insieme
+            pool.offer(all_nodes - vc)
         
         if len(vc) < min_vc_size:
             min_vc_size = len(vc)
             best_vc = vc
+            budget.improve(all_nodes - best_vc)
+        if budget.done():
+            break
 
     if not best_vc and min_vc_size == float('inf'):
         return set() # Caso grafo vuoto
@@ -111,28 +279,46 @@ def solve_vc_max_degree(G: nx.Graph, num_iter: int = 5000) -> Set[int]:
     vc_minimal = _reduce_to_minimal(H, best_vc)
     
     # 3. Conversione: Clique = V - VertexCover(H)
-    return all_nodes - vc_minimal
+    clique = all_nodes - vc_minimal
+    if pool is not None:
+        pool.offer(clique)
+    return clique
 
 
-def solve_vc_matching(G: nx.Graph, num_iter: int = 5000) -> Set[int]:
+def solve_vc_matching(
+    G: GraphLike,
+    num_iter: int = 5000,
+    time_limit: Optional[float] = None,
+    stagnation: Optional[int] = None,
+    on_improve: Optional[ImproveCallback] = None,
+) -> Set[int]:
     """
     [TESI SEZIONE 2.3.2]
     Clique via Vertex Cover (approccio Matching Casuale) su Grafo Complementare.
+    Stessi criteri di arresto di solve_vc_max_degree.
     """
-    H = nx.complement(G)
+    H = ComplementView(G)
     all_nodes = set(G.nodes())
     
     best_vc = set()
     min_vc_size = float('inf')
+    budget = SearchBudget(time_limit, stagnation, on_improve)
+    pool = clique_pool.active()
     
     # 1. Fase Iterativa
     for _ in range(num_iter):
         # Genera cover tramite matching
         vc = _heuristic_max_matching(H)
+        if pool is not None and pool.admits(len(all_nodes) - len(vc)):
+            # Solo le cover abbastanza piccole diventano un insieme
+            pool.offer(all_nodes - vc)
         
         if len(vc) < min_vc_size:
             min_vc_size = len(vc)
             best_vc = vc
+            budget.improve(all_nodes - best_vc)
+        if budget.done():
+            break
 
     if not best_vc and min_vc_size == float('inf'):
         return set()
@@ -141,4 +327,7 @@ def solve_vc_matching(G: nx.Graph, num_iter: int = 5000) -> Set[int]:
     vc_minimal = _reduce_to_minimal(H, best_vc)
     
     # 3. Conversione
-    return all_nodes - vc_minimal
\ No newline at end of file
+    clique = all_nodes - vc_minimal
+    if pool is not None:
+        pool.offer(clique)
+    return clique
\ No newline at end of file
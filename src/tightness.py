@@ -0,0 +1,224 @@
+import random
+from typing import Hashable, Iterable, List, Set
+
+from src import instrumentation
+from src.bitset import as_bitset, iter_bits
+
+
+class TightnessSearch:
+    """
+    Incremental (1,k)-swap local search driven by vertex tightness.
+
+    For every vertex outside the current clique C the engine keeps
+    ``a[w]``, the number of clique members adjacent to ``w``, and a bucket
+    (set) of vertices per value of ``a[w]``. The tightness of ``w`` (members it is
+    *not* adjacent to) is ``|C| - a[w]``, so
+
+    * free vertices (tightness 0) are the bucket ``|C|``,
+    * 1-tight vertices (tightness 1) are the bucket ``|C| - 1``,
+
+    and adding or removing a member only touches the counters of its
+    neighbors (O(deg)). For a 1-tight vertex the single non-adjacent member
+    is ``sum(C) - s[w]``, where ``s[w]`` is the sum of the indices of the
+    members adjacent to ``w``.
+
+    Moves, in order of preference:
+
+    * add a free vertex (+1), preferring the one with most free neighbors;
+    * (1,2)-swap: remove ``u`` and insert two adjacent vertices that are
+      1-tight on ``u`` (+1; the second one becomes free after the swap);
+    * plateau (1,1)-swap: exchange ``u`` for a vertex 1-tight on it, at most
+      ``max_plateau`` times per search; a vertex swapped out this way cannot
+      re-enter during the same search.
+
+    The engine is built once per graph (adjacency lists are precomputed) and
+    reused across searches, as done by ``iterative_local_search``: its state
+    persists, so starting a search from a clique close to the previous
+    result (e.g. a perturbation of it) only updates the vertices that
+    changed.
+
+    With instrumentation enabled, ``search`` reports the moves
+    (``tight.moves.add``/``swap``/``plateau``), improving and
+    non-improving passes, the candidate-set sizes ``tight.free`` and
+    ``tight.one_tight`` and ``tight.adjacency_queries`` (adjacency-list
+    entries touched by the state updates).
+
+    Parameters
+    ----------
+    G : graph
+        Input graph (converted once to a ``BitsetGraph``).
+    max_plateau : int
+        Maximum number of plateau moves per search.
+    """
+
+    def __init__(self, G, max_plateau: int = 10):
+        self.B = as_bitset(G)
+        self.adj: List[List[int]] = [list(iter_bits(row)) for row in self.B.rows]
+        self.max_plateau = max_plateau
+
+        # Current clique; the state persists across searches, so moving to a
+        # new starting clique only costs the symmetric difference.
+        n = len(self.B)
+        self.members: Set[int] = set()
+        self.in_clique = [False] * n
+        self.a = [0] * n
+        self.s = [0] * n
+        max_degree = max((len(nbrs) for nbrs in self.adj), default=0)
+        self.buckets: List[Set[int]] = [set() for _ in range(max_degree + 2)]
+        self.buckets[0].update(range(n))
+        self.size = 0
+        self.total = 0
+
+    # ------------------------------------------------------------------
+    # O(deg) state updates
+    # ------------------------------------------------------------------
+    def _add(self, v: int) -> None:
+        a, s, in_clique, buckets = self.a, self.s, self.in_clique, self.buckets
+        buckets[a[v]].discard(v)
+        self.members.add(v)
+        in_clique[v] = True
+        self.size += 1
+        self.total += v
+        for w in self.adj[v]:
+            if in_clique[w]:
+                a[w] += 1
+            else:
+                buckets[a[w]].discard(w)
+                a[w] += 1
+                buckets[a[w]].add(w)
+            s[w] += v
+
+    def _remove(self, u: int) -> None:
+        a, s, in_clique, buckets = self.a, self.s, self.in_clique, self.buckets
+        self.members.discard(u)
+        in_clique[u] = False
+        self.size -= 1
+        self.total -= u
+        for w in self.adj[u]:
+            if in_clique[w]:
+                a[w] -= 1
+            else:
+                buckets[a[w]].discard(w)
+                a[w] -= 1
+                buckets[a[w]].add(w)
+            s[w] -= u
+        buckets[a[u]].add(u)
+
+    def _reset_to(self, clique: Set[int]) -> None:
+        for u in self.members - clique:
+            self._remove(u)
+        for v in clique - self.members:
+            self._add(v)
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def search(self, initial_clique: Iterable[Hashable]) -> Set[Hashable]:
+        """Run the local search from ``initial_clique`` and return the local optimum."""
+        B = self.B
+        rows = B.rows
+        buckets = self.buckets
+
+        start = {B.index[u] for u in initial_clique}
+        if len(start) == 1:
+            # The (1,k)-swap neighborhood of a single vertex is the whole
+            # graph: restart greedily from scratch, as local_search does.
+            start = set()
+        rec = instrumentation.active()
+        if rec is not None:
+            adj = self.adj
+            rec.count("tight.adjacency_queries", sum(len(adj[u]) for u in self.members ^ start))
+        self._reset_to(start)
+
+        tabu = set()
+        plateau_left = self.max_plateau
+
+        while True:
+            size = self.size
+
+            # 1. Free vertex: add the one with most free neighbors (random ties),
+            #    the same rule as the degree-sorted greedy of local_search.
+            #    Buckets are read in sorted order here and below: set order
+            #    depends on the update history, and the moves must depend
+            #    only on the clique, so that a fresh engine (an ILS resumed
+            #    from a checkpoint) makes the same choices.
+            if size < len(buckets):
+                free = [w for w in sorted(buckets[size]) if w not in tabu]
+                if free:
+                    free_mask = 0
+                    for w in free:
+                        free_mask |= 1 << w
+                    free_degree = [(rows[w] & free_mask).bit_count() for w in free]
+                    best = max(free_degree)
+                    v = random.choice([w for w, d in zip(free, free_degree) if d == best])
+                    self._add(v)
+                    if rec is not None:
+                        rec.count("tight.moves.add")
+                        rec.observe("tight.free", len(free))
+                        rec.count("tight.adjacency_queries", len(free) + len(self.adj[v]))
+                    continue
+
+            if size == 0:
+                break
+
+            # 2. (1,2)-swap: adjacent pair among the vertices 1-tight on the same u
+            groups = {}
+            total, s = self.total, self.s
+            for w in sorted(buckets[size - 1]):
+                if w not in tabu:
+                    groups.setdefault(total - s[w], []).append(w)
+
+            swap = None
+            for u, group in groups.items():
+                if len(group) < 2:
+                    continue
+                group_mask = 0
+                for x in group:
+                    group_mask |= 1 << x
+                for x in group:
+                    if rows[x] & group_mask:
+                        swap = (u, x)
+                        break
+                if swap:
+                    break
+
+            if rec is not None:
+                rec.observe("tight.one_tight", len(buckets[size - 1]))
+
+            if swap:
+                self._remove(swap[0])
+                self._add(swap[1])
+                if rec is not None:
+                    rec.count("tight.moves.swap")
+                    rec.count("tight.adjacency_queries", len(self.adj[swap[0]]) + len(self.adj[swap[1]]))
+                continue
+
+            # 3. Plateau (1,1)-swap, the removed vertex becomes tabu
+            if plateau_left > 0 and groups:
+                u = random.choice(list(groups))
+                x = random.choice(groups[u])
+                self._remove(u)
+                self._add(x)
+                tabu.add(u)
+                plateau_left -= 1
+                if rec is not None:
+                    rec.count("tight.moves.plateau")
+                    rec.count("tight.adjacency_queries", len(self.adj[u]) + len(self.adj[x]))
+                continue
+
+            break
+
+        if rec is not None:
+            rec.count("tight.passes.improving" if self.size > len(start) else "tight.passes.non_improving")
+
+        labels = B.labels
+        return {labels[i] for i in self.members}
+
+
+def tightness_local_search(initial_clique: Set[Hashable], G, max_plateau: int = 10) -> Set[Hashable]:
+    """
+    One-shot version of ``TightnessSearch`` with the same signature as
+    ``local_search``. Repeated calls on the same graph should reuse a
+    ``TightnessSearch`` instance instead.
+    """
+    return TightnessSearch(G, max_plateau=max_plateau).search(initial_clique)
@@ -0,0 +1,12 @@
+from typing import Hashable, Iterable
+
+
+def verify_clique(G, clique: Iterable[Hashable]) -> bool:
+    """Verifica che l'insieme di nodi sia davvero una cricca."""
+    nodes = list(clique)
+    # Verifica ogni coppia di nodi
+    for i in range(len(nodes)):
+        for j in range(i + 1, len(nodes)):
+            if not G.has_edge(nodes[i], nodes[j]):
+                return False
+    return True
@@ -0,0 +1,98 @@
+import random
+
+import networkx as nx
+import pytest
+
+from src.bitset import BitsetGraph, as_bitset, iter_bits
+
+
+def random_graph(n, p, seed):
+    """G(n, p) plus isolated vertices, with shuffled non-contiguous labels."""
+    G = nx.gnp_random_graph(n, p, seed=seed)
+    G.add_nodes_from(range(n, n + 3))
+    labels = list(range(n + 3))
+    random.Random(seed).shuffle(labels)
+    return nx.relabel_nodes(G, {u: 5 * labels[u] + 1 for u in G})
+
+
+def edge_set(edges):
+    return {frozenset(edge) for edge in edges}
+
+
+GRAPHS = [(40, 0.0, 0), (50, 0.1, 1), (60, 0.5, 2), (30, 0.95, 3)]
+
+
+def test_iter_bits():
+    assert list(iter_bits(0)) == []
+    assert list(iter_bits(0b101001)) == [0, 3, 5]
+    assert list(iter_bits(1 << 200 | 1)) == [0, 200]
+
+
+@pytest.mark.parametrize("n,p,seed", GRAPHS)
+def test_bitset_matches_networkx(n, p, seed):
+    G = random_graph(n, p, seed)
+    B = BitsetGraph.from_graph(G)
+    assert set(B.nodes()) == set(G)
+    assert B.number_of_nodes() == G.number_of_nodes()
+    assert B.number_of_edges() == G.number_of_edges()
+    assert edge_set(B.edges()) == edge_set(G.edges())
+    for u in G:
+        assert set(B.neighbors(u)) == set(G[u])
+        assert B.degree(u) == G.degree(u)
+        assert B.members(B.rows[B.index[u]]) == sorted(G[u], key=B.index.get)
+    assert not B.has_edge(-1, next(iter(G)))
+    assert as_bitset(B) is B
+
+
+@pytest.mark.parametrize("n,p,seed", GRAPHS)
+def test_from_edges_matches_from_graph(n, p, seed):
+    G = random_graph(n, p, seed)
+    B = BitsetGraph.from_graph(G)
+    E = BitsetGraph.from_edges(B.labels, G.edges())
+    assert E.labels == B.labels
+    assert E.rows == B.rows
+
+
+@pytest.mark.parametrize("n,p,seed", GRAPHS)
+def test_mask_members_and_common_neighbors(n, p, seed):
+    G = random_graph(n, p, seed)
+    B = BitsetGraph.from_graph(G)
+    rng = random.Random(seed)
+    for _ in range(20):
+        nodes = rng.sample(list(G), rng.randint(0, 4))
+        mask = B.mask(nodes)
+        assert set(B.members(mask)) == set(nodes)
+        expected = set(G).intersection(*(G[u] for u in nodes)) if nodes else set(G)
+        assert set(B.members(B.common_neighbors(mask))) == expected
+
+
+@pytest.mark.parametrize("n,p,seed", GRAPHS)
+def test_complement_and_reordered(n, p, seed):
+    G = random_graph(n, p, seed)
+    B = BitsetGraph.from_graph(G)
+    H = B.complement()
+    assert H.labels == B.labels
+    assert edge_set(H.edges()) == edge_set(nx.complement(G).edges())
+
+    order = list(G)
+    random.Random(seed).shuffle(order)
+    R = B.reordered(order)
+    assert R.labels == order
+    assert edge_set(R.edges()) == edge_set(G.edges())
+
+
+def test_in_place_updates():
+    B = BitsetGraph.from_edges([3, 1], [(3, 1)])
+    assert B.add_edge(1, 8)
+    assert not B.add_edge(8, 1)
+    assert not B.add_edge(8, 8)
+    assert B.labels == [3, 1, 8]
+    assert B.full_mask == 0b111
+    assert B.number_of_edges() == 2
+    assert B.remove_edge(3, 1)
+    assert not B.remove_edge(3, 1)
+    assert B.add_node(4) == 3
+    assert edge_set(B.edges()) == {frozenset((1, 8))}
+    copy = B.copy()
+    copy.add_edge(3, 4)
+    assert not B.has_edge(3, 4)
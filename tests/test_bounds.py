@@ -0,0 +1,78 @@
+import random
+
+import networkx as nx
+import pytest
+
+from src.bitset import BitsetGraph, iter_bits
+from src.bounds import core_bound, greedy_coloring, iterated_coloring, smallest_last, stop_at, upper_bound
+from src.csr import CSRGraph
+
+
+def clique_number(G):
+    return max((len(clique) for clique in nx.find_cliques(G)), default=0)
+
+
+def is_coloring(B, classes):
+    """Every vertex in exactly one class, and no class holds an edge."""
+    seen = 0
+    for members in classes:
+        assert not seen & members
+        seen |= members
+        assert all(not B.rows[v] & members for v in iter_bits(members))
+    return seen == B.full_mask
+
+
+GRAPHS = [
+    nx.gnp_random_graph(60, 0.1, seed=0),
+    nx.gnp_random_graph(80, 0.3, seed=1),
+    nx.gnp_random_graph(70, 0.6, seed=2),
+    nx.gnp_random_graph(40, 0.9, seed=3),
+    nx.barabasi_albert_graph(120, 4, seed=4),
+    nx.complete_graph(7),
+    nx.empty_graph(5),
+    nx.empty_graph(0),
+]
+
+
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_upper_bound_is_at_least_omega(index):
+    G = GRAPHS[index]
+    omega = clique_number(G)
+    random.seed(index)
+    for iterations in (0, 10):
+        bound = upper_bound(G, iterations=iterations)
+        assert bound.value >= omega
+        assert bound.value == min(bound.core, bound.coloring)
+        assert bound.gap(omega) == bound.value - omega
+        assert bound.certifies(bound.value) and not bound.certifies(bound.value - 1)
+    assert bound.core == core_bound(G) == max(nx.core_number(G).values(), default=-1) + 1
+
+    C = CSRGraph.from_graph(G)
+    assert upper_bound(C).value == bound.core
+
+
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_colorings_are_proper(index):
+    G = GRAPHS[index]
+    B = BitsetGraph.from_graph(G)
+    order, degeneracy = smallest_last(B)
+    assert sorted(order) == list(range(len(B)))
+    classes = greedy_coloring(B, order)
+    assert is_coloring(B, classes)
+    assert len(classes) <= degeneracy + 1
+    random.seed(index)
+    refined = iterated_coloring(B, classes, 10)
+    assert is_coloring(B, refined)
+    assert len(refined) <= len(classes)
+
+
+def test_bounds_are_exact_on_complete_and_empty_graphs():
+    assert upper_bound(nx.complete_graph(7)).value == 7
+    assert upper_bound(nx.empty_graph(5)).value == 1
+    assert upper_bound(nx.empty_graph(0)).value == 0
+
+
+def test_stop_at():
+    on_improve = stop_at(3)
+    assert not on_improve({1, 2}, 0.0)
+    assert on_improve({1, 2, 3}, 0.0)
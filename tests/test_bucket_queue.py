@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from src.bucket_queue import BucketQueue
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_bucket_queue_matches_a_dict(seed):
+    rng = random.Random(seed)
+    max_key = 12
+    queue = BucketQueue(max_key)
+    model = {}
+    for step in range(2000):
+        op = rng.random()
+        item = rng.randrange(40)
+        if item not in model:
+            if op < 0.6:
+                key = rng.randint(0, max_key)
+                queue.insert(item, key)
+                model[item] = key
+        elif op < 0.2:
+            queue.remove(item)
+            del model[item]
+        elif op < 0.4 and model[item] > 0:
+            queue.decrement(item)
+            model[item] -= 1
+        elif op < 0.6 and model[item] < max_key:
+            queue.increment(item)
+            model[item] += 1
+        elif op < 0.8:
+            key = rng.randint(0, max_key)
+            queue.update(item, key)
+            model[item] = key
+
+        assert len(queue) == len(model)
+        assert all(item in queue and queue.key(item) == key for item, key in model.items())
+        if not model:
+            continue
+        low, high = min(model.values()), max(model.values())
+        assert queue.min_key() == low
+        assert queue.max_key() == high
+        assert sorted(queue.bucket(low)) == sorted(item for item, key in model.items() if key == low)
+
+        k = rng.randint(1, 8)
+        smallest = queue.smallest(k)
+        assert len(smallest) == min(k, len(model))
+        assert [model[item] for item in smallest] == sorted(model.values())[:len(smallest)]
+        largest = queue.largest(k)
+        assert [model[item] for item in largest] == sorted(model.values(), reverse=True)[:len(largest)]
+
+
+def test_empty_queue():
+    queue = BucketQueue(3)
+    assert len(queue) == 0
+    assert queue.smallest(2) == [] and queue.largest(2) == []
@@ -0,0 +1,81 @@
+import random
+
+import networkx as nx
+import pytest
+
+from src import local_search as local_search_module
+from src import multistart as multistart_module
+from src.bitset import as_bitset
+from src.local_search import iterative_local_search, resume_ils
+from src.multistart import multistart
+from src.strategies.independent_set import solve_is_min_degree
+
+
+class Killed(Exception):
+    """Stands in for the process being killed in the middle of a run."""
+
+
+def dying_after(func, calls):
+    """Wrap ``func`` so that it raises ``Killed`` once called ``calls`` times."""
+    done = []
+
+    def wrapper(*args, **kwargs):
+        if len(done) == calls:
+            raise Killed
+        done.append(None)
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+@pytest.fixture
+def graph():
+    return as_bitset(nx.gnp_random_graph(80, 0.6, seed=7))
+
+
+@pytest.mark.parametrize("params", [{}, {"stagnation": 600}])
+def test_multistart_resume_matches_uninterrupted_run(graph, tmp_path, monkeypatch, params):
+    expected = multistart(graph, solve_is_min_degree, 1000, checkpoint=str(tmp_path / "full.json"), **params)
+    expected_state = random.getstate()
+
+    path = str(tmp_path / "multistart.json")
+    monkeypatch.setattr(multistart_module, "_run_seed", dying_after(multistart_module._run_seed, 4))
+    with pytest.raises(Killed):
+        multistart(graph, solve_is_min_degree, 1000, checkpoint=path, checkpoint_interval=0, **params)
+    monkeypatch.undo()
+
+    random.seed(12345)
+    assert multistart(graph, solve_is_min_degree, 1000, checkpoint=path, **params) == expected
+    assert random.getstate() == expected_state
+
+
+def test_multistart_checkpoint_rejects_other_run(graph, tmp_path):
+    path = str(tmp_path / "multistart.json")
+    multistart(graph, solve_is_min_degree, 300, checkpoint=path)
+    with pytest.raises(ValueError):
+        multistart(graph, solve_is_min_degree, 400, checkpoint=path)
+
+
+@pytest.mark.parametrize("tightness", [True, False])
+def test_ils_resume_matches_uninterrupted_run(graph, tmp_path, monkeypatch, tightness):
+    initial = solve_is_min_degree(graph, num_iter=1)
+
+    random.seed(1)
+    expected = iterative_local_search(
+        graph, initial, max_iter=300, k=2, verbose=False, tightness=tightness, checkpoint=str(tmp_path / "full.json")
+    )
+    expected_state = random.getstate()
+
+    path = str(tmp_path / "ils.json")
+    monkeypatch.setattr(local_search_module, "perturbation", dying_after(local_search_module.perturbation, 120))
+    random.seed(1)
+    with pytest.raises(Killed):
+        iterative_local_search(
+            graph, initial, max_iter=300, k=2, verbose=False, tightness=tightness,
+            checkpoint=path, checkpoint_interval=0,
+        )
+    monkeypatch.undo()
+
+    random.seed(12345)
+    assert resume_ils(graph, path, verbose=False) == expected
+    assert random.getstate() == expected_state
@@ -0,0 +1,107 @@
+import random
+
+import networkx as nx
+import pytest
+
+from src import clique_pool
+from src.bitset import as_bitset
+from src.clique_pool import CliquePool
+from src.multistart import multistart
+from src.strategies.independent_set import solve_is_min_degree
+from src.verify import verify_clique
+
+
+def jaccard_distance(a, b):
+    return 1.0 - len(a & b) / len(a | b)
+
+
+def random_sets(seed, count, universe=12):
+    rng = random.Random(seed)
+    return [set(rng.sample(range(universe), rng.randint(1, 6))) for _ in range(count)]
+
+
+def test_duplicates_are_merged():
+    pool = CliquePool(5)
+    assert pool.offer([1, 2, 3])
+    assert not pool.offer((3, 1, 2))
+    assert not pool.offer({2, 3, 1})
+    # Same fingerprint (1 + 4 == 2 + 3), different sets: both kept
+    assert pool.offer([1, 4])
+    assert pool.offer([2, 3])
+    assert not pool.offer([])
+    assert pool.as_lists() == [[1, 2, 3], [1, 4], [2, 3]]
+
+
+def test_capacity_keeps_the_largest():
+    pool = CliquePool(2)
+    assert pool.min_size() == 0 and pool.admits(1)
+    pool.offer({1})
+    pool.offer({2, 3})
+    assert pool.min_size() == 1
+    assert not pool.admits(1) and pool.admits(2)
+    # A full pool rejects a clique no larger than its smallest one
+    assert not pool.offer({4})
+    assert pool.offer({4, 5, 6})
+    assert pool.cliques() == [{4, 5, 6}, {2, 3}]
+    # Among the smallest, the most recent is evicted first
+    assert pool.offer({7, 8, 9})
+    assert pool.cliques() == [{4, 5, 6}, {7, 8, 9}]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_pool_keeps_the_top_sizes(seed):
+    offered = random_sets(seed, 200)
+    pool = CliquePool(8)
+    pool.update(offered)
+    kept = pool.cliques()
+    assert len({frozenset(clique) for clique in kept}) == len(kept)
+    distinct = {frozenset(clique) for clique in offered}
+    assert sorted(map(len, kept), reverse=True) == sorted(map(len, distinct), reverse=True)[:8]
+    assert [len(clique) for clique in kept] == sorted(map(len, kept), reverse=True)
+
+
+def test_min_distance_replaces_or_rejects():
+    pool = CliquePool(5, min_distance=0.5)
+    assert pool.offer({1, 2, 3, 4})
+    # Distance 1/5 from {1, 2, 3, 4}, not larger: rejected
+    assert not pool.offer({1, 2, 3, 5})
+    # Distance 1/5 and strictly larger: replaces it
+    assert pool.offer({1, 2, 3, 4, 5})
+    assert pool.cliques() == [{1, 2, 3, 4, 5}]
+    # Far enough: kept alongside
+    assert pool.offer({6, 7, 8})
+    assert len(pool) == 2
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_min_distance_keeps_the_pool_diverse(seed):
+    offered = random_sets(seed, 200)
+    pool = CliquePool(6, min_distance=0.4)
+    pool.update(offered)
+    kept = pool.cliques()
+    for i, a in enumerate(kept):
+        for b in kept[i + 1:]:
+            assert jaccard_distance(a, b) >= 0.4
+    assert len(kept[0]) == max(map(len, offered))
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        CliquePool(0)
+    with pytest.raises(ValueError):
+        CliquePool(3, min_distance=1.5)
+
+
+def test_collecting_from_a_strategy():
+    G = as_bitset(nx.gnp_random_graph(80, 0.5, seed=2))
+    pool = CliquePool(10)
+    assert clique_pool.active() is None
+    with clique_pool.collecting(pool):
+        assert clique_pool.active() is pool
+        with clique_pool.collecting(None):
+            assert clique_pool.active() is None
+        best = multistart(G, solve_is_min_degree, 50, seeds=[1, 2])
+    assert clique_pool.active() is None
+    assert 0 < len(pool) <= 10
+    assert len(pool.cliques()[0]) == len(best)
+    assert all(verify_clique(G, clique) for clique in pool)
@@ -0,0 +1,69 @@
+import random
+
+import networkx as nx
+import pytest
+
+from src.bitset import BitsetGraph
+from src.complement import ComplementView
+
+
+def edge_set(edges):
+    return {frozenset(edge) for edge in edges}
+
+
+GRAPHS = [
+    nx.gnp_random_graph(30, 0.1, seed=0),
+    nx.gnp_random_graph(40, 0.5, seed=1),
+    nx.gnp_random_graph(25, 0.9, seed=2),
+    nx.complete_graph(6),
+    nx.empty_graph(5),
+]
+
+
+@pytest.mark.parametrize("bitset", [False, True])
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_view_matches_nx_complement(index, bitset):
+    G = GRAPHS[index]
+    H = nx.complement(G)
+    view = ComplementView(BitsetGraph.from_graph(G) if bitset else G)
+    assert (view.bitset is not None) == bitset
+    assert set(view.nodes()) == set(H)
+    assert view.number_of_edges() == H.number_of_edges()
+    assert edge_set(view.edges()) == edge_set(H.edges())
+    for u in H:
+        assert set(view.neighbors(u)) == set(H[u])
+        assert view.degree(u) == H.degree(u)
+        assert set(view.base_neighbors(u)) == set(G[u])
+        assert view.base_degree(u) == G.degree(u)
+        for v in H:
+            assert view.has_edge(u, v) == H.has_edge(u, v)
+
+
+@pytest.mark.parametrize("bitset", [False, True])
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_restricted_queries(index, bitset):
+    G = GRAPHS[index]
+    H = nx.complement(G)
+    view = ComplementView(BitsetGraph.from_graph(G) if bitset else G)
+    rng = random.Random(index)
+    for _ in range(20):
+        subset = set(rng.sample(list(G), rng.randint(0, len(G))))
+        for u in G:
+            expected = set(H[u]) & subset
+            if bitset:
+                i, mask = view.bitset.index[u], view.mask(subset)
+                assert set(view.members(view.neighbors_in(i, mask))) == expected
+                assert set(view.members(view.row(i))) == set(H[u])
+                assert view.degree_in(i, mask) == len(expected)
+                assert view.base_degree_in(i, mask) == len(set(G[u]) & subset)
+            else:
+                assert view.neighbors_in(u, subset) == expected
+                assert view.degree_in(u, subset) == len(expected)
+                assert view.base_degree_in(u, subset) == len(set(G[u]) & subset)
+
+
+def test_self_loops_are_ignored():
+    G = nx.Graph([(0, 1), (1, 1), (2, 2)])
+    view = ComplementView(G)
+    assert edge_set(view.edges()) == {frozenset((0, 2)), frozenset((1, 2))}
+    assert view.number_of_edges() == 2
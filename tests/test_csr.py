@@ -0,0 +1,72 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.csr import (
+    CSRGraph,
+    _peel,
+    contains_sorted,
+    core_numbers,
+    degeneracy_order,
+    has_edges,
+    intersect_size,
+    intersect_sorted,
+)
+
+
+def random_sorted(rng, size, high):
+    return np.sort(rng.choice(high, size=size, replace=False)).astype(np.int32)
+
+
+def random_graph(n, p, seed):
+    """G(n, p) plus a few isolated vertices, labelled 0..n+2 in index order."""
+    G = nx.gnp_random_graph(n, p, seed=seed)
+    G.add_nodes_from(range(n, n + 3))
+    return G
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_intersect_sorted_matches_numpy(seed):
+    rng = np.random.default_rng(seed)
+    high = int(rng.integers(1, 300))
+    a = random_sorted(rng, int(rng.integers(0, high + 1)), high)
+    b = random_sorted(rng, int(rng.integers(0, high + 1)), high)
+    expected = np.intersect1d(a, b)
+    assert np.array_equal(intersect_sorted(a, b), expected)
+    assert np.array_equal(intersect_sorted(b, a), expected)
+    assert intersect_size(a, b) == len(expected)
+    values = rng.integers(0, high + 5, size=50)
+    assert np.array_equal(contains_sorted(a, values), np.isin(values, a))
+
+
+@pytest.mark.parametrize("seed,p", [(0, 0.0), (1, 0.05), (2, 0.3), (3, 0.9)])
+def test_has_edges_matches_networkx(seed, p):
+    G = random_graph(60, p, seed)
+    C = CSRGraph.from_graph(G)
+    rng = np.random.default_rng(seed)
+    u = rng.integers(0, len(C), size=2000)
+    v = rng.integers(0, len(C), size=2000)
+    expected = np.array([G.has_edge(int(a), int(b)) for a, b in zip(u, v)])
+    assert np.array_equal(has_edges(C, u, v), expected)
+    assert not has_edges(C, u[:0], v[:0]).size
+
+
+@pytest.mark.parametrize("seed,p", [(0, 0.0), (1, 0.05), (2, 0.2), (3, 0.5), (4, 0.9)])
+def test_peel_matches_networkx_cores(seed, p):
+    G = random_graph(80, p, seed)
+    C = CSRGraph.from_graph(G)
+    order, core = _peel(C)
+
+    expected = nx.core_number(G)
+    assert core.tolist() == [expected[u] for u in range(len(C))]
+    assert np.array_equal(core_numbers(C), core)
+    # A removal order: every vertex once, in non-decreasing core number
+    assert sorted(order.tolist()) == list(range(len(C)))
+    assert np.all(np.diff(core[order]) >= 0)
+
+    # Degeneracy order: at most d neighbours before every vertex
+    degeneracy = max(expected.values(), default=0)
+    position = np.empty(len(C), dtype=np.int64)
+    position[degeneracy_order(C)] = np.arange(len(C))
+    for u in G:
+        assert sum(position[v] < position[u] for v in G[u]) <= degeneracy
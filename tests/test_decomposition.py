@@ -0,0 +1,50 @@
+import networkx as nx
+import pytest
+
+from src.csr import CSRGraph
+from src.decomposition import ego_decomposition
+
+
+def clique_number(G):
+    return max((len(clique) for clique in nx.find_cliques(G)), default=0)
+
+
+def is_clique(G, nodes):
+    nodes = list(nodes)
+    return all(G.has_edge(u, v) for i, u in enumerate(nodes) for v in nodes[i + 1:])
+
+
+GRAPHS = [
+    nx.gnp_random_graph(40, 0.1, seed=0),
+    nx.gnp_random_graph(60, 0.3, seed=1),
+    nx.gnp_random_graph(50, 0.6, seed=2),
+    nx.barabasi_albert_graph(120, 4, seed=3),
+    nx.powerlaw_cluster_graph(150, 5, 0.6, seed=4),
+    nx.disjoint_union(nx.complete_graph(7), nx.gnp_random_graph(80, 0.05, seed=5)),
+    nx.empty_graph(10),
+]
+
+
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_exact_decomposition_finds_the_clique_number(index):
+    G = GRAPHS[index]
+    result = ego_decomposition(CSRGraph.from_graph(G), exact_node_limit=None)
+    assert result.optimal
+    assert len(result.clique) == clique_number(G)
+    assert is_clique(G, result.clique)
+
+
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_heuristic_decomposition_returns_a_clique(index):
+    G = GRAPHS[index]
+    result = ego_decomposition(CSRGraph.from_graph(G), exact_size=0, num_iter=5)
+    assert len(result.clique) <= clique_number(G)
+    assert is_clique(G, result.clique)
+
+
+def test_workers_match_serial_clique_number():
+    G = nx.powerlaw_cluster_graph(300, 6, 0.5, seed=6)
+    result = ego_decomposition(CSRGraph.from_graph(G), workers=2, chunk_size=32, exact_node_limit=None)
+    assert result.optimal
+    assert len(result.clique) == clique_number(G)
+    assert is_clique(G, result.clique)
@@ -0,0 +1,74 @@
+import networkx as nx
+import pytest
+
+from src.bitset import as_bitset
+from src.exact import degeneracy_order, max_clique_exact
+from src.verify import verify_clique
+
+
+def clique_number(G):
+    return max((len(clique) for clique in nx.find_cliques(G)), default=0)
+
+
+GRAPHS = [
+    nx.gnp_random_graph(40, 0.1, seed=0),
+    nx.gnp_random_graph(50, 0.3, seed=1),
+    nx.gnp_random_graph(60, 0.5, seed=2),
+    nx.gnp_random_graph(40, 0.8, seed=3),
+    nx.gnp_random_graph(30, 0.95, seed=4),
+    nx.barabasi_albert_graph(100, 4, seed=5),
+    nx.complete_graph(7),
+    nx.empty_graph(5),
+    nx.empty_graph(0),
+]
+
+
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_exact_finds_the_clique_number(index):
+    G = GRAPHS[index]
+    omega = clique_number(G)
+    result = max_clique_exact(G)
+    assert result.optimal
+    assert len(result.clique) == omega
+    assert result.upper_bound == omega
+    assert result.gap == 0
+    assert verify_clique(G, result.clique)
+    assert sorted(degeneracy_order(G)) == sorted(G)
+
+
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_incumbent_and_bounds(index):
+    G = GRAPHS[index]
+    omega = clique_number(G)
+    incumbent = max(nx.find_cliques(G), key=len, default=[])[:-1]
+
+    warm = max_clique_exact(as_bitset(G), incumbent=incumbent)
+    assert warm.optimal and len(warm.clique) == omega
+
+    # A known bound equal to the incumbent size skips the search
+    optimal = max(nx.find_cliques(G), key=len, default=[])
+    certified = max_clique_exact(G, incumbent=optimal, upper_bound=omega)
+    assert certified.optimal and certified.nodes == 0
+    assert certified.clique == set(optimal)
+
+    # lower_bound: only cliques larger than it are searched
+    floor = max_clique_exact(G, lower_bound=omega)
+    assert floor.optimal and floor.clique == set()
+    below = max_clique_exact(G, lower_bound=max(omega - 1, 0))
+    assert len(below.clique) == omega
+
+
+@pytest.mark.parametrize("index", range(5))
+def test_node_limit_keeps_a_valid_bound(index):
+    G = GRAPHS[index]
+    omega = clique_number(G)
+    result = max_clique_exact(G, node_limit=1)
+    assert verify_clique(G, result.clique)
+    assert not result.optimal
+    assert len(result.clique) <= omega <= result.upper_bound
+
+
+def test_incumbent_must_be_a_clique():
+    G = nx.path_graph(3)
+    with pytest.raises(ValueError):
+        max_clique_exact(G, incumbent=[0, 2])
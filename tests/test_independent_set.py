@@ -0,0 +1,71 @@
+import random
+
+import networkx as nx
+import pytest
+
+from src.bitset import as_bitset
+from src.complement import ComplementView
+from src.graph import Graph
+from src.strategies.independent_set import _greedy_independent_set, solve_is_k_min_degree, solve_is_min_degree
+from src.verify import verify_clique
+
+GRAPHS = [
+    nx.gnp_random_graph(60, 0.1, seed=1),
+    nx.gnp_random_graph(80, 0.5, seed=2),
+    nx.gnp_random_graph(40, 0.9, seed=3),
+    nx.complete_graph(8),
+    nx.empty_graph(6),
+]
+
+
+def as_input(G, kind):
+    return as_bitset(G) if kind == "bitset" else Graph.from_graph(G)
+
+
+def is_maximal_clique(G, clique):
+    outside = set(G) - set(clique)
+    return verify_clique(G, clique) and not any(all(G.has_edge(v, u) for u in clique) for v in outside)
+
+
+@pytest.mark.parametrize("kind", ["graph", "bitset"])
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+@pytest.mark.parametrize("k", [None, 1, 3])
+def test_greedy_builds_maximal_independent_sets_of_the_complement(kind, index, k):
+    G = GRAPHS[index]
+    H = ComplementView(as_input(G, kind))
+    random.seed(index)
+    for _ in range(5):
+        independent = _greedy_independent_set(H, k)
+        assert all(not H.has_edge(u, v) for u in independent for v in independent if u != v)
+        # Independent in H = clique in G, and the greedy stops only when
+        # no vertex can be added
+        assert is_maximal_clique(G, independent)
+
+
+@pytest.mark.parametrize("kind", ["graph", "bitset"])
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_strategies_return_cliques(kind, index):
+    G = GRAPHS[index]
+    omega = max(len(clique) for clique in nx.find_cliques(G))
+    for solve, args in ((solve_is_min_degree, ()), (solve_is_k_min_degree, (3,))):
+        random.seed(0)
+        clique = solve(as_input(G, kind), *args, num_iter=10)
+        assert is_maximal_clique(G, clique)
+        assert len(clique) <= omega
+
+
+def test_complement_views_agree():
+    G = GRAPHS[1]
+    sets, bits = ComplementView(Graph.from_graph(G)), ComplementView(as_bitset(G))
+    assert bits.bitset is not None and sets.bitset is None
+    assert sets.number_of_edges() == bits.number_of_edges() == nx.complement(G).number_of_edges()
+    for u in G:
+        assert set(sets.neighbors(u)) == set(bits.neighbors(u)) == set(nx.complement(G)[u])
+        assert sets.degree(u) == bits.degree(u)
+    subset = set(range(0, 80, 3))
+    mask = bits.mask(subset)
+    for u in G:
+        i = bits.bitset.index[u]
+        assert set(bits.members(bits.neighbors_in(i, mask))) == sets.neighbors_in(u, subset)
+        assert bits.degree_in(i, mask) == sets.degree_in(u, subset)
+        assert bits.base_degree_in(i, mask) == sets.base_degree_in(u, subset)
@@ -0,0 +1,73 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.bitset import BitsetGraph
+from src.csr import CSRGraph
+from src.strategies.local_score import (
+    _adjacency_matrix,
+    _bitset_rows,
+    _calculate_scores,
+    solve_score_tie_breaking,
+    solve_score_top_k,
+)
+
+GRAPHS = [
+    nx.gnp_random_graph(60, 0.1, seed=1),
+    nx.gnp_random_graph(80, 0.5, seed=2),
+    nx.gnp_random_graph(50, 0.9, seed=3),
+    nx.barabasi_albert_graph(100, 3, seed=4),
+    nx.complete_graph(8),
+    nx.empty_graph(6),
+]
+
+
+def is_maximal_clique(G, nodes):
+    nodes = set(nodes)
+    if any(not G.has_edge(u, v) for u in nodes for v in nodes if u < v):
+        return False
+    return not any(nodes <= set(G[x]) for x in G if x not in nodes)
+
+
+def expected_scores(G, labels):
+    """deg(u) / mean degree of its neighbours, 0 for isolated vertices."""
+    scores = []
+    for u in labels:
+        degrees = [G.degree(v) for v in G[u]]
+        scores.append(G.degree(u) / (sum(degrees) / len(degrees)) if degrees else 0.0)
+    return np.array(scores)
+
+
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_scores_match_the_definition(index):
+    G = GRAPHS[index]
+    B = BitsetGraph.from_graph(G)
+    A = _adjacency_matrix(B)
+    assert _bitset_rows(A) == B.rows
+    expected = expected_scores(G, B.labels)
+    assert np.allclose(_calculate_scores(A), expected)
+
+    C = CSRGraph.from_graph(G)
+    assert np.allclose(_calculate_scores(C), expected_scores(G, C.members(range(len(C)))))
+
+
+@pytest.mark.parametrize("solver", [solve_score_tie_breaking, solve_score_top_k])
+@pytest.mark.parametrize("backend", [BitsetGraph, CSRGraph])
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_solvers_return_maximal_cliques(solver, backend, index):
+    G = GRAPHS[index]
+    random.seed(index)
+    clique = solver(backend.from_graph(G), num_iter=20)
+    assert is_maximal_clique(G, clique)
+
+
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_top_k_backends_agree_for_a_fixed_seed(index):
+    G = GRAPHS[index]
+    results = []
+    for backend in (BitsetGraph, CSRGraph):
+        random.seed(index)
+        results.append(solve_score_top_k(backend.from_graph(G), num_iter=20, top_k_ratio=0.1))
+    assert results[0] == results[1]
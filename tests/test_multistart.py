@@ -0,0 +1,67 @@
+import networkx as nx
+import pytest
+
+from src.bitset import BitsetGraph, as_bitset
+from src.multistart import CHECKPOINT_BLOCK, SharedGraph, multistart, split_iterations
+from src.strategies.registry import STRATEGIES
+from src.verify import verify_clique
+
+SEEDS = [1, 2, 3, 4]
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return as_bitset(nx.gnp_random_graph(150, 0.6, seed=11))
+
+
+@pytest.mark.parametrize("key", sorted(STRATEGIES))
+def test_parallel_matches_serial(graph, key):
+    _, func, params = STRATEGIES[key]
+    serial = multistart(graph, func, 40, seeds=SEEDS, workers=1, **params)
+    parallel = multistart(graph, func, 40, seeds=SEEDS, workers=2, **params)
+    assert parallel == serial
+    assert verify_clique(graph, serial)
+
+
+def test_shared_graph_round_trip():
+    # Non-contiguous labels, an isolated vertex and a label order that is
+    # not sorted: the copy must keep the same index of every label
+    B = BitsetGraph.from_edges([40, 7, 13, 99, 2], [(40, 7), (7, 13), (13, 40), (2, 40), (2, 13)])
+    with SharedGraph(B) as shared:
+        copy = SharedGraph.attach(shared.name)
+    assert copy.labels == B.labels
+    assert copy.rows == B.rows
+    assert copy.number_of_edges() == B.number_of_edges()
+
+
+def test_shared_graph_round_trip_random(graph):
+    with SharedGraph(graph) as shared:
+        copy = SharedGraph.attach(shared.name)
+    assert copy.labels == graph.labels
+    assert copy.rows == graph.rows
+
+
+def test_shared_graph_rejects_non_integer_labels():
+    with pytest.raises(TypeError):
+        SharedGraph(BitsetGraph.from_edges(["a", "b"], [("a", "b")]))
+
+
+def test_split_iterations():
+    assert split_iterations(10, 4) == [3, 3, 2, 2]
+    assert split_iterations(3, 5) == [1, 1, 1, 0, 0]
+    assert sum(split_iterations(1001, 7)) == 1001
+
+
+def test_checkpoint_blocks_match_across_workers(graph, tmp_path):
+    _, func, params = STRATEGIES["1"]
+    num_iter = 3 * CHECKPOINT_BLOCK + 17
+    serial = multistart(graph, func, num_iter, workers=1, checkpoint=str(tmp_path / "serial.json"), **params)
+    parallel = multistart(graph, func, num_iter, workers=2, checkpoint=str(tmp_path / "parallel.json"), **params)
+    assert parallel == serial
+
+
+def test_checkpoint_does_not_change_seeded_runs(graph, tmp_path):
+    _, func, params = STRATEGIES["6"]
+    plain = multistart(graph, func, 40, seeds=SEEDS, **params)
+    checkpointed = multistart(graph, func, 40, seeds=SEEDS, checkpoint=str(tmp_path / "seeded.json"), **params)
+    assert checkpointed == plain
@@ -0,0 +1,44 @@
+import networkx as nx
+import pytest
+
+from src.bitset import as_bitset
+from src.portfolio import ils_portfolio
+from src.strategies.independent_set import solve_is_min_degree
+from src.verify import verify_clique
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return as_bitset(nx.gnp_random_graph(120, 0.5, seed=5))
+
+
+@pytest.fixture(scope="module")
+def initial(graph):
+    return solve_is_min_degree(graph, num_iter=1)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_portfolio_returns_a_clique_with_chain_stats(graph, initial, workers):
+    result = ils_portfolio(graph, initial, 120, 3, ks=[1, 2, 3], seeds=[5, 6, 7], epoch=25, workers=workers)
+
+    assert verify_clique(graph, result.best)
+    assert len(result.best) >= len(initial)
+    assert [stats.chain for stats in result.chains] == [0, 1, 2]
+    assert [(stats.seed, stats.k) for stats in result.chains] == [(5, 1), (6, 2), (7, 3)]
+    for stats in result.chains:
+        assert stats.iterations == 120
+        assert len(initial) <= stats.best_size <= len(result.best)
+        assert 0.0 <= stats.time_to_best <= stats.wall_time
+    assert len(result.best) == max(stats.best_size for stats in result.chains)
+
+
+def test_portfolio_is_deterministic_for_fixed_seeds(graph, initial):
+    runs = [ils_portfolio(graph, initial, 150, 3, seeds=[1, 2, 3], epoch=20, workers=1) for _ in range(2)]
+    assert runs[0].best == runs[1].best
+    assert [stats.best_size for stats in runs[0].chains] == [stats.best_size for stats in runs[1].chains]
+    assert [stats.restarts for stats in runs[0].chains] == [stats.restarts for stats in runs[1].chains]
+
+
+def test_portfolio_rejects_mismatched_chain_parameters(graph, initial):
+    with pytest.raises(ValueError):
+        ils_portfolio(graph, initial, 10, 3, ks=[1, 2], workers=1)
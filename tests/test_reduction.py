@@ -0,0 +1,59 @@
+import networkx as nx
+import pytest
+
+from src.bitset import as_bitset
+from src.reduction import degeneracy_clique, reduce_graph
+from src.verify import verify_clique
+
+
+def maximum_cliques(G):
+    cliques = [set(clique) for clique in nx.find_cliques(G)]
+    omega = max((len(clique) for clique in cliques), default=0)
+    return [clique for clique in cliques if len(clique) == omega]
+
+
+def random_graph(n, p, seed):
+    """G(n, p) with non-contiguous labels, so that lift and project matter."""
+    G = nx.gnp_random_graph(n, p, seed=seed)
+    return nx.relabel_nodes(G, {u: 7 * u + 3 for u in G})
+
+
+GRAPHS = [
+    random_graph(60, 0.1, 0),
+    random_graph(80, 0.2, 1),
+    random_graph(60, 0.5, 2),
+    random_graph(40, 0.8, 3),
+    nx.barabasi_albert_graph(120, 3, seed=4),
+    nx.disjoint_union(nx.complete_graph(6), nx.gnp_random_graph(50, 0.1, seed=5)),
+]
+
+
+@pytest.mark.parametrize("triangle_pruning", [False, True])
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_reduction_keeps_every_maximum_clique(index, triangle_pruning):
+    G = GRAPHS[index]
+    incumbent = degeneracy_clique(G)
+    assert verify_clique(G, incumbent)
+    reduced = reduce_graph(G, len(incumbent), triangle_pruning=triangle_pruning)
+    assert reduced.graph.number_of_nodes() == len(reduced.labels)
+    assert reduced.removed_nodes == G.number_of_nodes() - len(reduced.labels)
+
+    for clique in maximum_cliques(G):
+        projected = reduced.project(clique)
+        assert len(projected) == len(clique)
+        assert verify_clique(reduced.graph, projected)
+        assert reduced.lift(projected) == clique
+
+
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_lift_and_project_are_inverse(index):
+    G = GRAPHS[index]
+    reduced = reduce_graph(G, len(degeneracy_clique(G)))
+    ids = set(range(len(reduced.labels)))
+    assert reduced.project(reduced.lift(ids)) == ids
+    assert reduced.lift(reduced.project(G)) == set(reduced.labels)
+    # Every edge of the reduced graph is an edge of the original one
+    B = as_bitset(reduced.graph)
+    for u in B.labels:
+        for v in B.members(B.rows[B.index[u]]):
+            assert G.has_edge(reduced.labels[u], reduced.labels[v])
@@ -0,0 +1,87 @@
+import itertools
+
+import networkx as nx
+import pytest
+
+from src import result_store as result_store_module
+from src.result_store import ResultStore, result_key
+
+
+class Clock:
+    """Strictly increasing stand-in for ``time``: LRU order without ties."""
+
+    def __init__(self):
+        self._ticks = itertools.count()
+
+    def time(self):
+        return float(next(self._ticks))
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_store_module, "time", Clock())
+    with ResultStore(tmp_path / "results.sqlite", max_entries=3) as store:
+        yield store
+
+
+def put(store, seed, clique, fingerprint="g"):
+    store.put(fingerprint, "solve", {"num_iter": 10}, seed, clique, {"ils_time": 0.5})
+
+
+def test_round_trip(store):
+    put(store, 1, {3, 1, 2})
+    hit = store.get("g", "solve", {"num_iter": 10}, 1)
+    assert hit.clique == {1, 2, 3} and hit.size == 3
+    assert hit.timings == {"ils_time": 0.5}
+    assert hit.params == {"num_iter": 10}
+    assert store.get("g", "solve", {"num_iter": 11}, 1) is None
+    assert store.get("g", "solve", {"num_iter": 10}, 2) is None
+    assert result_key("g", "solve", {"a": 1, "b": 2}, 1) == result_key("g", "solve", {"b": 2, "a": 1}, 1)
+
+
+def test_lru_eviction(store):
+    for seed in range(3):
+        put(store, seed, {seed})
+    # Reading seed 0 makes seed 1 the least recently used entry
+    assert store.get("g", "solve", {"num_iter": 10}, 0) is not None
+    put(store, 3, {3})
+    assert len(store) == 3
+    assert store.get("g", "solve", {"num_iter": 10}, 1) is None
+    for seed in (0, 2, 3):
+        assert store.get("g", "solve", {"num_iter": 10}, seed).clique == {seed}
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = tmp_path / "results.sqlite"
+    with ResultStore(path) as store:
+        put(store, 1, {1, 2})
+    with ResultStore(path) as store:
+        assert store.get("g", "solve", {"num_iter": 10}, 1).clique == {1, 2}
+
+
+def test_put_keeps_the_larger_clique(store):
+    put(store, 1, {1, 2, 3})
+    put(store, 1, {4, 5})
+    assert store.get("g", "solve", {"num_iter": 10}, 1).clique == {1, 2, 3}
+    put(store, 1, {4, 5, 6, 7})
+    assert store.get("g", "solve", {"num_iter": 10}, 1).clique == {4, 5, 6, 7}
+    assert len(store) == 1
+
+
+def test_invalid_entries_are_dropped(store):
+    G = nx.complete_graph(4)
+    G.remove_edge(0, 3)
+    put(store, 1, {0, 1, 3})
+    put(store, 2, {0, 1, 2})
+    put(store, 3, {0, 9})
+    assert store.best_clique("g", G=G) == {0, 1, 2}
+    assert store.get("g", "solve", {"num_iter": 10}, 1, G=G) is None
+    assert store.get("g", "solve", {"num_iter": 10}, 3, G=G) is None
+    assert len(store) == 1
+    assert store.best_clique("other") == set()
+    assert [result.seed for result in store.results_for("g")] == [2]
+
+
+def test_max_entries_must_be_positive(tmp_path):
+    with pytest.raises(ValueError):
+        ResultStore(tmp_path / "results.sqlite", max_entries=0)
@@ -0,0 +1,88 @@
+import asyncio
+
+import networkx as nx
+import pytest
+
+from src.service import SolveServer, request_graph, solve_request
+from src.service_client import SolveClient
+from src.strategies.registry import STRATEGIES
+from src.verify import verify_clique
+
+
+def clique_number(G):
+    return max((len(clique) for clique in nx.find_cliques(G)), default=0)
+
+
+def edges_request(G, **fields):
+    return dict(fields, nodes=list(G), edges=[list(edge) for edge in G.edges()])
+
+
+def dimacs(G):
+    """DIMACS text of ``G``, vertices renumbered 1..n in node order."""
+    index = {u: i for i, u in enumerate(G, 1)}
+    lines = [f"p edge {G.number_of_nodes()} {G.number_of_edges()}"]
+    lines += [f"e {index[u]} {index[v]}" for u, v in G.edges()]
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture(scope="module")
+def graph():
+    # Non-contiguous labels: the response must use the request's labels
+    G = nx.gnp_random_graph(60, 0.5, seed=3)
+    return nx.relabel_nodes(G, {u: 10 * u + 7 for u in G})
+
+
+def test_request_graph(graph):
+    B = request_graph(edges_request(graph))
+    assert set(B.nodes()) == set(graph)
+    assert B.number_of_edges() == graph.number_of_edges()
+    D = request_graph({"dimacs": dimacs(graph)})
+    assert D.number_of_nodes() == graph.number_of_nodes()
+    assert D.number_of_edges() == graph.number_of_edges()
+    with pytest.raises(ValueError):
+        request_graph({})
+
+
+@pytest.mark.parametrize("key", sorted(STRATEGIES))
+def test_solve_request_returns_a_clique_of_the_request_graph(graph, key):
+    response = solve_request(edges_request(graph, strategy=key, seed=1, time_limit=0.5, num_iter=50, ils_iter=50))
+    assert verify_clique(graph, response["clique"])
+    assert response["size"] == len(response["clique"])
+    assert response["size"] <= clique_number(graph) <= response["upper_bound"]
+    assert response["optimal"] == (response["size"] == response["upper_bound"])
+    assert (response["nodes"], response["edges"]) == (graph.number_of_nodes(), graph.number_of_edges())
+
+
+def test_solve_request_certifies_a_complete_graph():
+    response = solve_request(edges_request(nx.complete_graph(6), strategy="1"))
+    assert response["optimal"] and response["size"] == 6
+
+
+def test_solve_request_rejects_unknown_strategy(graph):
+    with pytest.raises(ValueError):
+        solve_request(edges_request(graph, strategy="9"))
+
+
+def test_server_round_trip(graph, tmp_path):
+    path = str(tmp_path / "mc.sock")
+    requests = [edges_request(graph, id=i, strategy=key, seed=i, time_limit=0.3) for i, key in enumerate(sorted(STRATEGIES))]
+    requests.append({"id": "bad", "strategy": "9", "edges": []})
+
+    async def run():
+        async with SolveServer(workers=1, max_pending=2) as server:
+            serving = asyncio.create_task(server.serve_socket(path=path))
+            while not (tmp_path / "mc.sock").exists():
+                await asyncio.sleep(0.01)
+            try:
+                async with SolveClient(socket=path) as client:
+                    return [response async for response in client.solve_many(requests, window=3)]
+            finally:
+                serving.cancel()
+
+    responses = {response["id"]: response for response in asyncio.run(run())}
+    assert set(responses) == {request["id"] for request in requests}
+    assert not responses.pop("bad")["ok"]
+    for response in responses.values():
+        assert response["ok"]
+        assert verify_clique(graph, response["clique"])
+        assert response["queue_time"] >= 0.0
@@ -0,0 +1,83 @@
+import random
+
+import networkx as nx
+import pytest
+
+from src.bitset import as_bitset
+from src.tightness import TightnessSearch, tightness_local_search
+from src.verify import verify_clique
+
+GRAPHS = [
+    nx.gnp_random_graph(60, 0.1, seed=1),
+    nx.gnp_random_graph(80, 0.5, seed=2),
+    nx.gnp_random_graph(50, 0.9, seed=3),
+    nx.complete_graph(8),
+    nx.empty_graph(6),
+]
+
+
+def random_cliques(G, count, seed):
+    """Random subsets of the maximal cliques of ``G``, the empty one included."""
+    rng = random.Random(seed)
+    maximal = [list(clique) for clique in nx.find_cliques(G)]
+    starts = [set()]
+    for _ in range(count):
+        clique = rng.choice(maximal)
+        starts.append(set(rng.sample(clique, rng.randint(1, len(clique)))))
+    return starts
+
+
+def check_state(engine):
+    """The incremental counters match a recomputation from the members."""
+    members = engine.members
+    assert engine.size == len(members)
+    assert engine.total == sum(members)
+    for w, nbrs in enumerate(engine.adj):
+        inside = [u for u in nbrs if u in members]
+        assert engine.a[w] == len(inside)
+        assert engine.s[w] == sum(inside)
+        assert engine.in_clique[w] == (w in members)
+        if w not in members:
+            assert w in engine.buckets[engine.a[w]]
+
+
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_search_never_shrinks_the_start(index):
+    G = GRAPHS[index]
+    B = as_bitset(G)
+    engine = TightnessSearch(B)
+    random.seed(index)
+    # One engine across all the starts, as the ILS uses it
+    for start in random_cliques(G, 30, index):
+        result = engine.search(start)
+        assert verify_clique(B, result)
+        assert len(result) >= len(start)
+        check_state(engine)
+
+
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_one_shot_search_returns_a_clique(index):
+    G = GRAPHS[index]
+    random.seed(index)
+    for start in random_cliques(G, 10, index):
+        result = tightness_local_search(start, G)
+        assert verify_clique(G, result)
+        assert len(result) >= len(start)
+
+
+def test_search_finds_the_swap():
+    # {0, 1} is maximal, but removing 0 lets the adjacent pair 2, 3 in:
+    # the (1,2)-swap reaches the triangle {1, 2, 3}
+    G = nx.Graph([(0, 1), (1, 2), (1, 3), (2, 3)])
+    random.seed(0)
+    assert tightness_local_search({0, 1}, G) == {1, 2, 3}
+
+
+def test_search_is_deterministic_for_a_fixed_seed():
+    G = GRAPHS[1]
+    results = []
+    for _ in range(2):
+        random.seed(7)
+        engine = TightnessSearch(G)
+        results.append([engine.search(start) for start in random_cliques(G, 10, 7)])
+    assert results[0] == results[1]
@@ -0,0 +1,107 @@
+import random
+from collections import Counter
+
+import networkx as nx
+import pytest
+
+from src.bitset import as_bitset
+from src.complement import ComplementView
+from src.graph import Graph
+from src.strategies.vertex_cover import (
+    _heuristic_max_degree,
+    _heuristic_max_matching,
+    _reduce_to_minimal,
+    solve_vc_matching,
+    solve_vc_max_degree,
+)
+
+GRAPHS = [
+    nx.gnp_random_graph(60, 0.1, seed=1),
+    nx.gnp_random_graph(80, 0.5, seed=2),
+    nx.gnp_random_graph(50, 0.9, seed=3),
+    nx.complete_graph(8),
+    nx.empty_graph(6),
+]
+
+
+def as_input(G, kind):
+    return as_bitset(G) if kind == "bitset" else Graph.from_graph(G)
+
+
+def covers_complement(G, cover):
+    return all(u in cover or v in cover for u, v in nx.complement(G).edges())
+
+
+def is_maximal_clique(G, nodes):
+    nodes = set(nodes)
+    if any(not G.has_edge(u, v) for u in nodes for v in nodes if u < v):
+        return False
+    return not any(nodes <= set(G[x]) for x in G if x not in nodes)
+
+
+def clique_number(G):
+    return max((len(clique) for clique in nx.find_cliques(G)), default=0)
+
+
+@pytest.mark.parametrize("kind", ["graph", "bitset"])
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_max_degree_cover_reduces_to_a_minimal_cover(kind, index):
+    G = GRAPHS[index]
+    H = ComplementView(as_input(G, kind))
+    random.seed(index)
+    for _ in range(5):
+        cover = _heuristic_max_degree(H)
+        assert covers_complement(G, cover)
+        minimal = _reduce_to_minimal(H, cover)
+        assert minimal <= cover
+        assert covers_complement(G, minimal)
+        # Minimal: no vertex can be dropped, i.e. V - minimal is a maximal clique
+        assert is_maximal_clique(G, set(G) - minimal)
+
+
+@pytest.mark.parametrize("solver", [solve_vc_max_degree, solve_vc_matching])
+@pytest.mark.parametrize("kind", ["graph", "bitset"])
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_solvers_return_maximal_cliques(solver, kind, index):
+    G = GRAPHS[index]
+    random.seed(index)
+    improvements = []
+    clique = solver(as_input(G, kind), num_iter=20, on_improve=lambda record, _: improvements.append(record))
+    assert is_maximal_clique(G, clique)
+    assert len(clique) <= clique_number(G)
+    # The reduction to a minimal cover never shrinks the best raw clique
+    if improvements:
+        assert len(clique) >= len(improvements[-1])
+
+
+@pytest.mark.parametrize("kind", ["graph", "bitset"])
+@pytest.mark.parametrize("index", range(len(GRAPHS)))
+def test_matching_cover_covers_the_complement(kind, index):
+    G = GRAPHS[index]
+    H = ComplementView(as_input(G, kind))
+    random.seed(index)
+    for _ in range(5):
+        cover = _heuristic_max_matching(H)
+        assert covers_complement(G, cover)
+        # The matched vertices come in pairs, each pair an edge of H
+        assert len(cover) % 2 == 0
+
+
+@pytest.mark.parametrize("kind", ["graph", "bitset"])
+def test_matching_partner_is_uniform(kind):
+    # In H, vertex 0 is adjacent to all the others and they are pairwise
+    # non-adjacent: every maximal matching is one edge (0, x), and a random
+    # maximal matching picks x uniformly
+    n = 6
+    G = nx.complete_graph(range(1, n))
+    G.add_node(0)
+    H = ComplementView(as_input(G, kind))
+    random.seed(0)
+    runs = 3000
+    partners = Counter()
+    for _ in range(runs):
+        cover = _heuristic_max_matching(H)
+        assert 0 in cover and len(cover) == 2
+        partners[max(cover)] += 1
+    expected = runs / (n - 1)
+    assert all(0.8 * expected < partners[x] < 1.2 * expected for x in range(1, n))